@@ -24,6 +24,10 @@ import app.models.transaction  # noqa: F401  # ensure Transaction model is loade
 import app.models.category  # noqa: F401  # ensure Category model is loaded
 import app.models.user  # noqa: F401  # ensure User model is loaded
 import app.models.account  # noqa: F401  # ensure Account model is loaded
+import app.models.rollup  # noqa: F401  # ensure TransactionRollup model is loaded
+import app.models.rule  # noqa: F401  # ensure CategoryRule model is loaded
+import app.models.version  # noqa: F401  # ensure DataVersion model is loaded
+import app.models.budget  # noqa: F401  # ensure Budget models are loaded
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,92 @@
+"""
+Initial schema: users, accounts, categories and transactions.
+
+Databases bootstrapped by `init_db` before migrations existed already contain
+these tables, so each table is only created when it is missing.
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "user" not in existing:
+        op.create_table(
+            "user",
+            sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("full_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("hashed_password", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_user_email"), "user", ["email"], unique=True)
+
+    if "category" not in existing:
+        op.create_table(
+            "category",
+            sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_category_name"), "category", ["name"], unique=True)
+
+    if "account" not in existing:
+        op.create_table(
+            "account",
+            sa.Column("number", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("bic", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("bank_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("currency", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_account_number"), "account", ["number"], unique=False)
+
+    if "transaction" not in existing:
+        op.create_table(
+            "transaction",
+            sa.Column("account", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("booking_date", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("statement_number", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("transaction_number", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("counterparty_account", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("counterparty_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("street_number", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("postal_code_city", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("transaction_type", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("value_date", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("currency", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("bic", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("country_code", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("notes", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+            sa.Column("category_id", sa.Integer(), nullable=True),
+            sa.Column("account_id", sa.Integer(), nullable=True),
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["account_id"], ["account.id"]),
+            sa.ForeignKeyConstraint(["category_id"], ["category.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    op.drop_table("transaction")
+    op.drop_index(op.f("ix_account_number"), table_name="account")
+    op.drop_table("account")
+    op.drop_index(op.f("ix_category_name"), table_name="category")
+    op.drop_table("category")
+    op.drop_index(op.f("ix_user_email"), table_name="user")
+    op.drop_table("user")
@@ -0,0 +1,41 @@
+"""
+Add a unique natural-key index on transactions.
+
+Existing duplicates (same account, statement number and transaction number)
+are removed first, keeping the earliest row, so the unique index can be built.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    op.execute(
+        sa.text(
+            'DELETE FROM "transaction" WHERE id IN ('
+            ' SELECT later.id FROM "transaction" AS later'
+            ' JOIN "transaction" AS earlier'
+            ' ON earlier.account = later.account'
+            ' AND earlier.statement_number = later.statement_number'
+            ' AND earlier.transaction_number = later.transaction_number'
+            ' AND earlier.id < later.id'
+            ')'
+        )
+    )
+    op.create_index(
+        "ix_transaction_natural_key",
+        "transaction",
+        ["account", "statement_number", "transaction_number"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    op.drop_index("ix_transaction_natural_key", table_name="transaction")
@@ -0,0 +1,156 @@
+"""
+Store transaction dates as DATE and amounts as NUMERIC.
+
+`booking_date` and `value_date` previously held whatever text pandas produced
+(`dd/mm/yyyy` for CSV uploads, `yyyy-mm-dd hh:mm:ss` for Excel) and `amount`
+was a float. Existing values are parsed into new typed columns in batches,
+the old columns are dropped and `booking_date` gets a B-tree index.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+_BATCH_SIZE = 5000
+_DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d-%m-%Y")
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if value is None or value.strip().lower() in ("", "nan", "nat", "none"):
+        return None
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date value in transaction table: {value!r}")
+
+
+def _copy_in_batches(source: sa.TableClause, target: sa.TableClause, convert) -> None:
+    """Read `source` columns in id order and write converted values to `target`.
+
+    Both arguments are lightweight views of the `transaction` table; their
+    column types control how values are read and bound on each dialect.
+    """
+    bind = op.get_bind()
+    target_columns = [column.name for column in target.c if column.name != "id"]
+    update = (
+        target.update()
+        .where(target.c.id == sa.bindparam("row_id"))
+        .values({name: sa.bindparam(name) for name in target_columns})
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(*source.c)
+            .where(source.c.id > last_id)
+            .order_by(source.c.id)
+            .limit(_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            update,
+            [
+                dict(zip(target_columns, convert(row)), row_id=row.id)
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    with op.batch_alter_table("transaction") as batch:
+        batch.add_column(sa.Column("booking_date_typed", sa.Date(), nullable=True))
+        batch.add_column(sa.Column("value_date_typed", sa.Date(), nullable=True))
+        batch.add_column(sa.Column("amount_typed", sa.Numeric(14, 2), nullable=True))
+
+    _copy_in_batches(
+        sa.table(
+            "transaction",
+            sa.column("id", sa.Integer()),
+            sa.column("booking_date", sa.String()),
+            sa.column("value_date", sa.String()),
+            sa.column("amount", sa.Float()),
+        ),
+        sa.table(
+            "transaction",
+            sa.column("id", sa.Integer()),
+            sa.column("booking_date_typed", sa.Date()),
+            sa.column("value_date_typed", sa.Date()),
+            sa.column("amount_typed", sa.Numeric(14, 2)),
+        ),
+        lambda row: (
+            _parse_date(row.booking_date),
+            _parse_date(row.value_date),
+            Decimal(f"{row.amount:.2f}"),
+        ),
+    )
+
+    with op.batch_alter_table("transaction") as batch:
+        batch.drop_column("booking_date")
+        batch.drop_column("value_date")
+        batch.drop_column("amount")
+    with op.batch_alter_table("transaction") as batch:
+        batch.alter_column("booking_date_typed", new_column_name="booking_date")
+        batch.alter_column("value_date_typed", new_column_name="value_date")
+        batch.alter_column(
+            "amount_typed",
+            new_column_name="amount",
+            existing_type=sa.Numeric(14, 2),
+            nullable=False,
+        )
+    op.create_index(
+        op.f("ix_transaction_booking_date"), "transaction", ["booking_date"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    op.drop_index(op.f("ix_transaction_booking_date"), table_name="transaction")
+    with op.batch_alter_table("transaction") as batch:
+        batch.add_column(sa.Column("booking_date_text", sa.String(), nullable=True))
+        batch.add_column(sa.Column("value_date_text", sa.String(), nullable=True))
+        batch.add_column(sa.Column("amount_float", sa.Float(), nullable=True))
+
+    _copy_in_batches(
+        sa.table(
+            "transaction",
+            sa.column("id", sa.Integer()),
+            sa.column("booking_date", sa.Date()),
+            sa.column("value_date", sa.Date()),
+            sa.column("amount", sa.Numeric(14, 2)),
+        ),
+        sa.table(
+            "transaction",
+            sa.column("id", sa.Integer()),
+            sa.column("booking_date_text", sa.String()),
+            sa.column("value_date_text", sa.String()),
+            sa.column("amount_float", sa.Float()),
+        ),
+        lambda row: (
+            row.booking_date.strftime("%d/%m/%Y") if row.booking_date else None,
+            row.value_date.strftime("%d/%m/%Y") if row.value_date else None,
+            float(row.amount),
+        ),
+    )
+
+    with op.batch_alter_table("transaction") as batch:
+        batch.drop_column("booking_date")
+        batch.drop_column("value_date")
+        batch.drop_column("amount")
+    with op.batch_alter_table("transaction") as batch:
+        batch.alter_column("booking_date_text", new_column_name="booking_date")
+        batch.alter_column("value_date_text", new_column_name="value_date")
+        batch.alter_column(
+            "amount_float", new_column_name="amount", existing_type=sa.Float(), nullable=False
+        )
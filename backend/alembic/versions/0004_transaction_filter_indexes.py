@@ -0,0 +1,51 @@
+"""
+Add indexes backing the transaction list filters.
+
+B-tree indexes cover the account, category and amount filters. On PostgreSQL
+the `pg_trgm` extension is enabled and GIN trigram indexes are built on
+`notes` and `counterparty_name` so substring searches avoid full scans.
+"""
+
+from alembic import op
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    op.create_index(
+        "ix_transaction_account_booking_date", "transaction", ["account", "booking_date"]
+    )
+    op.create_index(
+        "ix_transaction_category_booking_date", "transaction", ["category_id", "booking_date"]
+    )
+    op.create_index("ix_transaction_amount", "transaction", ["amount"])
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_transaction_notes_trgm",
+            "transaction",
+            ["notes"],
+            postgresql_using="gin",
+            postgresql_ops={"notes": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_transaction_counterparty_name_trgm",
+            "transaction",
+            ["counterparty_name"],
+            postgresql_using="gin",
+            postgresql_ops={"counterparty_name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_transaction_counterparty_name_trgm", table_name="transaction")
+        op.drop_index("ix_transaction_notes_trgm", table_name="transaction")
+    op.drop_index("ix_transaction_amount", table_name="transaction")
+    op.drop_index("ix_transaction_category_booking_date", table_name="transaction")
+    op.drop_index("ix_transaction_account_booking_date", table_name="transaction")
@@ -0,0 +1,56 @@
+"""
+Add the `transactionrollup` table and backfill it from existing transactions.
+
+Each row totals the transactions of one (month, account, category) bucket;
+uncategorized transactions use category 0.
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    op.create_table(
+        "transactionrollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("account", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("income", sa.Numeric(16, 2), nullable=False),
+        sa.Column("expenses", sa.Numeric(16, 2), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_transactionrollup_bucket",
+        "transactionrollup",
+        ["month", "account", "category_id"],
+        unique=True,
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        month = "CAST(date_trunc('month', booking_date) AS DATE)"
+    else:
+        month = "date(booking_date, 'start of month')"
+    op.execute(
+        "INSERT INTO transactionrollup"
+        " (month, account, category_id, transaction_count, income, expenses)"
+        f" SELECT {month}, account, COALESCE(category_id, 0), COUNT(*),"
+        " COALESCE(SUM(CASE WHEN amount >= 0 THEN amount END), 0),"
+        " COALESCE(SUM(CASE WHEN amount < 0 THEN amount END), 0)"
+        ' FROM "transaction" WHERE booking_date IS NOT NULL'
+        f" GROUP BY {month}, account, COALESCE(category_id, 0)"
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    op.drop_index("ix_transactionrollup_bucket", table_name="transactionrollup")
+    op.drop_table("transactionrollup")
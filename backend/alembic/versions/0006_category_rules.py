@@ -0,0 +1,38 @@
+"""
+Add the `categoryrule` table for rule-based categorization.
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    op.create_table(
+        "categoryrule",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("counterparty_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("counterparty_account", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("notes", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("amount_min", sa.Numeric(14, 2), nullable=True),
+        sa.Column("amount_max", sa.Numeric(14, 2), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["category_id"], ["category.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_categoryrule_category_id"), "categoryrule", ["category_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    op.drop_index(op.f("ix_categoryrule_category_id"), table_name="categoryrule")
+    op.drop_table("categoryrule")
@@ -0,0 +1,51 @@
+"""
+Add the `budget` and `budgetspending` tables for category budgets.
+
+No budgets exist yet, so there is no consumption to backfill.
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    op.create_table(
+        "budget",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("period", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("amount", sa.Numeric(14, 2), nullable=False),
+        sa.ForeignKeyConstraint(["category_id"], ["category.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_budget_category_id"), "budget", ["category_id"], unique=False)
+    op.create_index("ix_budget_category_period", "budget", ["category_id", "period"], unique=True)
+    op.create_table(
+        "budgetspending",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("budget_id", sa.Integer(), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("spent", sa.Numeric(16, 2), nullable=False),
+        sa.ForeignKeyConstraint(["budget_id"], ["budget.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_budgetspending_period", "budgetspending", ["budget_id", "period_start"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    op.drop_index("ix_budgetspending_period", table_name="budgetspending")
+    op.drop_table("budgetspending")
+    op.drop_index("ix_budget_category_period", table_name="budget")
+    op.drop_index(op.f("ix_budget_category_id"), table_name="budget")
+    op.drop_table("budget")
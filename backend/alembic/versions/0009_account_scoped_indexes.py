@@ -0,0 +1,30 @@
+"""
+Add the indexes serving queries scoped to a user's accounts.
+
+`account.user_id` is indexed to find a user's accounts, and transactions
+get composite indexes led by `account_id` for ID-ordered pages and booking
+date ranges within those accounts.
+"""
+
+from alembic import op
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    op.create_index(op.f("ix_account_user_id"), "account", ["user_id"], unique=False)
+    op.create_index("ix_transaction_account_id_id", "transaction", ["account_id", "id"])
+    op.create_index(
+        "ix_transaction_account_id_booking_date", "transaction", ["account_id", "booking_date"]
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    op.drop_index("ix_transaction_account_id_booking_date", table_name="transaction")
+    op.drop_index("ix_transaction_account_id_id", table_name="transaction")
+    op.drop_index(op.f("ix_account_user_id"), table_name="account")
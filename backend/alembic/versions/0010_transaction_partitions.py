@@ -0,0 +1,149 @@
+"""
+Optionally partition the `transaction` table by booking month on PostgreSQL.
+
+Only runs with `TRANSACTION_PARTITIONING=true` on PostgreSQL; otherwise this
+revision changes nothing. The table is rebuilt as `PARTITION BY RANGE
+(booking_date)` with one partition per month that has transactions, named as
+`app.db.partitions` expects, and the rows are copied over. Later months are
+added by the application as transactions are ingested.
+
+A partitioned table's unique indexes must contain the partition key, so:
+
+- `id` loses its primary key constraint and keeps a plain index. IDs still
+  come from the same sequence.
+- The natural key index also covers `booking_date`.
+
+There is no default partition, so every row needs a booking date. Without a
+default partition, attaching a new month only takes a `SHARE UPDATE
+EXCLUSIVE` lock on the table. The foreign keys on `account_id` and
+`category_id` are dropped for the same reason: attaching would otherwise
+lock `account` and `category` against concurrent writes. The application
+does not rely on them; SQLite does not enforce them either.
+"""
+
+from datetime import date
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import get_settings
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def _is_partitioned() -> bool:
+    return op.get_bind().execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+            " WHERE partrelid = to_regclass('\"transaction\"'))"
+        )
+    ).scalar_one()
+
+
+def _create_indexes(*, partitioned: bool) -> None:
+    natural_key = ["account", "statement_number", "transaction_number"]
+    if partitioned:
+        op.create_index("ix_transaction_id", "transaction", ["id"])
+        natural_key.append("booking_date")
+    op.create_index("ix_transaction_natural_key", "transaction", natural_key, unique=True)
+    op.create_index(
+        op.f("ix_transaction_booking_date"), "transaction", ["booking_date"], unique=False
+    )
+    op.create_index("ix_transaction_account_id_id", "transaction", ["account_id", "id"])
+    op.create_index(
+        "ix_transaction_account_id_booking_date", "transaction", ["account_id", "booking_date"]
+    )
+    op.create_index(
+        "ix_transaction_account_booking_date", "transaction", ["account", "booking_date"]
+    )
+    op.create_index(
+        "ix_transaction_category_booking_date", "transaction", ["category_id", "booking_date"]
+    )
+    op.create_index("ix_transaction_amount", "transaction", ["amount"])
+    op.create_index(
+        "ix_transaction_notes_trgm",
+        "transaction",
+        ["notes"],
+        postgresql_using="gin",
+        postgresql_ops={"notes": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_transaction_counterparty_name_trgm",
+        "transaction",
+        ["counterparty_name"],
+        postgresql_using="gin",
+        postgresql_ops={"counterparty_name": "gin_trgm_ops"},
+    )
+
+
+def _replace_table(new_table: str) -> None:
+    """Copy `transaction` into `new_table`, then put `new_table` in its place."""
+    bind = op.get_bind()
+    op.execute(f'INSERT INTO {new_table} SELECT * FROM "transaction"')
+    # The ID sequence would be dropped with the table that owns it.
+    sequence = bind.execute(
+        text("SELECT pg_get_serial_sequence('\"transaction\"', 'id')")
+    ).scalar_one()
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+    op.execute('DROP TABLE "transaction"')
+    op.execute(f'ALTER TABLE {new_table} RENAME TO "transaction"')
+    if sequence:
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY "transaction".id')
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    if op.get_bind().dialect.name != "postgresql" or not get_settings().transaction_partitioning:
+        return
+    if _is_partitioned():
+        return
+    bind = op.get_bind()
+    undated = bind.execute(
+        text('SELECT COUNT(*) FROM "transaction" WHERE booking_date IS NULL')
+    ).scalar_one()
+    if undated:
+        raise RuntimeError(
+            f"{undated} transaction(s) have no booking date and cannot be partitioned; "
+            "set their booking date or delete them first"
+        )
+
+    op.execute(
+        'CREATE TABLE transaction_partitioned (LIKE "transaction" INCLUDING DEFAULTS)'
+        " PARTITION BY RANGE (booking_date)"
+    )
+    months = bind.execute(
+        text(
+            "SELECT DISTINCT CAST(date_trunc('month', booking_date) AS DATE)"
+            ' FROM "transaction" ORDER BY 1'
+        )
+    ).scalars()
+    for month in months:
+        following = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        op.execute(
+            f"CREATE TABLE transaction_y{month.year:04d}m{month.month:02d}"
+            " PARTITION OF transaction_partitioned"
+            f" FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+    _replace_table("transaction_partitioned")
+    # Built after the copy, which is faster than maintaining them row by row.
+    _create_indexes(partitioned=True)
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    if op.get_bind().dialect.name != "postgresql" or not _is_partitioned():
+        return
+    op.execute('CREATE TABLE transaction_unpartitioned (LIKE "transaction" INCLUDING DEFAULTS)')
+    _replace_table("transaction_unpartitioned")
+    op.create_primary_key("transaction_pkey", "transaction", ["id"])
+    op.create_foreign_key(
+        "transaction_account_id_fkey", "transaction", "account", ["account_id"], ["id"]
+    )
+    op.create_foreign_key(
+        "transaction_category_id_fkey", "transaction", "category", ["category_id"], ["id"]
+    )
+    _create_indexes(partitioned=False)
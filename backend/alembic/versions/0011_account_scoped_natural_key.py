@@ -0,0 +1,66 @@
+"""
+Scope the transaction natural key to the linked account.
+
+The unique natural-key index moves from the raw account number to
+`account_id`, so identical statement and transaction numbers only count as
+duplicates within one account, and therefore within one owner's data.
+Transactions not linked to an account yet are linked first, as
+`backfill-accounts` does, so they keep being deduplicated. On a partitioned
+table the index keeps covering `booking_date`.
+
+Downgrading restores the key on the raw account number; it fails if two
+accounts have stored the same statement and transaction numbers since.
+"""
+
+from typing import List
+
+from alembic import op
+from sqlalchemy import text
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def _is_partitioned() -> bool:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    return bind.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+            " WHERE partrelid = to_regclass('\"transaction\"'))"
+        )
+    ).scalar_one()
+
+
+def _replace_natural_key(columns: List[str]) -> None:
+    if _is_partitioned():
+        columns = [*columns, "booking_date"]
+    op.drop_index("ix_transaction_natural_key", table_name="transaction")
+    op.create_index("ix_transaction_natural_key", "transaction", columns, unique=True)
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    # Account numbers are not unique; as in `AccountResolver`, the oldest
+    # account wins and missing accounts are created without an owner.
+    op.execute(
+        'INSERT INTO account (number, currency)'
+        ' SELECT t.account, MIN(t.currency) FROM "transaction" AS t'
+        ' WHERE t.account_id IS NULL'
+        ' AND NOT EXISTS (SELECT 1 FROM account AS a WHERE a.number = t.account)'
+        ' GROUP BY t.account'
+    )
+    op.execute(
+        'UPDATE "transaction" SET account_id ='
+        ' (SELECT MIN(a.id) FROM account AS a WHERE a.number = "transaction".account)'
+        ' WHERE account_id IS NULL'
+    )
+    _replace_natural_key(["account_id", "statement_number", "transaction_number"])
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    _replace_natural_key(["account", "statement_number", "transaction_number"])
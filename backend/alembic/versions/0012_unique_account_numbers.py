@@ -0,0 +1,116 @@
+"""
+Make account numbers unique per owner.
+
+A user has at most one account per number, and so do accounts without an
+owner (a partial index, as NULLs never conflict in a unique index). Accounts
+created twice by concurrent uploads are merged into the oldest first: their
+transactions move over, except those already stored on an older duplicate,
+which are deleted. If any were deleted, the rollup and budget consumption
+are recomputed.
+"""
+
+from alembic import op
+from sqlalchemy import text
+
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+_SAME_OWNER = "(b.user_id = a.user_id OR (b.user_id IS NULL AND a.user_id IS NULL))"
+
+
+def _is_partitioned() -> bool:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    return bind.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+            " WHERE partrelid = to_regclass('\"transaction\"'))"
+        )
+    ).scalar_one()
+
+
+def _rebuild_rollup() -> None:
+    """Recompute `transactionrollup` and `budgetspending` from the transactions."""
+    if op.get_bind().dialect.name == "postgresql":
+        month = "CAST(date_trunc('month', booking_date) AS DATE)"
+        year = "CAST(date_trunc('year', r.month) AS DATE)"
+    else:
+        month = "date(booking_date, 'start of month')"
+        year = "date(r.month, 'start of year')"
+    op.execute("DELETE FROM transactionrollup")
+    op.execute(
+        "INSERT INTO transactionrollup"
+        " (month, account, category_id, transaction_count, income, expenses)"
+        f" SELECT {month}, account, COALESCE(category_id, 0), COUNT(*),"
+        " COALESCE(SUM(CASE WHEN amount >= 0 THEN amount END), 0),"
+        " COALESCE(SUM(CASE WHEN amount < 0 THEN amount END), 0)"
+        ' FROM "transaction" WHERE booking_date IS NOT NULL'
+        f" GROUP BY {month}, account, COALESCE(category_id, 0)"
+    )
+    period_start = f"CASE WHEN b.period = 'year' THEN {year} ELSE r.month END"
+    op.execute("DELETE FROM budgetspending")
+    op.execute(
+        "INSERT INTO budgetspending (budget_id, period_start, transaction_count, spent)"
+        f" SELECT b.id, {period_start}, SUM(r.transaction_count),"
+        " -SUM(r.income + r.expenses)"
+        " FROM budget AS b JOIN transactionrollup AS r ON r.category_id = b.category_id"
+        f" GROUP BY b.id, {period_start}"
+    )
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    bind = op.get_bind()
+    same_booking_date = ""
+    if _is_partitioned():
+        # The partitioned natural key also covers the booking date.
+        same_booking_date = " AND earlier.booking_date = later.booking_date"
+    deleted = bind.execute(
+        text(
+            'DELETE FROM "transaction" WHERE id IN ('
+            ' SELECT later.id FROM "transaction" AS later'
+            " JOIN account AS a ON a.id = later.account_id"
+            f" JOIN account AS b ON b.number = a.number AND {_SAME_OWNER} AND b.id < a.id"
+            ' JOIN "transaction" AS earlier ON earlier.account_id = b.id'
+            " AND earlier.statement_number = later.statement_number"
+            " AND earlier.transaction_number = later.transaction_number"
+            f"{same_booking_date}"
+            ")"
+        )
+    ).rowcount
+    op.execute(
+        'UPDATE "transaction" SET account_id = ('
+        " SELECT MIN(b.id) FROM account AS a JOIN account AS b"
+        f" ON b.number = a.number AND {_SAME_OWNER}"
+        ' WHERE a.id = "transaction".account_id'
+        ") WHERE account_id IN ("
+        f" SELECT a.id FROM account AS a JOIN account AS b ON b.number = a.number AND {_SAME_OWNER}"
+        " AND b.id < a.id"
+        ")"
+    )
+    op.execute(
+        "DELETE FROM account WHERE id IN ("
+        f" SELECT a.id FROM account AS a JOIN account AS b ON b.number = a.number AND {_SAME_OWNER}"
+        " AND b.id < a.id"
+        ")"
+    )
+    if deleted:
+        _rebuild_rollup()
+    op.create_index("ix_account_user_id_number", "account", ["user_id", "number"], unique=True)
+    op.create_index(
+        "ix_account_number_unowned",
+        "account",
+        ["number"],
+        unique=True,
+        sqlite_where=text("user_id IS NULL"),
+        postgresql_where=text("user_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    op.drop_index("ix_account_number_unowned", table_name="account")
+    op.drop_index("ix_account_user_id_number", table_name="account")
@@ -0,0 +1,70 @@
+"""
+Key the `transactionrollup` buckets by the linked account.
+
+Buckets keyed by the raw account number merged the transactions of two
+users' accounts with the same number, so per-user reports included the
+other user's spending. The table only holds derived totals, so it is
+recreated with an `account_id` column and refilled from the transactions;
+transactions not linked to an account yet use account 0. Budget consumption
+is summed per category over all buckets and does not change.
+"""
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def _recreate_rollup(account_column: sa.Column, account_expression: str) -> None:
+    """Replace `transactionrollup` with one keyed by `account_column`."""
+    op.drop_index("ix_transactionrollup_bucket", table_name="transactionrollup")
+    op.drop_table("transactionrollup")
+    op.create_table(
+        "transactionrollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        account_column,
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("income", sa.Numeric(16, 2), nullable=False),
+        sa.Column("expenses", sa.Numeric(16, 2), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_transactionrollup_bucket",
+        "transactionrollup",
+        ["month", account_column.name, "category_id"],
+        unique=True,
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        month = "CAST(date_trunc('month', booking_date) AS DATE)"
+    else:
+        month = "date(booking_date, 'start of month')"
+    op.execute(
+        "INSERT INTO transactionrollup"
+        f" (month, {account_column.name}, category_id, transaction_count, income, expenses)"
+        f" SELECT {month}, {account_expression}, COALESCE(category_id, 0), COUNT(*),"
+        " COALESCE(SUM(CASE WHEN amount >= 0 THEN amount END), 0),"
+        " COALESCE(SUM(CASE WHEN amount < 0 THEN amount END), 0)"
+        ' FROM "transaction" WHERE booking_date IS NOT NULL'
+        f" GROUP BY {month}, {account_expression}, COALESCE(category_id, 0)"
+    )
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    _recreate_rollup(
+        sa.Column("account_id", sa.Integer(), nullable=False), "COALESCE(account_id, 0)"
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations."""
+    _recreate_rollup(
+        sa.Column("account", sqlmodel.sql.sqltypes.AutoString(), nullable=False), "account"
+    )
@@ -0,0 +1,63 @@
+"""
+Give budgets and categorization rules an owner.
+
+`budget.user_id` and `categoryrule.user_id` reference the owning user. A
+budget is unique per owner, category and period, and budgets without an
+owner stay unique per category and period through a partial index. Existing
+budgets and rules keep no owner, so they still cover every account and the
+recorded consumption does not change.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = '0014'
+down_revision = '0013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run upgrade migrations."""
+    for table in ("budget", "categoryrule"):
+        if op.get_bind().dialect.name == "sqlite":
+            # Alembic only adds foreign keys to SQLite tables by copying them,
+            # which needs a constraint name; SQLite itself accepts an inline
+            # reference on a new nullable column.
+            op.execute(f'ALTER TABLE {table} ADD COLUMN user_id INTEGER REFERENCES "user" (id)')
+        else:
+            op.add_column(
+                table,
+                sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=True),
+            )
+        op.create_index(f"ix_{table}_user_id", table, ["user_id"], unique=False)
+    op.drop_index("ix_budget_category_period", table_name="budget")
+    op.create_index(
+        "ix_budget_user_id_category_period",
+        "budget",
+        ["user_id", "category_id", "period"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_budget_category_period_unowned",
+        "budget",
+        ["category_id", "period"],
+        unique=True,
+        sqlite_where=sa.text("user_id IS NULL"),
+        postgresql_where=sa.text("user_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Run downgrade migrations.
+
+    Fails if two users have a budget for the same category and period.
+    """
+    op.drop_index("ix_budget_category_period_unowned", table_name="budget")
+    op.drop_index("ix_budget_user_id_category_period", table_name="budget")
+    op.create_index("ix_budget_category_period", "budget", ["category_id", "period"], unique=True)
+    for table in ("budget", "categoryrule"):
+        with op.batch_alter_table(table) as batch:
+            # Dropping the column also drops its foreign key.
+            batch.drop_index(f"ix_{table}_user_id")
+            batch.drop_column("user_id")
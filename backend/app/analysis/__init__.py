@@ -0,0 +1,3 @@
+"""Analyses over the stored transaction history."""
+
+from .recurring import CADENCES, RecurringDetector, get_recurring_detector  # noqa: F401
@@ -0,0 +1,320 @@
+"""
+Detection of recurring payments in the transaction history.
+
+Transactions are grouped per account, counterparty and direction (money in
+or out). A counterparty is identified by its account number, ignoring
+whitespace and case, or by its lower-cased name when the export has no
+account number. A group is recurring when the median gap between its
+booking dates falls within one of the `CADENCES`, most gaps do, and its
+amounts vary little.
+
+`RecurringDetector` keeps a compact copy of the columns the analysis needs
+(group code, booking day and amount per transaction) together with
+statistics per group, for all accounts or for those of one user. A refresh
+does nothing unless the data version (see `app.crud.version`) changed. It
+then reads only the transactions with a higher ID than it has already seen,
+through a server-side cursor, and recomputes the statistics of the groups
+those transactions belong to in one vectorized pass. The module imports
+pandas and NumPy, so load it on first use.
+"""
+
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, String, cast, func, select, type_coerce
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.crud.transaction import owned_by
+from app.crud.version import get_data_version
+from app.models.recurring import RecurringPayment
+from app.models.transaction import Transaction
+
+
+class Cadence(NamedTuple):
+    name: str
+    # Nominal gap between bookings, and the deviation still accepted.
+    days: float
+    tolerance: float
+
+
+# Tolerances absorb month lengths and bookings moved past weekends.
+CADENCES = (
+    Cadence("weekly", 7, 1),
+    Cadence("biweekly", 14, 2),
+    Cadence("monthly", 30.44, 5),
+    Cadence("quarterly", 91.31, 10),
+    Cadence("yearly", 365.25, 20),
+)
+
+# Fraction of a group's gaps that must match its cadence.
+MIN_REGULARITY = 0.75
+
+_COLUMNS = ("id", "account", "counterparty_account", "counterparty_name", "booking_date", "amount")
+_INFO_COLUMNS = ["account", "counterparty_account", "counterparty_name"]
+_EPOCH = date(1970, 1, 1)
+
+
+def _text(value: object) -> Optional[str]:
+    """Return `value` unless it is a missing or empty cell."""
+    return None if pd.isna(value) or value == "" else str(value)
+
+
+class RecurringDetector:
+    """Incrementally maintained recurring-payment statistics.
+
+    Args:
+        batch_size (int): Rows fetched per server-side cursor batch.
+        owner_id (int, optional): Only analyse the accounts of this user.
+            Defaults to None, which covers all accounts.
+    """
+
+    def __init__(self, *, batch_size: int, owner_id: Optional[int] = None) -> None:
+        self._batch_size = batch_size
+        self._owner_id = owner_id
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Data version read before the last load.
+        self._version: Optional[int] = None
+        self._last_id = 0
+        # Transactions read so far, including those without a booking date.
+        self._seen = 0
+        # Group key ("account, counterparty, direction") -> code, by position.
+        self._keys = pd.Index([], dtype=object)
+        self._info = pd.DataFrame(columns=_INFO_COLUMNS)
+        self._codes = np.empty(0, dtype=np.int64)
+        self._days = np.empty(0, dtype=np.int64)
+        self._amounts = np.empty(0, dtype=np.float64)
+        self._stats = pd.DataFrame()
+
+    def _encode(self, keys: pd.Series) -> np.ndarray:
+        """Map group keys to codes, assigning codes to keys not seen before."""
+        codes = self._keys.get_indexer(keys)
+        unseen = codes < 0
+        if unseen.any():
+            self._keys = self._keys.append(pd.Index(pd.unique(keys[unseen])))
+            codes[unseen] = self._keys.get_indexer(keys[unseen])
+        return codes
+
+    def _load(self, db: Session) -> np.ndarray:
+        """Read transactions added since the last load and return the touched group codes."""
+        table = Transaction.__table__
+        # Dates and amounts skip SQLAlchemy's per-row conversion to `date` and
+        # `Decimal`; pandas parses them a column at a time instead.
+        columns = {
+            "booking_date": type_coerce(table.c.booking_date, String),
+            "amount": cast(table.c.amount, Float),
+        }
+        statement = (
+            select(*(columns.get(column, table.c[column]) for column in _COLUMNS))
+            .where(table.c.id > self._last_id)
+            .order_by(table.c.id)
+        )
+        if self._owner_id is not None:
+            statement = statement.where(owned_by(self._owner_id))
+        codes, days, amounts = [self._codes], [self._days], [self._amounts]
+        touched = []
+        result = db.connection().execute(
+            statement, execution_options={"yield_per": self._batch_size}
+        )
+        with result:
+            for partition in result.partitions():
+                frame = pd.DataFrame.from_records(partition, columns=_COLUMNS)
+                self._seen += len(frame)
+                self._last_id = int(frame["id"].iat[-1])
+
+                counterparty_account = (
+                    frame["counterparty_account"]
+                    .fillna("")
+                    .str.replace(r"\s+", "", regex=True)
+                    .str.upper()
+                )
+                counterparty_name = frame["counterparty_name"].fillna("").str.strip().str.lower()
+                counterparty = ("iban:" + counterparty_account).where(
+                    counterparty_account != "", ("name:" + counterparty_name)
+                )
+                amount = frame["amount"].astype(float)
+                keep = (
+                    frame["booking_date"].notna()
+                    & ((counterparty_account != "") | (counterparty_name != ""))
+                    & (amount != 0)
+                )
+                if not keep.any():
+                    continue
+                frame = frame[keep]
+                amount = amount[keep]
+                direction = np.where(amount < 0, "out", "in")
+                group_codes = self._encode(
+                    frame["account"] + "\x1f" + counterparty[keep] + "\x1f" + direction
+                )
+                frame = frame.assign(code=group_codes)
+                latest = frame.groupby("code")[_INFO_COLUMNS].last()
+                self._info = latest.combine_first(self._info)
+
+                codes.append(group_codes.astype(np.int64))
+                days.append(
+                    pd.to_datetime(frame["booking_date"])
+                    .to_numpy(dtype="datetime64[D]")
+                    .astype(np.int64)
+                )
+                amounts.append(amount.to_numpy(dtype=np.float64))
+                touched.append(np.unique(group_codes))
+
+        self._codes = np.concatenate(codes)
+        self._days = np.concatenate(days)
+        self._amounts = np.concatenate(amounts)
+        return np.unique(np.concatenate(touched)) if touched else np.empty(0, dtype=np.int64)
+
+    def _recompute(self, touched: np.ndarray) -> None:
+        """Recompute the statistics of the `touched` groups from their full history."""
+        mask = np.isin(self._codes, touched)
+        frame = pd.DataFrame(
+            {"code": self._codes[mask], "day": self._days[mask], "amount": self._amounts[mask]}
+        ).sort_values(["code", "day"], kind="stable", ignore_index=True)
+        frame["gap"] = frame.groupby("code")["day"].diff()
+        stats = frame.groupby("code").agg(
+            occurrences=("day", "size"),
+            first_day=("day", "min"),
+            last_day=("day", "max"),
+            interval_days=("gap", "median"),
+            average_amount=("amount", "mean"),
+            amount_std=("amount", "std"),
+        )
+
+        # Cadence whose band contains the median gap, or -1.
+        nominal = np.array([cadence.days for cadence in CADENCES])
+        tolerance = np.array([cadence.tolerance for cadence in CADENCES])
+        matches = (
+            np.abs(stats["interval_days"].to_numpy()[:, None] - nominal) <= tolerance
+        )
+        stats["cadence"] = np.where(matches.any(axis=1), matches.argmax(axis=1), -1)
+
+        # Share of each group's gaps that fall within its cadence's band.
+        cadence = stats["cadence"].reindex(frame["code"]).to_numpy()
+        band = np.clip(cadence, 0, None)
+        in_band = (cadence >= 0) & (
+            np.abs(frame["gap"].to_numpy() - nominal[band]) <= tolerance[band]
+        )
+        hits = pd.Series(in_band).groupby(frame["code"]).sum()
+        stats["regularity"] = hits / (stats["occurrences"] - 1).clip(lower=1)
+
+        self._stats = pd.concat([self._stats.drop(index=touched, errors="ignore"), stats])
+
+    def refresh(self, db: Session) -> None:
+        """Bring the statistics up to date with the transaction table.
+
+        While the data version is the one read by the last refresh, nothing
+        has been committed since and the transaction table is not queried.
+
+        Transactions are assumed to be immutable apart from their category.
+        Rows that become visible with an ID below one already read (a slower
+        concurrent import committing late) are caught by comparing row
+        counts, and trigger a full reload. The count only runs after a
+        commit and, for a user's detector, only covers their accounts.
+
+        Args:
+            db (Session): A database session.
+        """
+        with self._lock:
+            # Read before loading, so commits racing with the load change it.
+            version = get_data_version(db)
+            if version == self._version:
+                return
+            touched = self._load(db)
+            table = Transaction.__table__
+            statement = select(func.count()).where(table.c.id <= self._last_id)
+            if self._owner_id is not None:
+                statement = statement.where(owned_by(self._owner_id))
+            stored = db.connection().execute(statement).scalar_one()
+            if stored != self._seen:
+                self._reset()
+                touched = self._load(db)
+            if len(touched):
+                self._recompute(touched)
+            self._version = version
+
+    def detect(
+        self,
+        *,
+        account: Optional[str] = None,
+        min_occurrences: int = 3,
+        max_amount_variation: float = 0.25,
+    ) -> List[RecurringPayment]:
+        """Return the recurring series found by the last `refresh`.
+
+        Args:
+            account (str, optional): Restrict to one raw account number.
+            min_occurrences (int, optional): Fewest bookings in a series.
+                Defaults to 3.
+            max_amount_variation (float, optional): Largest standard deviation
+                of the amounts, relative to their mean. Defaults to 0.25.
+
+        Returns:
+            List[RecurringPayment]: Series ordered by account, then by the
+            magnitude of their average amount, largest first.
+        """
+        with self._lock:
+            if self._stats.empty:
+                return []
+            stats = self._stats.join(self._info)
+        variation = stats["amount_std"].fillna(0) / stats["average_amount"].abs()
+        selected = (
+            (stats["cadence"] >= 0)
+            & (stats["occurrences"] >= min_occurrences)
+            & (stats["regularity"] >= MIN_REGULARITY)
+            & (variation <= max_amount_variation)
+        )
+        if account is not None:
+            selected &= stats["account"] == account
+        stats = stats[selected].assign(
+            amount_variation=variation[selected],
+            magnitude=stats["average_amount"][selected].abs(),
+        )
+        stats = stats.sort_values(["account", "magnitude"], ascending=[True, False])
+        return [
+            RecurringPayment(
+                account=row.account,
+                counterparty_account=_text(row.counterparty_account),
+                counterparty_name=_text(row.counterparty_name),
+                cadence=CADENCES[row.cadence].name,
+                interval_days=float(row.interval_days),
+                occurrences=int(row.occurrences),
+                average_amount=round(float(row.average_amount), 2),
+                amount_variation=round(float(row.amount_variation), 4),
+                regularity=round(float(row.regularity), 4),
+                first_date=_EPOCH + timedelta(days=int(row.first_day)),
+                last_date=_EPOCH + timedelta(days=int(row.last_day)),
+                next_expected=_EPOCH
+                + timedelta(days=int(row.last_day) + round(row.interval_days)),
+            )
+            for row in stats.itertuples()
+        ]
+
+
+_detectors: Dict[Optional[int], RecurringDetector] = {}
+_detectors_lock = threading.Lock()
+
+
+def get_recurring_detector(owner_id: Optional[int] = None) -> RecurringDetector:
+    """Return this process's detector for `owner_id`, creating it on first use.
+
+    Args:
+        owner_id (int, optional): User whose accounts are analysed. Defaults
+            to None, the detector covering all accounts.
+
+    Returns:
+        RecurringDetector: A detector configured from `Settings`.
+    """
+    with _detectors_lock:
+        detector = _detectors.get(owner_id)
+        if detector is None:
+            detector = RecurringDetector(
+                batch_size=get_settings().analysis_batch_size, owner_id=owner_id
+            )
+            _detectors[owner_id] = detector
+        return detector
@@ -1,3 +1,3 @@
 """API initialization and common dependencies."""
 
-from .deps import get_db  # noqa: F401
\ No newline at end of file
+from .deps import get_async_db, get_db  # noqa: F401
\ No newline at end of file
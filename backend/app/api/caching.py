@@ -0,0 +1,192 @@
+"""
+HTTP caching for read endpoints.
+
+`ReadCacheMiddleware` tags successful `GET` responses with an `ETag` derived
+from the data version (see `app.crud.version`), answers matching
+`If-None-Match` requests with `304 Not Modified` without running the route,
+and can keep rendered responses in a small LRU cache with a TTL. Because the
+version is part of every cache key, an entry can never outlive the data it
+was built from; the TTL only bounds how long unused entries stay in memory.
+
+With authentication on, the bearer token is checked before either shortcut
+and the user's ID becomes part of the `ETag` and the cache key, so a
+response is never revalidated or served for anyone but the user it was
+built for. Requests without a valid token go straight to the route, which
+rejects them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security.utils import get_authorization_scheme_param
+from sqlmodel import Session
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp
+
+from app.crud.user import get_user_by_token
+from app.crud.version import get_data_version
+from app.db.session import engine
+
+# Responses may be stored but must be revalidated before every reuse.
+CACHE_CONTROL = "private, no-cache"
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...], Optional[int], int]
+CachedResponse = Tuple[bytes, List[Tuple[str, str]]]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds.
+
+    Args:
+        max_entries (int): Capacity; the least recently used entry is evicted.
+        ttl (float): Seconds an entry stays valid after it was stored.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Return the entry for `key` if present and not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: CacheKey, value: CachedResponse) -> None:
+        """Store `value`, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+def _read_data_version(max_age: float) -> int:
+    with Session(engine) as db:
+        return get_data_version(db, max_age=max_age)
+
+
+def _authenticate(token: str, secret_key: str) -> Optional[int]:
+    with Session(engine) as db:
+        user = get_user_by_token(db, token=token, secret_key=secret_key)
+        return user.id if user is not None else None
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # Weak comparison, as required for If-None-Match.
+    return "*" in candidates or etag.removeprefix("W/") in (
+        candidate.removeprefix("W/") for candidate in candidates
+    )
+
+
+class ReadCacheMiddleware(BaseHTTPMiddleware):
+    """Adds ETag revalidation and an optional response cache to `GET` routes.
+
+    Only `200` responses with a known length are cached; streamed responses
+    get an `ETag` but are passed through untouched.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+        paths (Iterable[str]): Path prefixes whose `GET` responses depend only
+            on the data version and the query string.
+        excluded_paths (Iterable[str], optional): Prefixes within `paths`
+            whose responses depend on something else, such as the date.
+            Defaults to none.
+        version_ttl (float): Seconds a data version read may be reused.
+        cache_size (int): Response cache capacity; 0 disables the cache.
+        cache_ttl (float): Seconds a cached response is kept.
+        secret_key (str, optional): Key access tokens are signed with; set
+            it when authentication is on. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        paths: Iterable[str],
+        excluded_paths: Iterable[str] = (),
+        version_ttl: float,
+        cache_size: int = 0,
+        cache_ttl: float = 60,
+        secret_key: Optional[str] = None,
+    ) -> None:
+        super().__init__(app)
+        self._paths = tuple(paths)
+        self._excluded_paths = tuple(excluded_paths)
+        self._version_ttl = version_ttl
+        self._cache = ResponseCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self._secret_key = secret_key
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        path = request.url.path
+        if (
+            request.method != "GET"
+            or not path.startswith(self._paths)
+            or path.startswith(self._excluded_paths)
+        ):
+            return await call_next(request)
+
+        user_id: Optional[int] = None
+        if self._secret_key is not None:
+            scheme, token = get_authorization_scheme_param(request.headers.get("authorization"))
+            if scheme.lower() == "bearer" and token:
+                user_id = await run_in_threadpool(_authenticate, token, self._secret_key)
+            if user_id is None:
+                return await call_next(request)
+
+        version = await run_in_threadpool(_read_data_version, self._version_ttl)
+        # Scoped routes answer each user differently, so the user is part of
+        # the validator and the cache key. `Vary` tells shared caches the
+        # same.
+        etag = f'W/"{version}"' if user_id is None else f'W/"{version}-{user_id}"'
+        validators = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Authorization"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+
+        key: CacheKey = (
+            path,
+            tuple(sorted(request.query_params.multi_items())),
+            user_id,
+            version,
+        )
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                body, headers = cached
+                response = Response(content=body, status_code=status.HTTP_200_OK)
+                response.raw_headers = [
+                    (name.encode("latin-1"), value.encode("latin-1")) for name, value in headers
+                ]
+                return response
+
+        response = await call_next(request)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        response.headers.update(validators)
+        if self._cache is None or "content-length" not in response.headers:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in response.raw_headers
+        ]
+        self._cache.set(key, (body, headers))
+        cached_response = Response(content=body, status_code=response.status_code)
+        cached_response.raw_headers = response.raw_headers
+        return cached_response
@@ -5,13 +5,62 @@ These dependencies can be overridden in tests to provide test database
 connections or mocked services.
 """
 
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.db.session import get_session
+from app.core.config import get_settings
+from app.crud.user import get_user_by_token
+from app.db.session import get_async_session, get_session
+from app.models.user import User
+
+_bearer_token = OAuth2PasswordBearer(tokenUrl="auth/token", auto_error=False)
 
 
 def get_db() -> Generator[Session, None, None]:
     """Provide a database session dependency for route handlers."""
-    yield from get_session()
\ No newline at end of file
+    yield from get_session()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an asyncio database session dependency for `async def` handlers."""
+    async for session in get_async_session():
+        yield session
+
+
+def get_current_user(
+    token: Optional[str] = Depends(_bearer_token), db: Session = Depends(get_db)
+) -> Optional[User]:
+    """Authenticate the request's bearer token when `Settings.auth_enabled` is set.
+
+    Returns:
+        Optional[User]: The token's user, or `None` when authentication is off.
+
+    Raises:
+        HTTPException: 401 if the token is missing, invalid or expired, or
+            its user no longer exists or is deactivated.
+    """
+    settings = get_settings()
+    if not settings.auth_enabled:
+        return None
+    user = get_user_by_token(db, token=token, secret_key=settings.secret_key) if token else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def get_owner_id(user: Optional[User] = Depends(get_current_user)) -> Optional[int]:
+    """Return the ID of the user whose accounts a request is scoped to.
+
+    Returns:
+        Optional[int]: The authenticated user's ID, or `None` when
+        authentication is off and every account is visible.
+    """
+    return user.id if user is not None else None
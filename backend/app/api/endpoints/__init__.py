@@ -1,3 +1,10 @@
 """API endpoint routers."""
 
-from .transactions import router as transactions  # noqa: F401
\ No newline at end of file
+from .auth import router as auth  # noqa: F401
+from .budgets import router as budgets  # noqa: F401
+from .categories import router as categories  # noqa: F401
+from .imports import router as imports  # noqa: F401
+from .metrics import router as metrics  # noqa: F401
+from .reports import router as reports  # noqa: F401
+from .rules import router as rules  # noqa: F401
+from .transactions import router as transactions  # noqa: F401
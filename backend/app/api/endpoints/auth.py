@@ -0,0 +1,55 @@
+"""
+API route issuing access tokens.
+
+Only registered when `Settings.auth_enabled` is set. Users are created with
+`python -m app.commands create-user`.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlmodel import Session
+
+from app.api.deps import get_db
+from app.core.config import get_settings
+from app.core.security import create_access_token
+from app.crud.user import authenticate_user
+from app.models.user import AccessToken
+
+
+router = APIRouter()
+
+
+@router.post("/token", response_model=AccessToken, summary="Log in and obtain an access token")
+def login(
+    *,
+    form: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db),
+) -> AccessToken:
+    """Exchange an e-mail address (`username`) and password for a bearer token.
+
+    Send the token as `Authorization: Bearer <token>` on subsequent requests.
+
+    Args:
+        form (OAuth2PasswordRequestForm): Form fields `username` and `password`.
+        db (Session): Database session dependency.
+
+    Returns:
+        AccessToken: A token valid for `Settings.access_token_ttl` seconds.
+
+    Raises:
+        HTTPException: If the credentials are wrong or the user is deactivated.
+    """
+    user = authenticate_user(db, email=form.username, password=form.password)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect e-mail address or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    settings = get_settings()
+    return AccessToken(
+        access_token=create_access_token(
+            user.id, secret_key=settings.secret_key, ttl=settings.access_token_ttl
+        ),
+        expires_in=settings.access_token_ttl,
+    )
@@ -0,0 +1,164 @@
+"""
+API routes for managing category budgets and reading their status.
+
+Budget consumption is maintained as transactions are ingested or
+recategorized, so `GET /budgets/status` reads one row per budget. With
+`Settings.auth_enabled` every route requires a bearer token and only covers
+the caller's budgets, which only count the caller's accounts.
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlmodel import Session
+
+from app.api.deps import get_db, get_owner_id
+from app.crud.budget import (
+    create_budget,
+    delete_budget,
+    get_budget_statuses,
+    get_budgets,
+    update_budget,
+)
+from app.models.budget import Budget, BudgetBase, BudgetStatus, BudgetUpdate
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Budget], summary="List budgets")
+def list_budgets(
+    *, owner_id: Optional[int] = Depends(get_owner_id), db: Session = Depends(get_db)
+) -> List[Budget]:
+    """Return all budgets.
+
+    Args:
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        List[Budget]: Budgets ordered by ID.
+    """
+    return get_budgets(db, owner_id=owner_id)
+
+
+@router.post(
+    "/",
+    response_model=Budget,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a budget",
+)
+def add_budget(
+    *,
+    budget: BudgetBase,
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> Budget:
+    """Create a budget for a category, counting the transactions already stored.
+
+    Args:
+        budget (BudgetBase): The budget's category, period and amount.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        Budget: The persisted budget.
+
+    Raises:
+        HTTPException: If the budget is invalid or duplicates an existing one.
+    """
+    try:
+        return create_budget(
+            db, budget=Budget.model_validate(budget, update={"user_id": owner_id})
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@router.get(
+    "/status",
+    response_model=List[BudgetStatus],
+    summary="Spending and remaining amount of every budget",
+)
+def budget_status(
+    *,
+    on: Optional[date] = Query(
+        None, description="Report the month or year containing this day; defaults to today."
+    ),
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> List[BudgetStatus]:
+    """Return every budget with what it has consumed in the current period.
+
+    Args:
+        on (date, optional): Day whose period is reported. Defaults to today.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        List[BudgetStatus]: One status per budget, ordered by budget ID.
+    """
+    return get_budget_statuses(db, on=on or date.today(), owner_id=owner_id)
+
+
+@router.patch("/{budget_id}", response_model=Budget, summary="Change a budget's amount")
+def change_budget(
+    *,
+    budget_id: int,
+    changes: BudgetUpdate,
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> Budget:
+    """Set a new amount for a budget.
+
+    Args:
+        budget_id (int): ID of the budget to change.
+        changes (BudgetUpdate): The new amount.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        Budget: The updated budget.
+
+    Raises:
+        HTTPException: If the amount is invalid or the budget does not exist.
+    """
+    try:
+        budget = update_budget(
+            db, budget_id=budget_id, amount=changes.amount, owner_id=owner_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    if budget is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Budget not found")
+    return budget
+
+
+@router.delete(
+    "/{budget_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a budget",
+)
+def remove_budget(
+    *,
+    budget_id: int,
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Delete a budget and its recorded consumption.
+
+    Args:
+        budget_id (int): ID of the budget to delete.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        Response: An empty `204 No Content` response.
+
+    Raises:
+        HTTPException: If the budget does not exist.
+    """
+    if not delete_budget(db, budget_id=budget_id, owner_id=owner_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Budget not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,53 @@
+"""
+API routes for managing transaction categories.
+"""
+
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session
+
+from app.api.deps import get_db
+from app.crud.category import create_category, get_categories
+from app.models.category import Category, CategoryBase
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Category], summary="List categories")
+def list_categories(*, db: Session = Depends(get_db)) -> List[Category]:
+    """Return all categories ordered by name.
+
+    Args:
+        db (Session): Database session dependency.
+
+    Returns:
+        List[Category]: The categories.
+    """
+    return get_categories(db)
+
+
+@router.post(
+    "/",
+    response_model=Category,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a category",
+)
+def add_category(*, category: CategoryBase, db: Session = Depends(get_db)) -> Category:
+    """Create a category that transactions and rules can refer to.
+
+    Args:
+        category (CategoryBase): The category's name.
+        db (Session): Database session dependency.
+
+    Returns:
+        Category: The persisted category.
+
+    Raises:
+        HTTPException: If a category with the same name already exists.
+    """
+    try:
+        return create_category(db, category=Category.model_validate(category))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
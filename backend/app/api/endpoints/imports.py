@@ -0,0 +1,53 @@
+"""
+API routes for inspecting background import jobs.
+
+Jobs are created by `POST /transactions/upload?background=true` and tracked
+in memory by the worker process that accepted the upload. With authentication
+on, users only see their own jobs.
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.deps import get_owner_id
+from app.ingest.jobs import get_import_queue
+from app.models.upload import ImportJob
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[ImportJob], summary="List import jobs")
+def list_imports(*, owner_id: Optional[int] = Depends(get_owner_id)) -> List[ImportJob]:
+    """Return the known import jobs, most recent first.
+
+    Args:
+        owner_id (int, optional): Authenticated user dependency.
+
+    Returns:
+        List[ImportJob]: Queued, running and recently finished jobs.
+    """
+    return get_import_queue().list(owner_id=owner_id)
+
+
+@router.get("/{job_id}", response_model=ImportJob, summary="Get an import job's status")
+def read_import(
+    *, job_id: str, owner_id: Optional[int] = Depends(get_owner_id)
+) -> ImportJob:
+    """Report the status, progress, errors and throughput of an import job.
+
+    Args:
+        job_id (str): ID returned when the upload was accepted.
+        owner_id (int, optional): Authenticated user dependency.
+
+    Returns:
+        ImportJob: The job's current state.
+
+    Raises:
+        HTTPException: If the job is unknown to this worker.
+    """
+    job = get_import_queue().get(job_id, owner_id=owner_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
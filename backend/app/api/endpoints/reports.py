@@ -0,0 +1,118 @@
+"""
+API routes for aggregated spending reports.
+
+Reports are served from the `TransactionRollup` table, which is maintained
+as transactions are ingested, so their cost depends on the number of
+month/account/category buckets rather than on the number of transactions.
+The recurring-payment analysis reads the transaction history itself, but
+only once per worker and user; later calls process new transactions only.
+With `Settings.auth_enabled` both reports require a bearer token and only
+cover the caller's accounts.
+"""
+
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from app.api.deps import get_db, get_owner_id
+from app.crud.rollup import get_spending_summary
+from app.models.recurring import RecurringPayment
+from app.models.rollup import SpendingSummary
+
+
+router = APIRouter()
+
+_GROUP_COLUMNS = {"month": "month", "account": "account_id", "category": "category_id"}
+
+
+@router.get(
+    "/summary",
+    response_model=List[SpendingSummary],
+    summary="Spending totals per month, category and account",
+)
+def spending_summary(
+    *,
+    group_by: List[Literal["month", "category", "account"]] = Query(
+        ["month", "category", "account"],
+        description="Keys to group by; omitted keys are summed over.",
+    ),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    account: Optional[str] = None,
+    category_id: Optional[int] = None,
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> List[SpendingSummary]:
+    """Return income, expenses and net totals for each requested group.
+
+    Date bounds select whole months: a bucket is included when its month
+    contains or lies between `date_from` and `date_to`.
+
+    Args:
+        group_by (List[str], optional): Any of `month`, `category` and
+            `account`. Defaults to all three.
+        date_from (date, optional): First month to include. Defaults to None.
+        date_to (date, optional): Last month to include. Defaults to None.
+        account (str, optional): Restrict to the accounts with this number.
+            Defaults to None.
+        category_id (int, optional): Restrict to one category; `0` selects
+            uncategorized transactions. Defaults to None.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        List[SpendingSummary]: Totals per group, ordered by the group keys.
+    """
+    return get_spending_summary(
+        db,
+        group_by=[_GROUP_COLUMNS[key] for key in group_by],
+        date_from=date_from,
+        date_to=date_to,
+        account=account,
+        category_id=category_id,
+        owner_id=owner_id,
+    )
+
+
+@router.get(
+    "/recurring",
+    response_model=List[RecurringPayment],
+    summary="Recurring payments and receipts such as rent, subscriptions and salaries",
+)
+def recurring_payments(
+    *,
+    account: Optional[str] = None,
+    min_occurrences: int = Query(3, ge=2, description="Fewest bookings in a series."),
+    max_amount_variation: float = Query(
+        0.25,
+        ge=0,
+        description="Largest standard deviation of the amounts, relative to their mean.",
+    ),
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> List[RecurringPayment]:
+    """Find series of transactions with one counterparty at a regular cadence.
+
+    Args:
+        account (str, optional): Restrict to one raw account number. Defaults to None.
+        min_occurrences (int, optional): Fewest bookings in a series. Defaults to 3.
+        max_amount_variation (float, optional): Largest relative spread of the
+            amounts. Defaults to 0.25.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        List[RecurringPayment]: Detected series, per account largest first.
+    """
+    # Imported on first use: the analysis loads pandas and NumPy.
+    from app.analysis import get_recurring_detector  # pylint: disable=import-outside-toplevel
+
+    detector = get_recurring_detector(owner_id)
+    detector.refresh(db)
+    return detector.detect(
+        account=account,
+        min_occurrences=min_occurrences,
+        max_amount_variation=max_amount_variation,
+    )
@@ -0,0 +1,98 @@
+"""
+API routes for managing categorization rules.
+
+Rules are applied to new transactions at ingest; use
+`POST /transactions/recategorize` to apply them to stored ones. With
+`Settings.auth_enabled` every route requires a bearer token and only covers
+the caller's rules, which only categorize the caller's transactions.
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlmodel import Session
+
+from app.api.deps import get_db, get_owner_id
+from app.crud.rule import create_rule, delete_rule, get_rules
+from app.models.rule import CategoryRule, CategoryRuleBase
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[CategoryRule], summary="List categorization rules")
+def list_rules(
+    *, owner_id: Optional[int] = Depends(get_owner_id), db: Session = Depends(get_db)
+) -> List[CategoryRule]:
+    """Return all rules in the order they are tried.
+
+    Args:
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        List[CategoryRule]: Rules ordered by priority, then ID.
+    """
+    return get_rules(db, owner_id=owner_id)
+
+
+@router.post(
+    "/",
+    response_model=CategoryRule,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a categorization rule",
+)
+def add_rule(
+    *,
+    rule: CategoryRuleBase,
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> CategoryRule:
+    """Create a rule. All of its conditions must hold for it to match.
+
+    Args:
+        rule (CategoryRuleBase): The rule's category, conditions and priority.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        CategoryRule: The persisted rule.
+
+    Raises:
+        HTTPException: If the rule has no condition or an invalid category.
+    """
+    try:
+        return create_rule(
+            db, rule=CategoryRule.model_validate(rule, update={"user_id": owner_id})
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@router.delete(
+    "/{rule_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a categorization rule",
+)
+def remove_rule(
+    *,
+    rule_id: int,
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Delete a rule. Categories it already assigned are kept.
+
+    Args:
+        rule_id (int): ID of the rule to delete.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        Response: An empty `204 No Content` response.
+
+    Raises:
+        HTTPException: If the rule does not exist.
+    """
+    if not delete_rule(db, rule_id=rule_id, owner_id=owner_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rule not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
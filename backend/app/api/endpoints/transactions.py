@@ -4,160 +4,550 @@ API routes for transaction ingestion and retrieval.
 These endpoints allow clients to upload CSV or Excel files containing
 transaction data. Each record is parsed into a `Transaction` model and
 persisted to the database. Additional routes provide pagination for listing
-transactions and retrieval by ID.
+transactions and retrieval by ID; they query through the asyncio engine, so
+waiting on the database does not hold a threadpool worker.
+
+With `Settings.auth_enabled` every route requires a bearer token and only
+sees the transactions of the caller's accounts; uploaded rows are linked to
+accounts owned by the caller.
 """
 
 from __future__ import annotations
 
-import io
-from typing import List, Optional
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO, Dict, Iterator, List, Literal, Optional, Union
 
-import pandas as pd
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import get_db
-from app.crud.transaction import create_transaction, get_transaction, get_transactions
-from app.models.transaction import Transaction
+from app.api.deps import get_async_db, get_db, get_owner_id
+from app.api.pagination import decode_cursor, encode_cursor
+from app.core.config import get_settings
+from app.core.metrics import stage
+from app.crud.account import AccountResolver
+from app.crud.rule import recategorize_transactions
+from app.crud.transaction import (
+    create_transactions,
+    get_transaction_async,
+    get_transactions_after_async,
+    get_transactions_async,
+    iter_transaction_batches,
+)
+from app.db.session import engine
+from app.export import check_export_format, stream_export
+from app.ingest.mapping import map_transactions, missing_columns
+from app.ingest.jobs import ImportQueueFull, get_import_queue
+from app.ingest.parallel import get_parse_pool, parse_uploads
+from app.ingest.pipeline import MissingColumnsError, ingest_chunks
+from app.ingest.reader import check_file_type, excel_engine, read_upload
+from app.ingest.rules import load_rule_matcher
+from app.models.rule import RecategorizeResult
+from app.models.transaction import Transaction, TransactionFilter, TransactionPage
+from app.models.upload import ImportJob, UploadProgress, UploadSummary
 
 
 router = APIRouter()
 
+# Largest `limit` accepted by the list endpoint.
+MAX_PAGE_SIZE = 1000
+
+
+def _summary_response(
+    filename: str,
+    *,
+    rows: int,
+    skipped: int,
+    ids: List[Optional[int]],
+    started: float,
+) -> JSONResponse:
+    """Build the `return=summary` response, bypassing response model validation."""
+    inserted_ids = [transaction_id for transaction_id in ids if transaction_id is not None]
+    summary = UploadSummary(
+        filename=filename,
+        rows=rows,
+        inserted=rows - skipped,
+        skipped_duplicates=skipped,
+        first_id=min(inserted_ids) if inserted_ids else None,
+        last_id=max(inserted_ids) if inserted_ids else None,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
+    return JSONResponse(status_code=status.HTTP_201_CREATED, content=summary.model_dump())
+
+
+def _rows_response(ids: List[Optional[int]], records: List[Dict[str, Any]]) -> JSONResponse:
+    """Serialize the inserted rows here, so the `respond` stage timing covers it."""
+    content = [
+        Transaction(id=transaction_id, **record).model_dump(mode="json")
+        for transaction_id, record in zip(ids, records)
+        if transaction_id is not None
+    ]
+    return JSONResponse(status_code=status.HTTP_201_CREATED, content=content)
+
+
+def _ingest_chunks(
+    db: Session, source: BinaryIO, filename: str, owner_id: Optional[int]
+) -> UploadProgress:
+    """Run `ingest_chunks`, translating ingestion errors into HTTP 400 responses."""
+    try:
+        return ingest_chunks(
+            db,
+            source,
+            filename,
+            chunksize=get_settings().ingest_chunk_size,
+            owner_id=owner_id,
+        )
+    except MissingColumnsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error parsing file: {e}",
+        ) from e
+
+
+def _store_records(
+    db: Session, records: List[Dict[str, Any]], owner_id: Optional[int]
+) -> List[Optional[int]]:
+    """Categorize and link `records` to accounts, then insert them, skipping duplicates.
+
+    Rows the table cannot store (see `create_transactions`) are answered with
+    HTTP 400.
+    """
+    load_rule_matcher(db, owner_id).apply(records)
+    AccountResolver(owner_id).apply(db, records)
+    try:
+        return create_transactions(db, records=records, skip_duplicates=True)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+def _spool_upload(source: BinaryIO) -> str:
+    """Copy an upload to a temporary file that outlives the request and return its path."""
+    with tempfile.NamedTemporaryFile(prefix="import-", delete=False) as target:
+        shutil.copyfileobj(source, target)
+    return target.name
+
+
+async def _submit_import(
+    file: UploadFile, filename: str, owner_id: Optional[int]
+) -> JSONResponse:
+    """Hand the upload to the background import queue and answer `202 Accepted`."""
+    try:
+        check_file_type(filename)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    path = await run_in_threadpool(_spool_upload, file.file)
+    try:
+        job = get_import_queue().submit(path, filename, owner_id=owner_id)
+    except ImportQueueFull as e:
+        os.unlink(path)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        ) from e
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=job.model_dump(mode="json"),
+        headers={"Location": f"/imports/{job.id}"},
+    )
+
 
 @router.post(
     "/upload",
-    response_model=List[Transaction],
+    response_model=Union[List[Transaction], UploadProgress, UploadSummary, ImportJob],
     summary="Upload transactions from a CSV or Excel file",
     status_code=status.HTTP_201_CREATED,
 )
 async def upload_transactions(
-    *, file: UploadFile = File(...), db: Session = Depends(get_db)
-) -> List[Transaction]:
+    *,
+    file: UploadFile = File(...),
+    chunked: bool = Query(
+        False,
+        description="Parse and insert the file in chunks and report per-chunk progress.",
+    ),
+    background: bool = Query(
+        False,
+        description="Import the file in the background and return a job to poll.",
+    ),
+    response_mode: Literal["rows", "summary"] = Query(
+        "rows",
+        alias="return",
+        description="`rows` echoes the persisted transactions, `summary` only counts.",
+    ),
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> Union[List[Transaction], UploadProgress, JSONResponse]:
     """Parse the uploaded file and persist each transaction.
 
-    The file must contain a header row with expected column names. Supported
-    formats are `.csv` (semicolon‑delimited) and Excel (`.xls`/`.xlsx`).
+    The file must contain a header row with the column names of one of the
+    registered bank formats (see `app.ingest.formats`), which is detected from
+    the header. Supported file types are `.csv` and Excel (`.xls`/`.xlsx`);
+    workbooks are read with the engine selected by `Settings.excel_engine`.
+    Rows are bulk inserted in a single database transaction, so either the
+    whole file is stored or nothing is. Rows are linked to their `Account`,
+    which is created on first sight, and categorized by the stored
+    categorization rules. Rows whose account, statement number and
+    transaction number are already stored are skipped, which makes
+    re-uploading an overlapping export idempotent.
+
+    With `chunked=true` the file is read from its spooled temporary file
+    `Settings.ingest_chunk_size` rows at a time, so memory use does not grow
+    with the file size, and only per-chunk counts are returned.
+
+    With `background=true` the upload is spooled to a temporary file and
+    queued as an import job; the response is `202 Accepted` with the
+    `ImportJob` and a `Location` header pointing at `/imports/{id}`, which
+    reports progress, errors and throughput. A full queue answers `503`.
+
+    Parsing, mapping and inserting run in the threadpool, so a large upload
+    does not block other requests served by the same worker. The time spent
+    reading the file, validating its columns, parsing rows into records,
+    inserting and building the response is reported per stage in the
+    `Server-Timing` header and on `/metrics`.
+
+    With `return=summary` the response is an `UploadSummary` holding only
+    counts, the inserted ID range and timing, which avoids building and
+    serializing a model for every row.
 
     Args:
         file (UploadFile): The uploaded file containing transactions.
+        chunked (bool, optional): Stream the file in chunks. Defaults to False.
+        background (bool, optional): Queue a background import job. Defaults to False.
+        response_mode (str, optional): `rows` or `summary`. Defaults to `rows`.
+        owner_id (int, optional): Authenticated user dependency.
         db (Session): Database session dependency.
 
     Returns:
-        List[Transaction]: A list of persisted transactions.
+        Union[List[Transaction], UploadProgress, JSONResponse]: The newly
+        persisted transactions, a per-chunk summary when `chunked` is set, an
+        `UploadSummary` when `return=summary`, or the queued `ImportJob` when
+        `background` is set.
 
     Raises:
-        HTTPException: If the file format is unsupported or parsing fails.
+        HTTPException: If the file format is unsupported, parsing fails or the
+            import queue is full.
     """
+    started = time.perf_counter()
     filename = file.filename or ""
-    contents = await file.read()
+    if background:
+        return await _submit_import(file, filename, owner_id)
+    if chunked:
+        progress = await run_in_threadpool(_ingest_chunks, db, file.file, filename, owner_id)
+        if response_mode == "summary":
+            ids = [
+                chunk_id
+                for chunk in progress.chunks
+                for chunk_id in (chunk.first_id, chunk.last_id)
+                if chunk_id is not None
+            ]
+            return _summary_response(
+                filename,
+                rows=progress.rows,
+                skipped=progress.skipped_duplicates,
+                ids=ids,
+                started=started,
+            )
+        return progress
+
     try:
-        if filename.endswith(".csv"):
-            df = pd.read_csv(io.BytesIO(contents), sep=";")
-        elif filename.endswith((".xls", ".xlsx")):
-            df = pd.read_excel(io.BytesIO(contents))
-        else:
-            raise ValueError("Unsupported file type: must be .csv, .xls, or .xlsx")
+        with stage("read"):
+            bank_format, df = await run_in_threadpool(
+                read_upload,
+                file.file,
+                filename,
+                engine=excel_engine(get_settings().excel_engine),
+            )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error parsing file: {e}",
         ) from e
 
-    # Validate required columns
-    expected_columns = [
-        "Rekening",
-        "Boekingsdatum",
-        "Rekeninguittrekselnummer",
-        "Transactienummer",
-        "Rekening tegenpartij",
-        "Naam tegenpartij bevat",
-        "Straat en nummer",
-        "Postcode en plaats",
-        "Transactie",
-        "Valutadatum",
-        "Bedrag",
-        "Devies",
-        "BIC",
-        "Landcode",
-        "Mededelingen",
-    ]
-    missing = [col for col in expected_columns if col not in df.columns]
+    with stage("validate"):
+        missing = missing_columns(df, bank_format)
     if missing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Missing expected columns: {missing}",
         )
 
-    transactions: List[Transaction] = []
-    for _, row in df.iterrows():
-        transaction = Transaction(
-            account=str(row["Rekening"]),
-            booking_date=str(row["Boekingsdatum"]),
-            statement_number=str(row["Rekeninguittrekselnummer"])
-            if not pd.isna(row["Rekeninguittrekselnummer"])
-            else None,
-            transaction_number=str(row["Transactienummer"])
-            if not pd.isna(row["Transactienummer"])
-            else None,
-            counterparty_account=str(row["Rekening tegenpartij"])
-            if not pd.isna(row["Rekening tegenpartij"])
-            else None,
-            counterparty_name=str(row["Naam tegenpartij bevat"])
-            if not pd.isna(row["Naam tegenpartij bevat"])
-            else None,
-            street_number=str(row["Straat en nummer"])
-            if not pd.isna(row["Straat en nummer"])
-            else None,
-            postal_code_city=str(row["Postcode en plaats"])
-            if not pd.isna(row["Postcode en plaats"])
-            else None,
-            transaction_type=str(row["Transactie"])
-            if not pd.isna(row["Transactie"])
-            else None,
-            value_date=str(row["Valutadatum"])
-            if not pd.isna(row["Valutadatum"])
-            else None,
-            amount=float(row["Bedrag"]),
-            currency=str(row["Devies"])
-            if not pd.isna(row["Devies"])
-            else None,
-            bic=str(row["BIC"])
-            if not pd.isna(row["BIC"])
-            else None,
-            country_code=str(row["Landcode"])
-            if not pd.isna(row["Landcode"])
-            else None,
-            notes=str(row["Mededelingen"])
-            if not pd.isna(row["Mededelingen"])
-            else None,
-        )
-        saved = create_transaction(db, transaction=transaction)
-        transactions.append(saved)
-    return transactions
+    try:
+        with stage("parse"):
+            records = await run_in_threadpool(map_transactions, df, bank_format)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error parsing file: {e}",
+        ) from e
+
+    # Insert all rows in one database transaction: a failing batch rolls back
+    # the whole upload. Rows already stored by an earlier upload are skipped.
+    with stage("insert"):
+        ids = await run_in_threadpool(_store_records, db, records, owner_id)
+    with stage("respond"):
+        if response_mode == "summary":
+            skipped = sum(1 for transaction_id in ids if transaction_id is None)
+            return _summary_response(
+                filename, rows=len(records), skipped=skipped, ids=ids, started=started
+            )
+        return _rows_response(ids, records)
+
+
+@router.post(
+    "/upload/batch",
+    response_model=Union[List[Transaction], UploadSummary],
+    summary="Upload transactions from several files or workbook sheets",
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_transaction_batch(
+    *,
+    files: List[UploadFile] = File(...),
+    all_sheets: bool = Query(
+        True,
+        description="Read every sheet of each workbook instead of only the first.",
+    ),
+    response_mode: Literal["rows", "summary"] = Query(
+        "rows",
+        alias="return",
+        description="`rows` echoes the persisted transactions, `summary` only counts.",
+    ),
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> Union[List[Transaction], JSONResponse]:
+    """Parse several files, or every sheet of a workbook, and persist them together.
+
+    The uploads are spooled to temporary files and parsed in a pool of
+    `Settings.parse_workers` processes, one CSV file or workbook sheet per
+    task, using the Excel engine selected by `Settings.excel_engine`. Sheets
+    without any header are ignored. The rows of all files are then inserted
+    in one database transaction, skipping rows that are already stored.
+
+    Args:
+        files (List[UploadFile]): The uploaded `.csv`, `.xls` or `.xlsx` files.
+        all_sheets (bool, optional): Read every workbook sheet. Defaults to True.
+        response_mode (str, optional): `rows` or `summary`. Defaults to `rows`.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        Union[List[Transaction], JSONResponse]: The newly persisted
+        transactions, or an `UploadSummary` when `return=summary`.
+
+    Raises:
+        HTTPException: If a file type is unsupported or a file or sheet fails
+            to parse, or 503 if a parsing worker died.
+    """
+    started = time.perf_counter()
+    filenames = [file.filename or "" for file in files]
+    for filename in filenames:
+        try:
+            check_file_type(filename)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"{filename}: {e}"
+            ) from e
+
+    settings = get_settings()
+    paths: List[str] = []
+    try:
+        with stage("read"):
+            for file in files:
+                paths.append(await run_in_threadpool(_spool_upload, file.file))
+        try:
+            with stage("parse"):
+                records = await run_in_threadpool(
+                    parse_uploads,
+                    list(zip(paths, filenames)),
+                    all_sheets=all_sheets,
+                    engine=excel_engine(settings.excel_engine),
+                    pool=get_parse_pool(),
+                )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Error parsing file: {e}",
+            ) from e
+        except BrokenProcessPool as e:
+            # The next upload gets a fresh pool, so the client can retry.
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="A parsing worker stopped unexpectedly; please retry the upload",
+            ) from e
+    finally:
+        for path in paths:
+            os.unlink(path)
+
+    with stage("insert"):
+        ids = await run_in_threadpool(_store_records, db, records, owner_id)
+    with stage("respond"):
+        if response_mode == "summary":
+            skipped = sum(1 for transaction_id in ids if transaction_id is None)
+            return _summary_response(
+                ", ".join(filenames), rows=len(records), skipped=skipped, ids=ids, started=started
+            )
+        return _rows_response(ids, records)
+
+
+@router.post(
+    "/recategorize",
+    response_model=RecategorizeResult,
+    summary="Rerun the categorization rules over stored transactions",
+)
+def recategorize(
+    *,
+    overwrite: bool = Query(
+        False,
+        description="Also replace categories that are already set.",
+    ),
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: Session = Depends(get_db),
+) -> RecategorizeResult:
+    """Apply the current categorization rules to stored transactions.
+
+    Transactions are processed and committed in chunks of
+    `Settings.ingest_chunk_size`; spending summaries are adjusted for every
+    changed category. Transactions no rule matches keep their category.
+
+    Args:
+        overwrite (bool, optional): Recategorize already categorized
+            transactions too. Defaults to False.
+        owner_id (int, optional): Authenticated user dependency.
+        db (Session): Database session dependency.
+
+    Returns:
+        RecategorizeResult: Number of transactions scanned and updated.
+    """
+    return recategorize_transactions(db, overwrite=overwrite, owner_id=owner_id)
 
 
 @router.get(
     "/",
-    response_model=List[Transaction],
+    response_model=Union[List[Transaction], TransactionPage],
     summary="List transactions",
 )
-def list_transactions(
+async def list_transactions(
     *,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-) -> List[Transaction]:
-    """Retrieve a paginated list of transactions.
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    pagination: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="`offset` uses `skip`; `cursor` returns a page with `next_cursor`.",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` from the previous page; implies cursor pagination."
+    ),
+    filters: TransactionFilter = Depends(),
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> Union[List[Transaction], TransactionPage]:
+    """Retrieve a paginated, optionally filtered list of transactions ordered by ID.
+
+    Filtering happens in the database: `account`, `date_from`/`date_to`,
+    `amount_min`/`amount_max`, `category_id`, `counterparty` (substring of
+    the counterparty name) and `q` (substring of the notes) are combined
+    with AND and apply to both pagination modes.
+
+    Offset pagination returns a plain list and gets slower the larger `skip`
+    is. Cursor pagination returns a `TransactionPage` whose `next_cursor` is
+    passed back to fetch the following page; every page costs one index seek.
 
     Args:
         skip (int, optional): Number of records to skip. Defaults to 0.
-        limit (int, optional): Maximum number of records to return. Defaults to 100.
-        db (Session): Database session dependency.
+        limit (int, optional): Maximum number of records to return, at most
+            `MAX_PAGE_SIZE`. Defaults to 100.
+        pagination (str, optional): `offset` or `cursor`. Defaults to `offset`.
+        cursor (str, optional): Cursor of the page to fetch. Defaults to None.
+        filters (TransactionFilter): Query parameters narrowing the results.
+        owner_id (int, optional): Authenticated user dependency.
+        db (AsyncSession): Asyncio database session dependency.
 
     Returns:
-        List[Transaction]: A list of transactions.
+        Union[List[Transaction], TransactionPage]: A list of transactions, or
+        a page with a continuation cursor in cursor mode.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
     """
-    return get_transactions(db, skip=skip, limit=limit)
+    if pagination == "offset" and cursor is None:
+        return await get_transactions_async(
+            db, skip=skip, limit=limit, filters=filters, owner_id=owner_id
+        )
+
+    after_id: Optional[int] = None
+    if cursor:
+        after_id = decode_cursor(cursor).get("id")
+        if not isinstance(after_id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    # Fetch one extra row to learn whether another page follows.
+    items = await get_transactions_after_async(
+        db, after_id=after_id, limit=limit + 1, filters=filters, owner_id=owner_id
+    )
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor({"id": items[-1].id})
+    return TransactionPage(items=items, next_cursor=next_cursor)
+
+
+def _export_chunks(
+    filters: TransactionFilter, export_format: str, owner_id: Optional[int]
+) -> Iterator[bytes]:
+    """Stream the export from a dedicated session that lives as long as the response."""
+    with Session(engine) as db:
+        batches = iter_transaction_batches(db, filters=filters, owner_id=owner_id)
+        yield from stream_export(batches, export_format)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export transactions as CSV, Parquet or Arrow",
+)
+def export_transactions(
+    *,
+    export_format: Literal["csv", "parquet", "arrow"] = Query(
+        "csv",
+        alias="format",
+        description="`csv`, `parquet`, or `arrow` (Arrow IPC stream).",
+    ),
+    filters: TransactionFilter = Depends(),
+    owner_id: Optional[int] = Depends(get_owner_id),
+) -> StreamingResponse:
+    """Stream every transaction matching the list filters as a file.
+
+    Rows are read in ID order through a server-side cursor, in batches of
+    `Settings.export_batch_size`; each batch is encoded (as one Parquet row
+    group or Arrow record batch) and sent before the next one is fetched.
+    Parquet and Arrow need the optional `pyarrow` package.
+
+    Args:
+        export_format (str, optional): Output format. Defaults to `csv`.
+        filters (TransactionFilter): Optional criteria, as for the list endpoint.
+        owner_id (int, optional): Authenticated user dependency.
+
+    Returns:
+        StreamingResponse: The encoded transactions as an attachment.
+
+    Raises:
+        HTTPException: If the requested format is not available.
+    """
+    try:
+        spec = check_export_format(export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    return StreamingResponse(
+        _export_chunks(filters, export_format, owner_id),
+        media_type=spec.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{spec.extension}"'
+        },
+    )
 
 
 @router.get(
@@ -165,16 +555,18 @@ def list_transactions(
     response_model=Transaction,
     summary="Get a transaction by ID",
 )
-def read_transaction(
+async def read_transaction(
     *,
     transaction_id: int,
-    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_owner_id),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Transaction:
     """Retrieve a single transaction by its primary key.
 
     Args:
         transaction_id (int): ID of the transaction to retrieve.
-        db (Session): Database session dependency.
+        owner_id (int, optional): Authenticated user dependency.
+        db (AsyncSession): Asyncio database session dependency.
 
     Returns:
         Transaction: The requested transaction.
@@ -182,7 +574,9 @@ def read_transaction(
     Raises:
         HTTPException: If the transaction does not exist.
     """
-    transaction = get_transaction(db, transaction_id=transaction_id)
+    transaction = await get_transaction_async(
+        db, transaction_id=transaction_id, owner_id=owner_id
+    )
     if not transaction:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found")
     return transaction
\ No newline at end of file
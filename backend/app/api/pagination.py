@@ -0,0 +1,51 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor encodes the sort key of the last row on a page as URL-safe base64
+JSON. Clients must treat it as an opaque token and pass it back unchanged to
+fetch the next page.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(key: Dict[str, Any]) -> str:
+    """Encode a sort key into an opaque cursor string.
+
+    Args:
+        key (Dict[str, Any]): JSON-serializable sort key of the last returned row.
+
+    Returns:
+        str: The cursor token.
+    """
+    raw = json.dumps(key, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor token supplied by the client.
+
+    Returns:
+        Dict[str, Any]: The decoded sort key.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from e
+    if not isinstance(key, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return key
@@ -0,0 +1,65 @@
+"""
+Request timing middleware.
+
+`TimingMiddleware` measures every request, records it in the latency and
+per-request database histograms of `app.core.metrics` under the matched
+route template, and reports the request's database time and upload stages
+in a `Server-Timing` header.
+"""
+
+import time
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from app.core.metrics import (
+    HTTP_REQUEST_QUERIES,
+    HTTP_REQUEST_QUERY_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    RequestTimings,
+    current_timings,
+)
+
+
+def route_template(request: Request) -> str:
+    """Return the path template of the route that handled `request`.
+
+    Routes of an included router may only know their path relative to the
+    router's prefix; the prefix is recovered from the request path.
+    """
+    route = request.scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        # Not routed, e.g. answered by the cache middleware or a 404.
+        return "unmatched"
+    try:
+        rendered = path_format.format(**request.path_params)
+    except (KeyError, IndexError, ValueError):
+        return path_format
+    path = request.url.path
+    prefix = path[: len(path) - len(rendered)] if path.endswith(rendered) else ""
+    return prefix + path_format
+
+
+class TimingMiddleware(BaseHTTPMiddleware):
+    """Times requests and adds a `Server-Timing` header to every response."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            current_timings.reset(token)
+        elapsed = time.perf_counter() - started
+
+        # Label by route template rather than raw path to bound cardinality.
+        route_path = route_template(request)
+        HTTP_REQUEST_SECONDS.observe(
+            elapsed, request.method, route_path, str(response.status_code)
+        )
+        HTTP_REQUEST_QUERIES.observe(timings.query_count, request.method, route_path)
+        HTTP_REQUEST_QUERY_SECONDS.observe(timings.query_seconds, request.method, route_path)
+        response.headers["Server-Timing"] = timings.server_timing(elapsed)
+        return response
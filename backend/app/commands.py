@@ -0,0 +1,115 @@
+"""
+Command-line maintenance tasks.
+
+Run from the backend directory, for example::
+
+    python -m app.commands backfill-accounts
+    python -m app.commands create-user alice@example.com --claim-unowned
+    python -m app.commands archive-transactions --before 2022-01 --export-dir archive
+"""
+
+import argparse
+import getpass
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional
+
+from sqlmodel import Session
+
+from app.crud.account import backfill_account_ids
+from app.crud.user import claim_unowned_accounts, create_user
+from app.db.session import engine
+from app.export.archive import archive_months
+
+
+def _backfill_accounts(_: argparse.Namespace) -> None:
+    with Session(engine) as db:
+        linked = backfill_account_ids(db)
+    print(f"Linked {linked} transaction(s) to their accounts")
+
+
+def _create_user(args: argparse.Namespace) -> None:
+    password = getpass.getpass("Password: ")
+    if password != getpass.getpass("Repeat password: "):
+        sys.exit("Passwords do not match")
+    with Session(engine) as db:
+        try:
+            user = create_user(
+                db, email=args.email, password=password, full_name=args.full_name
+            )
+        except ValueError as e:
+            sys.exit(str(e))
+        print(f"Created user {user.id} ({user.email})")
+        if args.claim_unowned:
+            claimed = claim_unowned_accounts(db, user_id=user.id)
+            print(f"Assigned {claimed} account(s) without an owner to {user.email}")
+
+
+def _month(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {value!r}") from e
+
+
+def _archive_transactions(args: argparse.Namespace) -> None:
+    with Session(engine) as db:
+        try:
+            archived = archive_months(
+                db, before=args.before, export_dir=args.export_dir, drop=args.drop
+            )
+        except ValueError as e:
+            sys.exit(str(e))
+    for month in archived:
+        target = f" to {month.path}" if month.path else ""
+        print(f"Archived {month.month:%Y-%m}: {month.rows} transaction(s){target}")
+    print(f"Archived {len(archived)} month(s)")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse `argv` and run the selected command.
+
+    Args:
+        argv (List[str], optional): Arguments; defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "backfill-accounts",
+        help="Link transactions without an account_id to (new) Account rows.",
+    ).set_defaults(handler=_backfill_accounts)
+    create_user_parser = commands.add_parser(
+        "create-user",
+        help="Create a user who can log in when AUTH_ENABLED is on; prompts for the password.",
+    )
+    create_user_parser.add_argument("email")
+    create_user_parser.add_argument("--full-name")
+    create_user_parser.add_argument(
+        "--claim-unowned",
+        action="store_true",
+        help="Give the user every account, budget and rule created while authentication was off.",
+    )
+    create_user_parser.set_defaults(handler=_create_user)
+    archive_parser = commands.add_parser(
+        "archive-transactions",
+        help="Detach the monthly partitions before a month from the transaction table.",
+    )
+    archive_parser.add_argument(
+        "--before", type=_month, required=True, help="First month to keep (YYYY-MM)."
+    )
+    archive_parser.add_argument(
+        "--export-dir", type=Path, help="Write each detached month to a Parquet file here."
+    )
+    archive_parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="Drop each detached partition once exported instead of keeping it as archived_*.",
+    )
+    archive_parser.set_defaults(handler=_archive_transactions)
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
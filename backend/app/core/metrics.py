@@ -0,0 +1,218 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+The metrics are kept per worker process; Prometheus scrapes each worker (or
+sums them) as usual. Request-scoped measurements (database queries and
+upload stages) are collected in a `RequestTimings` object held in a context
+variable: it is set by the timing middleware, propagates into FastAPI's
+threadpool, and ends up in the `Server-Timing` response header.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """A monotonically increasing value per label set.
+
+    Args:
+        name (str): Metric name, ending in `_total`.
+        documentation (str): `HELP` text.
+        labels (Sequence[str], optional): Label names.
+    """
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Add `amount` to the value for `label_values`."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        """Return the metric's exposition lines."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {total}")
+        return lines
+
+
+class Histogram:
+    """Observations counted into cumulative buckets per label set.
+
+    Args:
+        name (str): Metric name.
+        documentation (str): `HELP` text.
+        labels (Sequence[str], optional): Label names.
+        buckets (Sequence[float], optional): Upper bounds, in increasing order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> (bucket counts, sum, count)
+        self._series: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation for `label_values`."""
+        with self._lock:
+            counts, total, count = self._series.get(
+                label_values, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._series[label_values] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        """Return the metric's exposition lines."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        names = (*self.labels, "le")
+        with self._lock:
+            for values, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(names, (*values, f"{bound:g}"))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = _format_labels(names, (*values, "+Inf"))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labels, values)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "budgetwise_http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "budgetwise_http_request_db_queries",
+    "Database queries executed per HTTP request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 1000),
+)
+HTTP_REQUEST_QUERY_SECONDS = Histogram(
+    "budgetwise_http_request_db_seconds",
+    "Database time per HTTP request.",
+    ("method", "route"),
+)
+DB_QUERIES = Counter(
+    "budgetwise_db_queries_total", "Database statements executed.", ("operation",)
+)
+DB_QUERY_SECONDS = Histogram(
+    "budgetwise_db_query_duration_seconds", "Database statement execution time.", ("operation",)
+)
+UPLOAD_STAGE_SECONDS = Histogram(
+    "budgetwise_upload_stage_seconds",
+    "Time spent in each stage of an upload (per chunk for chunked uploads).",
+    ("stage",),
+)
+
+REGISTRY = (
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUEST_QUERIES,
+    HTTP_REQUEST_QUERY_SECONDS,
+    DB_QUERIES,
+    DB_QUERY_SECONDS,
+    UPLOAD_STAGE_SECONDS,
+)
+
+
+def render_metrics() -> str:
+    """Return every registered metric in the Prometheus text format."""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+class RequestTimings:
+    """Database and stage timings accumulated while handling one request."""
+
+    def __init__(self) -> None:
+        self.query_count = 0
+        self.query_seconds = 0.0
+        # Stage name -> accumulated seconds, in first-seen order.
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_query(self, seconds: float) -> None:
+        with self._lock:
+            self.query_count += 1
+            self.query_seconds += seconds
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Format the timings as a `Server-Timing` header value."""
+        entries = [f"app;dur={total_seconds * 1000:.1f}"]
+        entries.append(
+            f'db;dur={self.query_seconds * 1000:.1f};desc="{self.query_count} queries"'
+        )
+        entries.extend(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items())
+        return ", ".join(entries)
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_timings", default=None
+)
+
+
+def record_query(operation: str, seconds: float) -> None:
+    """Count one executed statement, globally and for the current request."""
+    DB_QUERIES.inc(operation)
+    DB_QUERY_SECONDS.observe(seconds, operation)
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add_query(seconds)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as upload stage `name`.
+
+    Repeated stages of one request (for example, one per chunk) add up in
+    the `Server-Timing` header; each block is a separate observation in the
+    stage histogram.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        UPLOAD_STAGE_SECONDS.observe(elapsed, name)
+        timings = current_timings.get()
+        if timings is not None:
+            timings.add_stage(name, elapsed)
@@ -0,0 +1,107 @@
+"""
+Password hashing and signed access tokens.
+
+Both are built on the standard library so authentication needs no extra
+dependencies. Passwords are stored as salted PBKDF2-SHA256 hashes. Access
+tokens are stateless: `<user id>.<expiry>.<signature>`, where the signature
+is an HMAC-SHA256 of the rest under `Settings.secret_key`, so validating one
+costs a hash and no database query.
+"""
+
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Optional
+
+PASSWORD_SCHEME = "pbkdf2_sha256"
+PASSWORD_ITERATIONS = 600_000
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def hash_password(password: str, *, iterations: int = PASSWORD_ITERATIONS) -> str:
+    """Hash `password` with a random salt for storage in `User.hashed_password`.
+
+    Args:
+        password (str): The plaintext password.
+        iterations (int, optional): PBKDF2 rounds. Defaults to
+            `PASSWORD_ITERATIONS`.
+
+    Returns:
+        str: `pbkdf2_sha256$<iterations>$<salt>$<hash>`.
+    """
+    salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"{PASSWORD_SCHEME}${iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Check `password` against a hash produced by `hash_password`.
+
+    Args:
+        password (str): The plaintext password to check.
+        hashed_password (str): The stored hash.
+
+    Returns:
+        bool: `True` if they match; `False` also for malformed hashes.
+    """
+    try:
+        scheme, iterations, salt, digest = hashed_password.split("$")
+        if scheme != PASSWORD_SCHEME:
+            return False
+        expected = _b64decode(digest)
+        actual = hashlib.pbkdf2_hmac("sha256", password.encode(), _b64decode(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+def _sign(payload: str, secret_key: str) -> str:
+    return _b64encode(hmac.new(secret_key.encode(), payload.encode(), hashlib.sha256).digest())
+
+
+def create_access_token(user_id: int, *, secret_key: str, ttl: int) -> str:
+    """Issue a token identifying `user_id` for the next `ttl` seconds.
+
+    Args:
+        user_id (int): Primary key of the authenticated user.
+        secret_key (str): Signing key.
+        ttl (int): Lifetime in seconds.
+
+    Returns:
+        str: The signed token.
+    """
+    payload = f"{user_id}.{int(time.time()) + ttl}"
+    return f"{payload}.{_sign(payload, secret_key)}"
+
+
+def decode_access_token(token: str, *, secret_key: str) -> Optional[int]:
+    """Return the user ID of a valid, unexpired token.
+
+    Args:
+        token (str): A token issued by `create_access_token`.
+        secret_key (str): Signing key.
+
+    Returns:
+        Optional[int]: The user ID, or `None` if the token is malformed,
+        tampered with or expired.
+    """
+    payload, _, signature = token.rpartition(".")
+    expected = _sign(payload, secret_key).encode()
+    if not payload or not hmac.compare_digest(signature.encode(), expected):
+        return None
+    user_id, _, expires = payload.partition(".")
+    try:
+        if int(expires) < time.time():
+            return None
+        return int(user_id)
+    except ValueError:
+        return None
@@ -1,3 +1,47 @@
 """Collection of CRUD helper functions for database models."""
 
-from .transaction import create_transaction, get_transaction, get_transactions  # noqa: F401
\ No newline at end of file
+from .transaction import (  # noqa: F401
+    create_transaction,
+    create_transactions,
+    filter_transactions,
+    get_transaction,
+    get_transaction_async,
+    get_transactions,
+    get_transactions_after,
+    get_transactions_after_async,
+    get_transactions_async,
+    iter_transaction_batches,
+    owned_by,
+)
+from .rollup import (  # noqa: F401
+    add_to_rollup,
+    get_spending_summary,
+    rebuild_rollup,
+    remove_month_from_rollup,
+)
+from .category import create_category, get_categories  # noqa: F401
+from .rule import (  # noqa: F401
+    create_rule,
+    delete_rule,
+    get_rules,
+    recategorize_transactions,
+)
+from .account import AccountResolver, backfill_account_ids  # noqa: F401
+from .version import get_data_version, mark_data_changed  # noqa: F401
+from .budget import (  # noqa: F401
+    add_to_budgets,
+    create_budget,
+    delete_budget,
+    get_budget,
+    get_budget_statuses,
+    get_budgets,
+    rebuild_budget_spending,
+    update_budget,
+)
+from .user import (  # noqa: F401
+    authenticate_user,
+    claim_unowned_accounts,
+    create_user,
+    get_user_by_email,
+    get_user_by_token,
+)
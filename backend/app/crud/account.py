@@ -0,0 +1,139 @@
+"""
+CRUD utilities for the `Account` model.
+
+Uploads only carry the raw account number ("Rekening"). `AccountResolver`
+maps those numbers to `Account` rows, creating missing accounts, so that
+ingested transactions can be linked through `Transaction.account_id`.
+"""
+
+from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional, Sequence
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from app.crud.version import mark_data_changed
+from app.models.account import Account
+from app.models.transaction import Transaction
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class AccountResolver:
+    """Resolves raw account numbers to `Account` IDs with an in-memory cache.
+
+    Each call looks up all numbers not seen before with a single query and
+    inserts accounts for the ones that do not exist yet. Accounts are created
+    in the caller's transaction, so a resolver must not outlive it: if the
+    transaction is rolled back, discard the resolver.
+
+    Args:
+        owner_id (int, optional): Resolve to accounts of this user, and
+            create missing accounts as theirs. Defaults to None, which
+            resolves to, and creates, accounts without an owner.
+    """
+
+    def __init__(self, owner_id: Optional[int] = None) -> None:
+        self._owner_id = owner_id
+        self._ids: Dict[str, int] = {}
+
+    def _lookup(self, db: Session, numbers: Sequence[str]) -> None:
+        table = Account.__table__
+        owner = table.c.user_id
+        statement = select(table.c.number, table.c.id).where(
+            table.c.number.in_(numbers),
+            owner.is_(None) if self._owner_id is None else owner == self._owner_id,
+        )
+        self._ids.update(db.connection().execute(statement).all())
+
+    def resolve(self, db: Session, numbers: Mapping[str, Optional[str]]) -> Dict[str, int]:
+        """Return the account ID of every number, creating missing accounts.
+
+        Missing accounts are inserted with `ON CONFLICT DO NOTHING` on
+        PostgreSQL and SQLite, then looked up again, so an account created
+        concurrently by another upload is used rather than duplicated. On
+        other dialects the concurrent insert fails on the unique index.
+
+        Args:
+            db (Session): A database session.
+            numbers (Mapping[str, Optional[str]]): Account numbers mapped to
+                the currency to record on accounts that have to be created.
+
+        Returns:
+            Dict[str, int]: Account IDs keyed by number.
+        """
+        unknown = [number for number in numbers if number not in self._ids]
+        if unknown:
+            self._lookup(db, unknown)
+            missing = [number for number in unknown if number not in self._ids]
+            if missing:
+                connection = db.connection()
+                build_insert = _INSERTS.get(connection.dialect.name)
+                statement = (
+                    build_insert(Account.__table__).on_conflict_do_nothing()
+                    if build_insert is not None
+                    else insert(Account.__table__)
+                )
+                connection.execute(
+                    statement,
+                    [
+                        {"number": number, "currency": numbers[number], "user_id": self._owner_id}
+                        for number in missing
+                    ],
+                )
+                self._lookup(db, missing)
+        return {number: self._ids[number] for number in numbers}
+
+    def apply(self, db: Session, records: Iterable[MutableMapping[str, Any]]) -> None:
+        """Set `account_id` on every record from its raw `account` number.
+
+        Args:
+            db (Session): A database session.
+            records (Iterable[MutableMapping[str, Any]]): Records to update in place.
+        """
+        records = list(records)
+        numbers: Dict[str, Optional[str]] = {}
+        for record in records:
+            numbers.setdefault(record["account"], record.get("currency"))
+        ids = self.resolve(db, numbers)
+        for record in records:
+            record["account_id"] = ids[record["account"]]
+
+
+def backfill_account_ids(db: Session) -> int:
+    """Link transactions without an `account_id` to their accounts and commit.
+
+    The distinct account numbers of unlinked transactions are resolved in
+    one pass, then each account's transactions are updated with a single
+    statement.
+
+    Args:
+        db (Session): A database session.
+
+    Returns:
+        int: Number of transactions linked.
+    """
+    table = Transaction.__table__
+    unlinked = table.c.account_id.is_(None)
+    mark_data_changed(db)
+    try:
+        numbers: Dict[str, Optional[str]] = dict(
+            db.connection().execute(
+                select(table.c.account, func.min(table.c.currency))
+                .where(unlinked)
+                .group_by(table.c.account)
+            ).all()
+        )
+        linked = 0
+        for number, account_id in AccountResolver().resolve(db, numbers).items():
+            result = db.connection().execute(
+                update(table)
+                .where(table.c.account == number, unlinked)
+                .values(account_id=account_id)
+            )
+            linked += result.rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return linked
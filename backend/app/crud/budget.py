@@ -0,0 +1,363 @@
+"""
+CRUD utilities for budgets and their per-period consumption.
+
+`BudgetSpending` rows are derived from rollup bucket changes: `add_to_rollup`
+passes the amounts it adds to each (month, account, category) bucket to
+`add_to_budgets`, so consumption stays in step with the rollup within the
+same database transaction. A new budget is seeded from the stored rollup.
+Budgets with an owner only consume the buckets of the owner's accounts.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Connection, Date, and_, case, delete, literal
+from sqlmodel import Session, select
+
+from app.crud.counters import add_to_counters
+from app.crud.version import mark_data_changed
+from app.models.account import Account
+from app.models.budget import BUDGET_PERIODS, Budget, BudgetSpending, BudgetStatus
+from app.models.category import Category
+from app.models.rollup import UNCATEGORIZED, TransactionRollup
+
+# Rollup bucket changes: (month, account_id, category_id) -> [count, income, expenses].
+RollupDeltas = Mapping[Tuple[date, int, int], Sequence[Any]]
+
+
+def _period_start(period: str, month: date) -> date:
+    return month.replace(month=1) if period == "year" else month
+
+
+def _add_spending(
+    connection: Connection,
+    budgets: Sequence[Tuple[int, int, str, Optional[int]]],
+    deltas: RollupDeltas,
+) -> None:
+    """Add rollup bucket changes to the consumption of `budgets`.
+
+    Args:
+        connection (Connection): Connection of the caller's transaction.
+        budgets (Sequence[Tuple[int, int, str, Optional[int]]]): `(id,
+            category_id, period, user_id)` of the budgets to update.
+        deltas (RollupDeltas): Changes per rollup bucket.
+    """
+    owners: Dict[int, Optional[int]] = {}
+    if any(user_id is not None for *_, user_id in budgets):
+        account = Account.__table__
+        owners = dict(
+            connection.execute(
+                select(account.c.id, account.c.user_id).where(
+                    account.c.id.in_({key[1] for key in deltas})
+                )
+            ).all()
+        )
+    by_category: Dict[int, List[Tuple[int, str, Optional[int]]]] = {}
+    for budget_id, category_id, period, user_id in budgets:
+        by_category.setdefault(category_id, []).append((budget_id, period, user_id))
+    periods: Dict[Tuple[int, date], List[Any]] = {}
+    for (month, account_id, category_id), (count, income, expenses) in deltas.items():
+        for budget_id, period, user_id in by_category.get(category_id, ()):
+            if user_id is not None and owners.get(account_id) != user_id:
+                continue
+            key = (budget_id, _period_start(period, month))
+            spending = periods.setdefault(key, [0, Decimal("0")])
+            spending[0] += count
+            spending[1] -= income + expenses
+    if not periods:
+        return
+    add_to_counters(
+        connection,
+        BudgetSpending.__table__,
+        [
+            {
+                "budget_id": budget_id,
+                "period_start": period_start,
+                "transaction_count": count,
+                "spent": spent,
+            }
+            for (budget_id, period_start), (count, spent) in periods.items()
+        ],
+        key=("budget_id", "period_start"),
+        counters=("transaction_count", "spent"),
+    )
+    if any(count < 0 for count, _ in periods.values()):
+        table = BudgetSpending.__table__
+        connection.execute(
+            delete(table).where(
+                table.c.budget_id.in_({budget_id for budget_id, _ in periods}),
+                table.c.transaction_count <= 0,
+            )
+        )
+
+
+def add_to_budgets(db: Session, *, deltas: RollupDeltas) -> None:
+    """Apply rollup bucket changes to the budgets of the affected categories.
+
+    The change is executed but not committed, so it shares the caller's
+    transaction. Buckets of uncategorized transactions are ignored.
+
+    Args:
+        db (Session): A database session.
+        deltas (RollupDeltas): Changes per rollup bucket, as computed by
+            `add_to_rollup`.
+    """
+    categories = {key[2] for key in deltas if key[2] != UNCATEGORIZED}
+    if not categories:
+        return
+    connection = db.connection()
+    table = Budget.__table__
+    budgets = connection.execute(
+        select(table.c.id, table.c.category_id, table.c.period, table.c.user_id).where(
+            table.c.category_id.in_(categories)
+        )
+    ).all()
+    if budgets:
+        _add_spending(connection, [tuple(row) for row in budgets], deltas)
+
+
+def _seed_spending(db: Session, budgets: Sequence[Budget]) -> None:
+    """Compute the consumption of `budgets` from the stored rollup buckets."""
+    if not budgets:
+        return
+    rollup = TransactionRollup.__table__
+    rows = db.connection().execute(
+        select(
+            rollup.c.month,
+            rollup.c.account_id,
+            rollup.c.category_id,
+            rollup.c.transaction_count,
+            rollup.c.income,
+            rollup.c.expenses,
+        ).where(rollup.c.category_id.in_({budget.category_id for budget in budgets}))
+    )
+    deltas = {
+        (row.month, row.account_id, row.category_id): (
+            row.transaction_count,
+            row.income,
+            row.expenses,
+        )
+        for row in rows
+    }
+    _add_spending(
+        db.connection(),
+        [(budget.id, budget.category_id, budget.period, budget.user_id) for budget in budgets],
+        deltas,
+    )
+
+
+def rebuild_budget_spending(db: Session) -> None:
+    """Recompute the consumption of every budget from the rollup.
+
+    The change is executed but not committed; `rebuild_rollup` calls this
+    after refilling the rollup, within its transaction.
+
+    Args:
+        db (Session): A database session.
+    """
+    db.connection().execute(delete(BudgetSpending.__table__))
+    _seed_spending(db, get_budgets(db))
+
+
+def create_budget(db: Session, *, budget: Budget) -> Budget:
+    """Validate and insert a new `Budget`, seeding its consumption.
+
+    Args:
+        db (Session): A database session.
+        budget (Budget): The budget to add.
+
+    Returns:
+        Budget: The persisted budget with an assigned primary key.
+
+    Raises:
+        ValueError: If the period is unknown, the amount is not positive, the
+            category does not exist or the budget's owner already has a
+            budget for the category and period.
+    """
+    if budget.period not in BUDGET_PERIODS:
+        raise ValueError(f"period must be one of {list(BUDGET_PERIODS)}")
+    if budget.amount <= 0:
+        raise ValueError("amount must be positive")
+    if db.get(Category, budget.category_id) is None:
+        raise ValueError(f"Unknown category {budget.category_id}")
+    if budget.user_id is None:
+        same_owner = Budget.user_id.is_(None)
+    else:
+        same_owner = Budget.user_id == budget.user_id
+    existing = db.exec(
+        select(Budget.id).where(
+            same_owner, Budget.category_id == budget.category_id, Budget.period == budget.period
+        )
+    ).first()
+    if existing is not None:
+        raise ValueError(
+            f"Category {budget.category_id} already has a {budget.period}ly budget"
+        )
+    db.add(budget)
+    mark_data_changed(db)
+    try:
+        db.flush()
+        _seed_spending(db, [budget])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(budget)
+    return budget
+
+
+def get_budgets(db: Session, *, owner_id: Optional[int] = None) -> List[Budget]:
+    """Return all budgets ordered by ID.
+
+    Args:
+        db (Session): A database session.
+        owner_id (int, optional): Only return this user's budgets. Defaults
+            to None, which returns all of them.
+
+    Returns:
+        List[Budget]: The stored budgets.
+    """
+    statement = select(Budget).order_by(Budget.id)
+    if owner_id is not None:
+        statement = statement.where(Budget.user_id == owner_id)
+    return list(db.exec(statement).all())
+
+
+def get_budget(
+    db: Session, *, budget_id: int, owner_id: Optional[int] = None
+) -> Optional[Budget]:
+    """Retrieve a single budget by ID.
+
+    Args:
+        db (Session): A database session.
+        budget_id (int): Primary key of the budget.
+        owner_id (int, optional): Only return the budget if this user owns
+            it. Defaults to None, which does not check.
+
+    Returns:
+        Optional[Budget]: The budget if found, else `None`.
+    """
+    budget = db.get(Budget, budget_id)
+    if budget is None or (owner_id is not None and budget.user_id != owner_id):
+        return None
+    return budget
+
+
+def update_budget(
+    db: Session, *, budget_id: int, amount: Decimal, owner_id: Optional[int] = None
+) -> Optional[Budget]:
+    """Change the amount of a budget. Its consumption is unaffected.
+
+    Args:
+        db (Session): A database session.
+        budget_id (int): Primary key of the budget.
+        amount (Decimal): New spending allowed per period.
+        owner_id (int, optional): Only change the budget if this user owns
+            it. Defaults to None, which does not check.
+
+    Returns:
+        Optional[Budget]: The updated budget, or `None` if it does not exist.
+
+    Raises:
+        ValueError: If the amount is not positive.
+    """
+    if amount <= 0:
+        raise ValueError("amount must be positive")
+    budget = get_budget(db, budget_id=budget_id, owner_id=owner_id)
+    if budget is None:
+        return None
+    budget.amount = amount
+    mark_data_changed(db)
+    db.commit()
+    db.refresh(budget)
+    return budget
+
+
+def delete_budget(db: Session, *, budget_id: int, owner_id: Optional[int] = None) -> bool:
+    """Delete a budget and its recorded consumption.
+
+    Args:
+        db (Session): A database session.
+        budget_id (int): Primary key of the budget.
+        owner_id (int, optional): Only delete the budget if this user owns
+            it. Defaults to None, which does not check.
+
+    Returns:
+        bool: `True` if the budget existed.
+    """
+    budget = get_budget(db, budget_id=budget_id, owner_id=owner_id)
+    if budget is None:
+        return False
+    # Deleted explicitly: SQLite does not enforce the cascading foreign key
+    # unless `PRAGMA foreign_keys` is on.
+    spending = BudgetSpending.__table__
+    db.connection().execute(delete(spending).where(spending.c.budget_id == budget_id))
+    db.delete(budget)
+    mark_data_changed(db)
+    db.commit()
+    return True
+
+
+def get_budget_statuses(
+    db: Session, *, on: date, owner_id: Optional[int] = None
+) -> List[BudgetStatus]:
+    """Return every budget with its consumption in the period containing `on`.
+
+    All budgets are read with one join against the `BudgetSpending` unique
+    index; periods without transactions report nothing spent.
+
+    Args:
+        db (Session): A database session.
+        on (date): Day whose month or year is reported.
+        owner_id (int, optional): Only report this user's budgets. Defaults
+            to None, which reports all of them.
+
+    Returns:
+        List[BudgetStatus]: One status per budget, ordered by budget ID.
+    """
+    budget = Budget.__table__
+    spending = BudgetSpending.__table__
+    period_start = case(
+        (budget.c.period == "year", literal(_period_start("year", on.replace(day=1)), Date)),
+        else_=literal(on.replace(day=1), Date),
+    )
+    statement = (
+        select(
+            budget.c.id,
+            budget.c.category_id,
+            budget.c.period,
+            budget.c.amount,
+            spending.c.transaction_count,
+            spending.c.spent,
+        )
+        .select_from(
+            budget.outerjoin(
+                spending,
+                and_(
+                    spending.c.budget_id == budget.c.id,
+                    spending.c.period_start == period_start,
+                ),
+            )
+        )
+        .order_by(budget.c.id)
+    )
+    if owner_id is not None:
+        statement = statement.where(budget.c.user_id == owner_id)
+    statuses: List[BudgetStatus] = []
+    for row in db.connection().execute(statement):
+        amount = Decimal(str(row.amount))
+        spent = Decimal(str(row.spent)) if row.spent is not None else Decimal("0")
+        statuses.append(
+            BudgetStatus(
+                budget_id=row.id,
+                category_id=row.category_id,
+                period=row.period,
+                period_start=_period_start(row.period, on.replace(day=1)),
+                amount=amount,
+                transaction_count=row.transaction_count or 0,
+                spent=spent,
+                remaining=amount - spent,
+            )
+        )
+    return statuses
@@ -0,0 +1,51 @@
+"""
+CRUD utilities for the `Category` model.
+"""
+
+from typing import List
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.crud.version import mark_data_changed
+from app.models.category import Category
+
+
+def create_category(db: Session, *, category: Category) -> Category:
+    """Insert a new `Category`.
+
+    Args:
+        db (Session): A database session.
+        category (Category): The category to add.
+
+    Returns:
+        Category: The persisted category with an assigned primary key.
+
+    Raises:
+        ValueError: If a category with the same name already exists.
+    """
+    duplicate = ValueError(f"A category named {category.name!r} already exists")
+    if db.exec(select(Category.id).where(Category.name == category.name)).first() is not None:
+        raise duplicate
+    db.add(category)
+    mark_data_changed(db)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        # Created concurrently since the check above.
+        db.rollback()
+        raise duplicate from e
+    db.refresh(category)
+    return category
+
+
+def get_categories(db: Session) -> List[Category]:
+    """Return all categories ordered by name.
+
+    Args:
+        db (Session): A database session.
+
+    Returns:
+        List[Category]: The categories.
+    """
+    return list(db.exec(select(Category).order_by(Category.name)).all())
@@ -0,0 +1,60 @@
+"""
+Additive upserts of counter rows.
+
+Rollup buckets and budget consumption are rows of counters under a unique
+key: a change inserts the row, or adds its values to the stored one.
+PostgreSQL and SQLite do so with one `INSERT ... ON CONFLICT DO UPDATE` per
+batch; other dialects update each row and insert it when nothing matched.
+"""
+
+from typing import Any, Dict, Sequence
+
+from sqlalchemy import Connection, Table, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def add_to_counters(
+    connection: Connection,
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    *,
+    key: Sequence[str],
+    counters: Sequence[str],
+) -> None:
+    """Insert `rows`, adding their counters to the stored rows with the same key.
+
+    The change is executed but not committed. Without `ON CONFLICT`, two
+    transactions creating the same row concurrently fail on the unique index.
+
+    Args:
+        connection (Connection): Connection of the caller's transaction.
+        table (Table): Table with a unique index on `key`.
+        rows (Sequence[Dict[str, Any]]): Values of the key and counter columns.
+        key (Sequence[str]): Columns of the unique index.
+        counters (Sequence[str]): Columns whose values are added.
+    """
+    if not rows:
+        return
+    build_insert = _UPSERT_INSERTS.get(connection.dialect.name)
+    if build_insert is not None:
+        statement = build_insert(table)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(key),
+                set_={
+                    column: table.c[column] + statement.excluded[column] for column in counters
+                },
+            ),
+            rows,
+        )
+        return
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(*(table.c[column] == row[column] for column in key))
+            .values({column: table.c[column] + row[column] for column in counters})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(row))
@@ -0,0 +1,247 @@
+"""
+CRUD utilities for the `TransactionRollup` table.
+
+Rollup buckets are adjusted in the same database transaction that inserts or
+changes transactions, so reports never have to aggregate the transaction
+table itself. `rebuild_rollup` recomputes every bucket from scratch. Budget
+consumption in `app.crud.budget` is derived from the same bucket changes.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, case, delete, func, insert, select
+from sqlmodel import Session
+
+from app.crud.budget import add_to_budgets, rebuild_budget_spending
+from app.crud.counters import add_to_counters
+from app.crud.version import mark_data_changed
+from app.models.account import Account
+from app.models.rollup import UNCATEGORIZED, UNLINKED, SpendingSummary, TransactionRollup
+from app.models.transaction import Transaction
+
+BUCKET_KEY = ("month", "account_id", "category_id")
+
+
+def add_to_rollup(db: Session, *, records: Iterable[Mapping[str, Any]], sign: int = 1) -> int:
+    """Add transactions to (or, with `sign=-1`, remove them from) their buckets.
+
+    The change is executed but not committed, so it shares the caller's
+    transaction. Records without a booking date belong to no month and are
+    ignored. Buckets left without transactions by a subtraction are deleted.
+    The same changes are applied to the consumption of the affected budgets.
+
+    Args:
+        db (Session): A database session.
+        records (Iterable[Mapping[str, Any]]): Transaction column values with
+            at least `booking_date`, `account_id`, `amount` and `category_id`.
+        sign (int, optional): `1` to add, `-1` to subtract. Defaults to 1.
+
+    Returns:
+        int: Number of buckets touched.
+    """
+    buckets: Dict[Tuple[date, int, int], List[Any]] = {}
+    for record in records:
+        booked = record.get("booking_date")
+        if booked is None:
+            continue
+        key = (
+            booked.replace(day=1),
+            record.get("account_id") or UNLINKED,
+            record.get("category_id") or UNCATEGORIZED,
+        )
+        bucket = buckets.setdefault(key, [0, Decimal("0"), Decimal("0")])
+        amount = Decimal(str(record["amount"]))
+        bucket[0] += sign
+        bucket[1 if amount >= 0 else 2] += sign * amount
+    if not buckets:
+        return 0
+
+    connection = db.connection()
+    add_to_counters(
+        connection,
+        TransactionRollup.__table__,
+        [
+            {
+                "month": month,
+                "account_id": account_id,
+                "category_id": category_id,
+                "transaction_count": count,
+                "income": income,
+                "expenses": expenses,
+            }
+            for (month, account_id, category_id), (count, income, expenses) in buckets.items()
+        ],
+        key=BUCKET_KEY,
+        counters=("transaction_count", "income", "expenses"),
+    )
+    if sign < 0:
+        table = TransactionRollup.__table__
+        connection.execute(delete(table).where(table.c.transaction_count <= 0))
+    add_to_budgets(db, deltas=buckets)
+    return len(buckets)
+
+
+def remove_month_from_rollup(db: Session, month: date) -> int:
+    """Delete the buckets of `month` and subtract them from budget consumption.
+
+    Used when a whole month leaves the transaction table, such as when its
+    partition is archived. The change is executed but not committed, so it
+    shares the caller's transaction.
+
+    Args:
+        db (Session): A database session.
+        month (date): First day of the month.
+
+    Returns:
+        int: Number of buckets deleted.
+    """
+    table = TransactionRollup.__table__
+    connection = db.connection()
+    rows = connection.execute(
+        select(
+            table.c.account_id,
+            table.c.category_id,
+            table.c.transaction_count,
+            table.c.income,
+            table.c.expenses,
+        ).where(table.c.month == month)
+    ).all()
+    if not rows:
+        return 0
+    connection.execute(delete(table).where(table.c.month == month))
+    add_to_budgets(
+        db,
+        deltas={
+            (month, row.account_id, row.category_id): (
+                -row.transaction_count,
+                -row.income,
+                -row.expenses,
+            )
+            for row in rows
+        },
+    )
+    return len(rows)
+
+
+def rebuild_rollup(db: Session) -> None:
+    """Recompute every rollup bucket from the transaction table and commit.
+
+    Budget consumption is recomputed from the new buckets in the same
+    transaction.
+
+    Args:
+        db (Session): A database session.
+    """
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        month = func.date_trunc("month", Transaction.booking_date).cast(Date)
+    else:
+        month = func.date(Transaction.booking_date, "start of month")
+    account = func.coalesce(Transaction.account_id, UNLINKED)
+    category = func.coalesce(Transaction.category_id, UNCATEGORIZED)
+    source = (
+        select(
+            month,
+            account,
+            category,
+            func.count(),
+            func.coalesce(func.sum(case((Transaction.amount >= 0, Transaction.amount))), 0),
+            func.coalesce(func.sum(case((Transaction.amount < 0, Transaction.amount))), 0),
+        )
+        .where(Transaction.booking_date.is_not(None))
+        .group_by(month, account, category)
+    )
+    table = TransactionRollup.__table__
+    mark_data_changed(db)
+    try:
+        connection.execute(delete(table))
+        connection.execute(
+            insert(table).from_select(
+                [*BUCKET_KEY, "transaction_count", "income", "expenses"], source
+            )
+        )
+        rebuild_budget_spending(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def get_spending_summary(
+    db: Session,
+    *,
+    group_by: Sequence[str] = BUCKET_KEY,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    account: Optional[str] = None,
+    category_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+) -> List[SpendingSummary]:
+    """Aggregate rollup buckets into spending totals.
+
+    Grouping by `account_id` also reports each account's number; buckets of
+    transactions not linked to an account report none.
+
+    Args:
+        db (Session): A database session.
+        group_by (Sequence[str], optional): Subset of `month`, `account_id`
+            and `category_id` to group by. Defaults to all three.
+        date_from (date, optional): Include months from the one containing this date.
+        date_to (date, optional): Include months up to the one containing this date.
+        account (str, optional): Restrict to the accounts with this number.
+        category_id (int, optional): Restrict to one category (`0` for uncategorized).
+        owner_id (int, optional): Restrict to this user's accounts.
+
+    Returns:
+        List[SpendingSummary]: One entry per group, ordered by the group keys.
+    """
+    keys = [getattr(TransactionRollup, name) for name in BUCKET_KEY if name in group_by]
+    if TransactionRollup.account_id in keys:
+        keys.append(Account.number.label("account"))
+    income = func.sum(TransactionRollup.income)
+    expenses = func.sum(TransactionRollup.expenses)
+    statement = select(
+        *keys,
+        func.sum(TransactionRollup.transaction_count).label("transaction_count"),
+        income.label("income"),
+        expenses.label("expenses"),
+    ).select_from(
+        TransactionRollup.__table__.outerjoin(
+            Account.__table__, Account.id == TransactionRollup.account_id
+        )
+    )
+    if date_from is not None:
+        statement = statement.where(TransactionRollup.month >= date_from.replace(day=1))
+    if date_to is not None:
+        statement = statement.where(TransactionRollup.month <= date_to)
+    if account is not None:
+        statement = statement.where(Account.number == account)
+    if category_id is not None:
+        statement = statement.where(TransactionRollup.category_id == category_id)
+    if owner_id is not None:
+        statement = statement.where(Account.user_id == owner_id)
+    if keys:
+        statement = statement.group_by(*keys).order_by(*keys)
+
+    summaries: List[SpendingSummary] = []
+    for row in db.connection().execute(statement).mappings():
+        if row["transaction_count"] is None:
+            # Ungrouped aggregate over zero buckets.
+            continue
+        income_total = Decimal(str(row["income"]))
+        expenses_total = Decimal(str(row["expenses"]))
+        summaries.append(
+            SpendingSummary(
+                month=row.get("month"),
+                account_id=row.get("account_id"),
+                account=row.get("account"),
+                category_id=row.get("category_id"),
+                transaction_count=row["transaction_count"],
+                income=income_total,
+                expenses=expenses_total,
+                net=income_total + expenses_total,
+            )
+        )
+    return summaries
@@ -0,0 +1,193 @@
+"""
+CRUD utilities for categorization rules.
+
+Besides managing `CategoryRule` rows, this module reruns the compiled rules
+over stored transactions and keeps the spending rollup in step with the
+categories it changes.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import bindparam, update
+from sqlmodel import Session, select
+
+from app.core.config import get_settings
+from app.crud.rollup import add_to_rollup
+from app.crud.transaction import owned_by
+from app.crud.version import mark_data_changed
+from app.ingest.rules import load_rule_matcher
+from app.models.category import Category
+from app.models.rule import CategoryRule, RecategorizeResult
+from app.models.transaction import Transaction
+
+# Columns a rule can match on, plus those needed to maintain the rollup.
+_RULE_COLUMNS = (
+    "id",
+    "booking_date",
+    "account_id",
+    "amount",
+    "category_id",
+    "counterparty_name",
+    "counterparty_account",
+    "notes",
+)
+_TEXT_CONDITIONS = ("counterparty_name", "counterparty_account", "notes")
+
+
+def create_rule(db: Session, *, rule: CategoryRule) -> CategoryRule:
+    """Validate and insert a new `CategoryRule`.
+
+    Args:
+        db (Session): A database session.
+        rule (CategoryRule): The rule to add.
+
+    Returns:
+        CategoryRule: The persisted rule with an assigned primary key.
+
+    Raises:
+        ValueError: If the rule has no condition, an empty range, or refers
+            to an unknown category.
+    """
+    for field in _TEXT_CONDITIONS:
+        value = getattr(rule, field)
+        setattr(rule, field, value.strip() or None if value is not None else None)
+    conditions = [getattr(rule, field) for field in _TEXT_CONDITIONS]
+    conditions += [rule.amount_min, rule.amount_max]
+    if all(condition is None for condition in conditions):
+        raise ValueError("A rule needs at least one condition")
+    if (
+        rule.amount_min is not None
+        and rule.amount_max is not None
+        and rule.amount_min > rule.amount_max
+    ):
+        raise ValueError("amount_min must not exceed amount_max")
+    if db.get(Category, rule.category_id) is None:
+        raise ValueError(f"Unknown category {rule.category_id}")
+    db.add(rule)
+    mark_data_changed(db)
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+def get_rules(db: Session, *, owner_id: Optional[int] = None) -> List[CategoryRule]:
+    """Return all rules in the order they are tried.
+
+    Args:
+        db (Session): A database session.
+        owner_id (int, optional): Only return this user's rules. Defaults to
+            None, which returns all of them.
+
+    Returns:
+        List[CategoryRule]: Rules ordered by priority, then ID.
+    """
+    statement = select(CategoryRule).order_by(CategoryRule.priority, CategoryRule.id)
+    if owner_id is not None:
+        statement = statement.where(CategoryRule.user_id == owner_id)
+    return list(db.exec(statement).all())
+
+
+def delete_rule(db: Session, *, rule_id: int, owner_id: Optional[int] = None) -> bool:
+    """Delete a rule. Categories it already assigned are kept.
+
+    Args:
+        db (Session): A database session.
+        rule_id (int): Primary key of the rule.
+        owner_id (int, optional): Only delete the rule if this user owns it.
+            Defaults to None, which does not check.
+
+    Returns:
+        bool: `True` if the rule existed.
+    """
+    rule = db.get(CategoryRule, rule_id)
+    if rule is None or (owner_id is not None and rule.user_id != owner_id):
+        return False
+    db.delete(rule)
+    mark_data_changed(db)
+    db.commit()
+    return True
+
+
+def recategorize_transactions(
+    db: Session,
+    *,
+    overwrite: bool = False,
+    chunk_size: Optional[int] = None,
+    owner_id: Optional[int] = None,
+) -> RecategorizeResult:
+    """Rerun the categorization rules over stored transactions.
+
+    Transactions are read in primary key order, `chunk_size` at a time; each
+    chunk's changed categories and the matching rollup adjustments are
+    written and committed together, so a long run can be interrupted
+    without leaving the rollup inconsistent. Transactions that no rule
+    matches keep their category.
+
+    Args:
+        db (Session): A database session.
+        overwrite (bool, optional): Also recategorize transactions that
+            already have a category. Defaults to False, which only fills in
+            uncategorized ones.
+        chunk_size (int, optional): Transactions per chunk. Defaults to
+            `Settings.ingest_chunk_size`.
+        owner_id (int, optional): Only recategorize the transactions of this
+            user's accounts, with this user's rules. Defaults to None, which
+            applies every rule to all transactions.
+
+    Returns:
+        RecategorizeResult: Number of transactions scanned and updated.
+    """
+    matcher = load_rule_matcher(db, owner_id)
+    if not len(matcher):
+        return RecategorizeResult(scanned=0, updated=0)
+    size = chunk_size or get_settings().ingest_chunk_size
+    table = Transaction.__table__
+    set_category = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(category_id=bindparam("new_category_id"))
+    )
+    scanned = updated = 0
+    last_id = 0
+    while True:
+        statement = (
+            select(*(table.c[column] for column in _RULE_COLUMNS))
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(size)
+        )
+        if not overwrite:
+            statement = statement.where(table.c.category_id.is_(None))
+        if owner_id is not None:
+            statement = statement.where(owned_by(owner_id))
+        connection = db.connection()
+        rows = [dict(row) for row in connection.execute(statement).mappings()]
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+        scanned += len(rows)
+
+        before = [dict(row) for row in rows]
+        matcher.apply(rows, overwrite=overwrite)
+        changed = [
+            (old, new) for old, new in zip(before, rows) if old["category_id"] != new["category_id"]
+        ]
+        if not changed:
+            continue
+        mark_data_changed(db)
+        try:
+            connection.execute(
+                set_category,
+                [
+                    {"row_id": new["id"], "new_category_id": new["category_id"]}
+                    for _, new in changed
+                ],
+            )
+            add_to_rollup(db, records=[old for old, _ in changed], sign=-1)
+            add_to_rollup(db, records=[new for _, new in changed])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        updated += len(changed)
+    return RecategorizeResult(scanned=scanned, updated=updated)
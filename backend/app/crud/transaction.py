@@ -5,11 +5,35 @@ These functions provide a layer of abstraction over the raw SQLModel API,
 encouraging consistent usage patterns and simplifying future refactoring.
 """
 
-from typing import List, Optional
+from collections import defaultdict, deque
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
+from sqlalchemy import ColumnElement, Connection, Insert, Select, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
-from app.models.transaction import Transaction
+from app.core.config import get_settings
+from app.crud.rollup import add_to_rollup
+from app.crud.version import mark_data_changed
+from app.db.partitions import ensure_month_partitions
+from app.models.account import Account
+from app.models.transaction import NATURAL_KEY, Transaction, TransactionFilter
+
+SelectT = TypeVar("SelectT", bound=Select)
 
 
 def create_transaction(db: Session, *, transaction: Transaction) -> Transaction:
@@ -22,35 +46,462 @@ def create_transaction(db: Session, *, transaction: Transaction) -> Transaction:
     Returns:
         Transaction: The persisted transaction with an assigned primary key.
     """
+    ensure_month_partitions(db, [transaction.booking_date])
     db.add(transaction)
+    mark_data_changed(db)
+    db.flush()
+    add_to_rollup(db, records=[transaction.model_dump()])
     db.commit()
     db.refresh(transaction)
     return transaction
 
 
-def get_transaction(db: Session, *, transaction_id: int) -> Optional[Transaction]:
+def _insert_ignoring_duplicates(dialect_name: str) -> Optional[Insert]:
+    """Build an `INSERT ... ON CONFLICT DO NOTHING` on the natural key index.
+
+    Returns `None` on dialects without `ON CONFLICT`.
+    """
+    table = Transaction.__table__
+    if dialect_name == "postgresql":
+        # No conflict target: the natural key is the only unique index rows
+        # can collide on, and a partitioned table's version of it also
+        # contains `booking_date` (see `app.db.partitions`).
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect_name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=list(NATURAL_KEY))
+    return None
+
+
+def _natural_key(record: Mapping[str, Any]) -> Tuple[Any, ...]:
+    return tuple(record.get(column) for column in NATURAL_KEY)
+
+
+def _align_ids(
+    records: Sequence[Dict[str, Any]], rows: Sequence[Any]
+) -> List[Optional[int]]:
+    """Match returned `(id, *NATURAL_KEY)` rows back to the records they came from."""
+    pending: Dict[Tuple[Any, ...], Deque[int]] = defaultdict(deque)
+    for row in sorted(rows, key=lambda row: row[0]):
+        pending[tuple(row[1:])].append(row[0])
+    ids: List[Optional[int]] = []
+    for record in records:
+        queue = pending.get(_natural_key(record))
+        ids.append(queue.popleft() if queue else None)
+    return ids
+
+
+def _insert_new(
+    connection: Connection, records: Sequence[Dict[str, Any]], *, returning: bool
+) -> List[Optional[int]]:
+    """Insert the records whose natural key is not stored yet, without `ON CONFLICT`.
+
+    The stored keys among `records` are looked up with one query first;
+    records matching one, or repeating an earlier record, are skipped. As
+    with the unique index, records with a NULL key column are never
+    duplicates. A concurrent insert of the same rows can still fail on the
+    index.
+
+    Args:
+        connection (Connection): The connection of the inserting session.
+        records (Sequence[Dict[str, Any]]): Column values for each new row.
+        returning (bool): Whether the dialect returns the primary keys of an
+            executemany `INSERT` in parameter order; otherwise the rows are
+            inserted one statement each to learn their keys.
+
+    Returns:
+        List[Optional[int]]: Primary keys aligned with `records`, `None` for
+        skipped duplicates.
+    """
+    table = Transaction.__table__
+    keys = [_natural_key(record) for record in records]
+    complete = [key for key in keys if None not in key]
+    stored: Set[Tuple[Any, ...]] = set()
+    if complete:
+        # Narrowed per column, then matched exactly here.
+        statement = select(*(table.c[column] for column in NATURAL_KEY)).where(
+            *(
+                table.c[column].in_({key[position] for key in complete})
+                for position, column in enumerate(NATURAL_KEY)
+            )
+        )
+        stored.update(tuple(row) for row in connection.execute(statement))
+    new: List[Dict[str, Any]] = []
+    skipped: List[bool] = []
+    for record, key in zip(records, keys):
+        duplicate = None not in key and key in stored
+        skipped.append(duplicate)
+        if not duplicate:
+            new.append(record)
+            if None not in key:
+                stored.add(key)
+
+    if not new:
+        new_ids: List[int] = []
+    elif returning:
+        new_ids = list(
+            connection.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True), new
+            ).scalars()
+        )
+    else:
+        new_ids = [
+            connection.execute(insert(table), record).inserted_primary_key[0]
+            for record in new
+        ]
+    remaining = iter(new_ids)
+    return [None if duplicate else next(remaining) for duplicate in skipped]
+
+
+def create_transactions(
+    db: Session,
+    *,
+    records: Sequence[Dict[str, Any]],
+    batch_size: Optional[int] = None,
+    commit: bool = True,
+    skip_duplicates: bool = False,
+) -> List[Optional[int]]:
+    """Insert many transactions in batches within a single database transaction.
+
+    Each batch is sent as one executemany `INSERT`. On dialects that support
+    `INSERT ... RETURNING` for executemany (PostgreSQL, SQLite >= 3.35) the
+    generated primary keys are returned in the order of `records`. Either all
+    rows are committed or, if any batch fails, none are.
+
+    With `skip_duplicates=True` the insert uses `ON CONFLICT DO NOTHING` on
+    the natural key index, so rows already stored (or repeated within
+    `records`) are skipped at the cost of one index probe each. Their
+    position in the returned list holds `None`. Other dialects, and SQLite
+    builds without `RETURNING`, look the batch's natural keys up with one
+    query before inserting the remaining rows instead.
+
+    The inserted rows are added to their `TransactionRollup` buckets within
+    the same transaction. On a partitioned table, the partitions of months
+    not stored before are created first.
+
+    Pass `commit=False` to leave the transaction open so several calls can be
+    committed together; the caller is then responsible for committing or
+    rolling back.
+
+    Args:
+        db (Session): A database session.
+        records (Sequence[Dict[str, Any]]): Column values for each new row.
+        batch_size (int, optional): Rows per statement. Defaults to
+            `Settings.ingest_batch_size`.
+        commit (bool, optional): Commit after the last batch. Defaults to True.
+        skip_duplicates (bool, optional): Ignore rows whose natural key
+            already exists. Records must be linked to their account (see
+            `AccountResolver`) to be detected. Defaults to False.
+
+    Returns:
+        List[Optional[int]]: Primary keys aligned with `records` (`None` for
+        skipped duplicates), or an empty list when the dialect cannot return
+        them and `skip_duplicates` is not set.
+
+    Raises:
+        ValueError: If the table is partitioned and a record has no booking
+            date.
+    """
+    size = batch_size or get_settings().ingest_batch_size
+    table = Transaction.__table__
+    connection = db.connection()
+    dialect = connection.dialect
+    ordered_returning = dialect.insert_executemany_returning_sort_by_parameter_order
+    on_conflict = None
+    if skip_duplicates and dialect.insert_executemany_returning:
+        on_conflict = _insert_ignoring_duplicates(dialect.name)
+    if on_conflict is not None:
+        # Skipped rows return nothing, which the ordered RETURNING mode
+        # rejects; the key columns are returned instead to realign the ids.
+        statement = on_conflict.returning(
+            table.c.id, *(table.c[column] for column in NATURAL_KEY)
+        )
+    else:
+        statement = insert(table)
+        if ordered_returning:
+            statement = statement.returning(table.c.id, sort_by_parameter_order=True)
+
+    ids: List[Optional[int]] = []
+    mark_data_changed(db)
+    try:
+        for start in range(0, len(records), size):
+            batch = list(records[start:start + size])
+            ensure_month_partitions(db, (record.get("booking_date") for record in batch))
+            if on_conflict is not None:
+                batch_ids = _align_ids(batch, connection.execute(statement, batch).all())
+            elif skip_duplicates:
+                batch_ids = _insert_new(connection, batch, returning=ordered_returning)
+            elif ordered_returning:
+                batch_ids = connection.execute(statement, batch).scalars().all()
+            else:
+                connection.execute(statement, batch)
+                add_to_rollup(db, records=batch)
+                continue
+            ids.extend(batch_ids)
+            add_to_rollup(
+                db,
+                records=(
+                    record
+                    for record, transaction_id in zip(batch, batch_ids)
+                    if transaction_id is not None
+                ),
+            )
+        if commit:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return ids
+
+
+def get_transaction(
+    db: Session, *, transaction_id: int, owner_id: Optional[int] = None
+) -> Optional[Transaction]:
     """Retrieve a single transaction by ID.
 
     Args:
         db (Session): A database session.
         transaction_id (int): Primary key of the transaction.
+        owner_id (int, optional): Only return the transaction if it belongs to
+            an account of this user. Defaults to None, which does not check.
 
     Returns:
         Optional[Transaction]: The transaction if found, else `None`.
     """
-    return db.get(Transaction, transaction_id)
+    if owner_id is None:
+        return db.get(Transaction, transaction_id)
+    return db.exec(
+        select(Transaction).where(Transaction.id == transaction_id, owned_by(owner_id))
+    ).first()
+
+
+def owned_by(owner_id: int) -> ColumnElement[bool]:
+    """Build a condition matching the transactions of accounts owned by `owner_id`.
+
+    The owner's account IDs come from the `account.user_id` index, and each
+    account's transactions from the indexes led by `transaction.account_id`,
+    so a user's queries cost in proportion to their own rows.
+
+    Args:
+        owner_id (int): Primary key of the owning `User`.
+
+    Returns:
+        ColumnElement[bool]: A WHERE clause over `Transaction`.
+    """
+    return Transaction.account_id.in_(select(Account.id).where(Account.user_id == owner_id))
+
+
+def _contains_pattern(text: str) -> str:
+    """Build a LIKE pattern matching `text` anywhere, with wildcards escaped."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def filter_transactions(
+    statement: SelectT,
+    filters: Optional[TransactionFilter],
+    *,
+    owner_id: Optional[int] = None,
+) -> SelectT:
+    """Add the WHERE clauses described by `filters` to a transaction query.
+
+    Substring criteria use `ILIKE`, which PostgreSQL answers from the trigram
+    indexes and SQLite evaluates as a case-insensitive `LIKE` scan.
+
+    Args:
+        statement (Select): A select over `Transaction`.
+        filters (TransactionFilter, optional): Criteria to apply.
+        owner_id (int, optional): Restrict to the accounts of this user.
+            Defaults to None, which spans all accounts.
+
+    Returns:
+        Select: The filtered statement.
+    """
+    if owner_id is not None:
+        statement = statement.where(owned_by(owner_id))
+    if filters is None:
+        return statement
+    if filters.account is not None:
+        statement = statement.where(Transaction.account == filters.account)
+    if filters.date_from is not None:
+        statement = statement.where(Transaction.booking_date >= filters.date_from)
+    if filters.date_to is not None:
+        statement = statement.where(Transaction.booking_date <= filters.date_to)
+    if filters.amount_min is not None:
+        statement = statement.where(Transaction.amount >= filters.amount_min)
+    if filters.amount_max is not None:
+        statement = statement.where(Transaction.amount <= filters.amount_max)
+    if filters.category_id is not None:
+        statement = statement.where(Transaction.category_id == filters.category_id)
+    if filters.counterparty:
+        statement = statement.where(
+            Transaction.counterparty_name.ilike(
+                _contains_pattern(filters.counterparty), escape="\\"
+            )
+        )
+    if filters.q:
+        statement = statement.where(
+            Transaction.notes.ilike(_contains_pattern(filters.q), escape="\\")
+        )
+    return statement
+
+
+def _offset_statement(
+    *,
+    skip: int,
+    limit: int,
+    filters: Optional[TransactionFilter],
+    owner_id: Optional[int] = None,
+) -> SelectOfScalar[Transaction]:
+    statement = select(Transaction).order_by(Transaction.id).offset(skip).limit(limit)
+    return filter_transactions(statement, filters, owner_id=owner_id)
+
+
+def _keyset_statement(
+    *,
+    after_id: Optional[int],
+    limit: int,
+    filters: Optional[TransactionFilter],
+    owner_id: Optional[int] = None,
+) -> SelectOfScalar[Transaction]:
+    statement = select(Transaction).order_by(Transaction.id).limit(limit)
+    if after_id is not None:
+        statement = statement.where(Transaction.id > after_id)
+    return filter_transactions(statement, filters, owner_id=owner_id)
 
 
-def get_transactions(db: Session, *, skip: int = 0, limit: int = 100) -> List[Transaction]:
-    """Return a list of transactions with pagination.
+def get_transactions(
+    db: Session,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[TransactionFilter] = None,
+    owner_id: Optional[int] = None,
+) -> List[Transaction]:
+    """Return a list of transactions ordered by ID with offset pagination.
 
     Args:
         db (Session): A database session.
         skip (int, optional): Offset for the first result. Defaults to 0.
         limit (int, optional): Maximum number of results. Defaults to 100.
+        filters (TransactionFilter, optional): Criteria rows must match.
+            Defaults to None.
+        owner_id (int, optional): Restrict to the accounts of this user.
+            Defaults to None, which spans all accounts.
 
     Returns:
         List[Transaction]: A list of transactions.
     """
-    statement = select(Transaction).offset(skip).limit(limit)
-    return list(db.exec(statement))
\ No newline at end of file
+    return list(
+        db.exec(_offset_statement(skip=skip, limit=limit, filters=filters, owner_id=owner_id))
+    )
+
+
+def get_transactions_after(
+    db: Session,
+    *,
+    after_id: Optional[int] = None,
+    limit: int = 100,
+    filters: Optional[TransactionFilter] = None,
+    owner_id: Optional[int] = None,
+) -> List[Transaction]:
+    """Return transactions ordered by ID, starting after `after_id`.
+
+    Unlike `get_transactions`, each page costs one primary key index seek
+    regardless of how deep into the table it is.
+
+    Args:
+        db (Session): A database session.
+        after_id (int, optional): ID of the last row of the previous page.
+            Defaults to None, which starts at the first transaction.
+        limit (int, optional): Maximum number of results. Defaults to 100.
+        filters (TransactionFilter, optional): Criteria rows must match.
+            Defaults to None.
+        owner_id (int, optional): Restrict to the accounts of this user.
+            Defaults to None, which spans all accounts.
+
+    Returns:
+        List[Transaction]: Up to `limit` transactions with IDs above `after_id`.
+    """
+    statement = _keyset_statement(
+        after_id=after_id, limit=limit, filters=filters, owner_id=owner_id
+    )
+    return list(db.exec(statement))
+
+
+def iter_transaction_batches(
+    db: Session,
+    *,
+    filters: Optional[TransactionFilter] = None,
+    owner_id: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield every matching transaction, in ID order, as batches of column dicts.
+
+    The query runs with `yield_per`, which uses a server-side cursor where the
+    driver supports one (a named cursor on PostgreSQL), so only one batch is
+    held in memory at a time. The session's connection stays checked out
+    until the iterator is exhausted or closed.
+
+    Args:
+        db (Session): A database session.
+        filters (TransactionFilter, optional): Criteria rows must match.
+            Defaults to None.
+        owner_id (int, optional): Restrict to the accounts of this user.
+            Defaults to None, which spans all accounts.
+        batch_size (int, optional): Rows per batch. Defaults to
+            `Settings.export_batch_size`.
+
+    Yields:
+        List[Dict[str, Any]]: The next batch of rows, keyed by column name.
+    """
+    size = batch_size or get_settings().export_batch_size
+    table = Transaction.__table__
+    statement = filter_transactions(
+        select(*table.c).order_by(table.c.id), filters, owner_id=owner_id
+    )
+    result = db.connection().execute(statement, execution_options={"yield_per": size})
+    with result:
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+
+async def get_transaction_async(
+    db: AsyncSession, *, transaction_id: int, owner_id: Optional[int] = None
+) -> Optional[Transaction]:
+    """Async variant of `get_transaction`."""
+    if owner_id is None:
+        return await db.get(Transaction, transaction_id)
+    result = await db.exec(
+        select(Transaction).where(Transaction.id == transaction_id, owned_by(owner_id))
+    )
+    return result.first()
+
+
+async def get_transactions_async(
+    db: AsyncSession,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[TransactionFilter] = None,
+    owner_id: Optional[int] = None,
+) -> List[Transaction]:
+    """Async variant of `get_transactions`."""
+    result = await db.exec(
+        _offset_statement(skip=skip, limit=limit, filters=filters, owner_id=owner_id)
+    )
+    return list(result)
+
+
+async def get_transactions_after_async(
+    db: AsyncSession,
+    *,
+    after_id: Optional[int] = None,
+    limit: int = 100,
+    filters: Optional[TransactionFilter] = None,
+    owner_id: Optional[int] = None,
+) -> List[Transaction]:
+    """Async variant of `get_transactions_after`."""
+    result = await db.exec(
+        _keyset_statement(after_id=after_id, limit=limit, filters=filters, owner_id=owner_id)
+    )
+    return list(result)
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+CRUD utilities for the `User` model.
+
+Passwords are only ever handled as hashes produced by `app.core.security`.
+"""
+
+from typing import Optional
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.core.security import decode_access_token, hash_password, verify_password
+from app.crud.budget import rebuild_budget_spending
+from app.crud.version import mark_data_changed
+from app.models.account import Account
+from app.models.budget import Budget
+from app.models.rule import CategoryRule
+from app.models.user import User
+
+
+def get_user_by_email(db: Session, *, email: str) -> Optional[User]:
+    """Return the user registered with `email`, if any.
+
+    Args:
+        db (Session): A database session.
+        email (str): The login e-mail address.
+
+    Returns:
+        Optional[User]: The user if found, else `None`.
+    """
+    return db.exec(select(User).where(User.email == email)).first()
+
+
+def create_user(
+    db: Session, *, email: str, password: str, full_name: Optional[str] = None
+) -> User:
+    """Insert a new `User` with a hashed password.
+
+    Args:
+        db (Session): A database session.
+        email (str): The login e-mail address.
+        password (str): The plaintext password to hash.
+        full_name (str, optional): Display name. Defaults to None.
+
+    Returns:
+        User: The persisted user with an assigned primary key.
+
+    Raises:
+        ValueError: If the password is empty or the e-mail address is taken.
+    """
+    if not password:
+        raise ValueError("password must not be empty")
+    if get_user_by_email(db, email=email) is not None:
+        raise ValueError(f"A user with e-mail {email!r} already exists")
+    user = User(email=email, full_name=full_name, hashed_password=hash_password(password))
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def authenticate_user(db: Session, *, email: str, password: str) -> Optional[User]:
+    """Return the active user matching `email` and `password`.
+
+    Args:
+        db (Session): A database session.
+        email (str): The login e-mail address.
+        password (str): The plaintext password.
+
+    Returns:
+        Optional[User]: The user, or `None` if the credentials are wrong or
+        the user is deactivated.
+    """
+    user = get_user_by_email(db, email=email)
+    if user is None or not user.is_active:
+        return None
+    if not verify_password(password, user.hashed_password):
+        return None
+    return user
+
+
+def get_user_by_token(db: Session, *, token: str, secret_key: str) -> Optional[User]:
+    """Return the active user an access token was issued to.
+
+    Args:
+        db (Session): A database session.
+        token (str): A bearer token issued by `create_access_token`.
+        secret_key (str): Signing key.
+
+    Returns:
+        Optional[User]: The user, or `None` if the token is invalid or
+        expired, or its user no longer exists or is deactivated.
+    """
+    user_id = decode_access_token(token, secret_key=secret_key)
+    user = db.get(User, user_id) if user_id is not None else None
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+def claim_unowned_accounts(db: Session, *, user_id: int) -> int:
+    """Give every account without an owner to `user_id` and commit.
+
+    Accounts created while authentication was off have no owner, which
+    hides them and their transactions from every authenticated user. The
+    budgets and categorization rules without an owner are claimed with them,
+    and budget consumption is recomputed for the budgets' new scope.
+
+    Args:
+        db (Session): A database session.
+        user_id (int): Primary key of the new owner.
+
+    Returns:
+        int: Number of accounts claimed.
+    """
+    connection = db.connection()
+    mark_data_changed(db)
+    try:
+        for table in (Budget.__table__, CategoryRule.__table__):
+            connection.execute(
+                update(table).where(table.c.user_id.is_(None)).values(user_id=user_id)
+            )
+        table = Account.__table__
+        result = connection.execute(
+            update(table).where(table.c.user_id.is_(None)).values(user_id=user_id)
+        )
+        rebuild_budget_spending(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result.rowcount
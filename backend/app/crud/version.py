@@ -0,0 +1,96 @@
+"""
+Maintenance of the data version counter.
+
+Write paths call `mark_data_changed` on their session. The counter itself is
+incremented in a `before_commit` hook, so its row lock is held only while the
+transaction commits instead of for the whole duration of a long import, and
+nothing is counted when the transaction rolls back.
+
+`get_data_version` remembers the last value read by this process; writes
+committed by this process invalidate it immediately, writes by other
+processes become visible once it is older than `max_age`.
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+
+from app.models.version import DATA_VERSION_ID, DataVersion
+
+_CHANGED = "data_changed"
+
+_lock = threading.Lock()
+# (version, time.monotonic() when it was read)
+_last_read: Optional[Tuple[int, float]] = None
+# Incremented whenever `_last_read` is invalidated, so that a read racing
+# with a local commit does not cache the pre-commit value.
+_generation = 0
+
+
+def mark_data_changed(db: Session) -> None:
+    """Bump the data version when the current transaction of `db` commits.
+
+    Args:
+        db (Session): The session performing the write.
+    """
+    db.info[_CHANGED] = True
+
+
+def get_data_version(db: Session, *, max_age: float = 0) -> int:
+    """Return the data version, reusing this process's last read if recent.
+
+    Args:
+        db (Session): A database session; unused when the cached value is fresh.
+        max_age (float, optional): Seconds a previously read value may be
+            reused. Defaults to 0, which always queries.
+
+    Returns:
+        int: The current version (0 before the first write).
+    """
+    global _last_read  # pylint: disable=global-statement
+    now = time.monotonic()
+    with _lock:
+        if _last_read is not None and now - _last_read[1] < max_age:
+            return _last_read[0]
+        generation = _generation
+    table = DataVersion.__table__
+    version = db.connection().execute(
+        select(table.c.version).where(table.c.id == DATA_VERSION_ID)
+    ).scalar() or 0
+    with _lock:
+        if generation == _generation:
+            _last_read = (version, now)
+    return version
+
+
+@event.listens_for(OrmSession, "before_commit")
+def _bump_on_commit(session: OrmSession) -> None:
+    if not session.info.get(_CHANGED):
+        return
+    table = DataVersion.__table__
+    connection = session.connection()
+    result = connection.execute(
+        update(table)
+        .where(table.c.id == DATA_VERSION_ID)
+        .values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(id=DATA_VERSION_ID, version=1))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _forget_on_commit(session: OrmSession) -> None:
+    global _last_read, _generation  # pylint: disable=global-statement
+    if session.info.pop(_CHANGED, False):
+        with _lock:
+            _last_read = None
+            _generation += 1
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_on_rollback(session: OrmSession) -> None:
+    session.info.pop(_CHANGED, None)
@@ -1,4 +1,4 @@
 """Database package providing engine and session management."""
 
-from .session import get_session, engine  # noqa: F401
+from .session import get_async_engine, get_async_session, get_session, engine  # noqa: F401
 from .init_db import init_db  # noqa: F401
\ No newline at end of file
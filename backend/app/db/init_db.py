@@ -5,6 +5,7 @@ Call this function on application startup to ensure all tables exist. It will
 not drop or modify existing tables. Use Alembic for schema migrations.
 """
 
+from sqlalchemy import text
 from sqlmodel import SQLModel
 
 from app.db.session import engine
@@ -17,4 +18,12 @@ def init_db() -> None:
     import app.models.account  # noqa: F401
     import app.models.category  # noqa: F401
     import app.models.transaction  # noqa: F401
+    import app.models.rollup  # noqa: F401
+    import app.models.rule  # noqa: F401
+    import app.models.version  # noqa: F401
+    import app.models.budget  # noqa: F401
+    if engine.dialect.name == "postgresql":
+        # Trigram indexes on `transaction` need the pg_trgm operator classes.
+        with engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
     SQLModel.metadata.create_all(bind=engine)
\ No newline at end of file
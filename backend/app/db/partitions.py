@@ -0,0 +1,254 @@
+"""
+Monthly partitions of the `transaction` table on PostgreSQL.
+
+Migration 0010, run with `TRANSACTION_PARTITIONING=true`, turns `transaction`
+into a table partitioned by range of `booking_date`, with one partition per
+calendar month named `transaction_y<year>m<month>`. Queries filtered on
+booking dates only visit the months they cover, and each month has its own,
+small indexes.
+
+Partitions are created while ingesting: `ensure_month_partitions` adds the
+months a batch needs before it is inserted. A new partition is created as a
+plain table and then attached, which only takes a `SHARE UPDATE EXCLUSIVE`
+lock on `transaction`, so concurrent reads and inserts are not blocked. It is
+created in the ingesting transaction and disappears if that rolls back.
+
+Old months are taken out of the table with `detach_partition` (see
+`python -m app.commands archive-transactions`). Detached partitions are
+renamed `archived_transaction_y<year>m<month>`, and can be dropped with
+`drop_archived_partition`. Detaching waits for the ingesting transactions, which lock
+the table first and then check which months are still attached, so other
+processes never insert into a month that is gone.
+
+On other databases, or while `transaction` is not partitioned, these
+functions do nothing.
+"""
+
+import re
+import threading
+from datetime import date
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import Connection, event, text
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+
+TABLE = "transaction"
+ARCHIVE_PREFIX = "archived_"
+_PARTITION_NAME = re.compile(r"^transaction_y(\d{4})m(\d{2})$")
+# `pg_advisory_xact_lock` key serializing partition creation across workers.
+_LOCK_KEY = 0x7472616E
+# `Session.info` key of the months a session created in its open transaction.
+_PENDING = "transaction_partitions"
+# `Session.info` key set once a session's open transaction has locked
+# `transaction` against detaching and refreshed `_months`.
+_VERIFIED = "transaction_partitions_verified"
+
+_lock = threading.Lock()
+# Whether `transaction` is partitioned, and the months with a committed
+# partition; `None` until the catalog has been read by this process.
+_partitioned: Optional[bool] = None
+_months: Set[date] = set()
+
+
+def month_start(day: date) -> date:
+    """Return the first day of the month containing `day`."""
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    """Return the first day of the month after `month`."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Return the name of the partition holding `month`, e.g. `transaction_y2024m01`."""
+    return f"{TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Return whether `transaction` is a partitioned table.
+
+    Args:
+        connection (Connection): A database connection.
+
+    Returns:
+        bool: `True` on PostgreSQL once migration 0010 partitioned the table.
+    """
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+            " WHERE partrelid = to_regclass(:table))"
+        ),
+        {"table": f'"{TABLE}"'},
+    ).scalar_one()
+
+
+def partition_months(connection: Connection) -> List[date]:
+    """Return the months of the partitions attached to `transaction`, oldest first.
+
+    Args:
+        connection (Connection): A connection to a PostgreSQL database.
+
+    Returns:
+        List[date]: First day of each partition's month.
+    """
+    names = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": f'"{TABLE}"'},
+    ).scalars()
+    months = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def _create_partition(connection: Connection, month: date) -> None:
+    """Create the partition for `month` as a plain table and attach it."""
+    name = partition_name(month)
+    connection.execute(
+        text(f'CREATE TABLE {name} (LIKE "{TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    )
+    # The parent's indexes are built on the empty table while attaching.
+    connection.execute(
+        text(
+            f'ALTER TABLE "{TABLE}" ATTACH PARTITION {name}'
+            f" FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+        )
+    )
+
+
+def _load(db: Session) -> bool:
+    """Read the committed partition layout once per process and return `_partitioned`."""
+    global _partitioned  # pylint: disable=global-statement
+    with _lock:
+        if _partitioned is None:
+            # A separate connection only sees committed partitions.
+            with db.get_bind().connect() as connection:
+                partitioned = is_partitioned(connection)
+                if partitioned:
+                    _months.update(partition_months(connection))
+            _partitioned = partitioned
+        return _partitioned
+
+
+def ensure_month_partitions(db: Session, days: Iterable[Optional[date]]) -> None:
+    """Create the partitions needed to store transactions booked on `days`.
+
+    The first call in a transaction takes the `ROW EXCLUSIVE` lock the
+    insert needs anyway, which keeps partitions from being detached until the
+    transaction ends, and refreshes the known months from the catalog, so a
+    month archived by another process gets a new partition instead of
+    failing the insert. After that, months with a known partition cost a set
+    lookup. For the others, an advisory lock serializes creation with other
+    workers, the catalog is read again and only the partitions still missing
+    are created, in the session's transaction.
+
+    Args:
+        db (Session): The session that will insert the transactions.
+        days (Iterable[Optional[date]]): Booking dates of the transactions.
+
+    Raises:
+        ValueError: If the table is partitioned and a transaction has no
+            booking date, as there is no partition to store it in.
+    """
+    if db.get_bind().dialect.name != "postgresql" or not _load(db):
+        return
+    months: Set[date] = set()
+    undated = 0
+    for day in days:
+        if day is None:
+            undated += 1
+        else:
+            months.add(month_start(day))
+    if undated:
+        raise ValueError(
+            f"Missing booking date in {undated} row(s); "
+            "the partitioned transaction table needs one on every row"
+        )
+    connection = db.connection()
+    pending: Set[date] = db.info.setdefault(_PENDING, set())
+    if not db.info.get(_VERIFIED):
+        connection.execute(text(f'LOCK TABLE ONLY "{TABLE}" IN ROW EXCLUSIVE MODE'))
+        attached = set(partition_months(connection)) - pending
+        with _lock:
+            _months.clear()
+            _months.update(attached)
+        db.info[_VERIFIED] = True
+    with _lock:
+        missing = months - _months - pending
+    if not missing:
+        return
+    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    existing = set(partition_months(connection))
+    with _lock:
+        _months.update(existing - pending)
+    for month in sorted(missing - existing):
+        _create_partition(connection, month)
+        pending.add(month)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _publish_partitions(session: OrmSession) -> None:
+    session.info.pop(_VERIFIED, None)
+    created = session.info.pop(_PENDING, None)
+    if created:
+        with _lock:
+            _months.update(created)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_partitions(session: OrmSession) -> None:
+    session.info.pop(_VERIFIED, None)
+    session.info.pop(_PENDING, None)
+
+
+def detach_partition(db: Session, month: date) -> str:
+    """Take the partition of `month` out of `transaction`.
+
+    The change is executed but not committed, so it shares the caller's
+    transaction; detaching takes an `ACCESS EXCLUSIVE` lock on `transaction`
+    until then. The detached table is kept as
+    `archived_transaction_y<year>m<month>`, where it can still be queried or
+    attached again (run `rebuild_rollup` afterwards). Transactions ingested
+    for the month later get a new partition.
+
+    Args:
+        db (Session): A database session.
+        month (date): First day of the partition's month.
+
+    Returns:
+        str: Name of the archived table.
+    """
+    name = partition_name(month)
+    archived = f"{ARCHIVE_PREFIX}{name}"
+    connection = db.connection()
+    connection.execute(text(f'ALTER TABLE "{TABLE}" DETACH PARTITION {name}'))
+    connection.execute(text(f"ALTER TABLE {name} RENAME TO {archived}"))
+    # If the transaction is rolled back, the next ingesting transaction
+    # finds the partition in the catalog again.
+    with _lock:
+        _months.discard(month)
+    return archived
+
+
+def drop_archived_partition(db: Session, month: date) -> None:
+    """Drop the table `detach_partition` kept for `month` and commit.
+
+    Args:
+        db (Session): A database session.
+        month (date): First day of the partition's month.
+    """
+    try:
+        db.connection().execute(text(f"DROP TABLE {ARCHIVE_PREFIX}{partition_name(month)}"))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
@@ -3,25 +3,157 @@ Database session and engine configuration.
 
 This module creates a SQLAlchemy engine via SQLModel and exposes a
 dependency function for obtaining a database session within FastAPI routes.
+Pool sizing, timeouts and SQLite PRAGMAs come from `Settings` and are applied
+according to the database dialect, and every statement's execution time is
+reported to `app.core.metrics`. An asyncio engine for the same database
+serves the `async def` read routes.
 """
 
-from typing import Generator
+import time
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Generator
 
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.metrics import record_query
 
 
 settings = get_settings()
 
+
+def _engine_options(settings: Settings) -> Dict[str, Any]:
+    """Return `create_engine` keyword arguments for the configured dialect."""
+    url = make_url(settings.database_url)
+    options: Dict[str, Any] = {"echo": settings.db_echo, "pool_pre_ping": True}
+    pool_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+    if url.get_backend_name() == "sqlite":
+        # Sessions are used from FastAPI's threadpool, so a connection may be
+        # returned to the pool by a different thread than the one that opened it.
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database not in (None, "", ":memory:"):
+            options.update(pool_options)
+        return options
+
+    options.update(pool_options)
+    if url.get_backend_name() == "postgresql":
+        connect_args: Dict[str, Any] = {"connect_timeout": settings.db_connect_timeout}
+        if settings.db_statement_timeout_ms is not None:
+            connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+        options["connect_args"] = connect_args
+    return options
+
+
+def _apply_sqlite_pragmas(engine: Engine, settings: Settings) -> None:
+    """Set the configured PRAGMAs on every new SQLite connection."""
+    pragmas = (
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+    )
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, _: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "PRAGMA"})
+
+
+def _instrument_queries(engine: Engine) -> None:
+    """Time every statement executed on `engine` for the metrics endpoint."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn: Any, *_: Any) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn: Any, _cursor: Any, statement: str, *__: Any) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        record_query(keyword if keyword in _OPERATIONS else "OTHER", elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context: Any) -> None:
+        started = context.connection.info.get("query_started") if context.connection else None
+        if started:
+            started.pop()
+
+
 # The SQLModel engine is created once per process. For SQLite this will
 # create a local file. For production use, configure DATABASE_URL via
 # environment variables.
-engine = create_engine(
-    settings.database_url,
-    echo=settings.db_echo,
-    pool_pre_ping=True,
-)
+engine = create_engine(settings.database_url, **_engine_options(settings))
+if engine.dialect.name == "sqlite":
+    _apply_sqlite_pragmas(engine, settings)
+if settings.metrics_enabled:
+    _instrument_queries(engine)
+
+
+def _async_url(database_url: str) -> URL:
+    """Map a synchronous database URL to its asyncio driver."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        # psycopg 3 serves both the sync and the async dialect.
+        return url.set(drivername="postgresql+psycopg")
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide asyncio engine, creating it on first use.
+
+    Returns:
+        AsyncEngine: Engine using the same settings as `engine`.
+    """
+    async_engine = create_async_engine(
+        _async_url(settings.database_url), **_engine_options(settings)
+    )
+    if async_engine.dialect.name == "sqlite":
+        _apply_sqlite_pragmas(async_engine.sync_engine, settings)
+    if settings.metrics_enabled:
+        _instrument_queries(async_engine.sync_engine)
+    return async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the asyncio engine's pooled connections, if it was created.
+
+    Its connections belong to the event loop that opened them, so they are
+    released when that loop's application shuts down.
+    """
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+        get_async_engine.cache_clear()
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an asyncio session bound to the async engine.
+
+    Yields:
+        AsyncGenerator[AsyncSession, None]: A database session.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -33,4 +165,4 @@ def get_session() -> Generator[Session, None, None]:
         Generator[Session, None, None]: A database session.
     """
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
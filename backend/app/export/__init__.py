@@ -0,0 +1,4 @@
+"""Writers that stream stored transactions to analytics file formats."""
+
+from .writers import EXPORT_FORMATS, check_export_format, stream_export  # noqa: F401
+from .archive import ArchivedMonth, archive_months  # noqa: F401
@@ -0,0 +1,124 @@
+"""
+Archival of old months of a partitioned transaction table.
+
+`archive_months` takes every monthly partition older than a cutoff out of the
+`transaction` table (see `app.db.partitions`), optionally writing it to a
+Parquet file afterwards. The month's rollup buckets, and the budget
+consumption derived from them, are removed in the same transaction as the
+detach, so reports only cover the transactions left in the table.
+"""
+
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import column, select, table, text
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.crud.rollup import remove_month_from_rollup
+from app.crud.version import mark_data_changed
+from app.db.partitions import (
+    detach_partition,
+    drop_archived_partition,
+    is_partitioned,
+    partition_months,
+    partition_name,
+)
+from app.export.writers import check_export_format, stream_export
+from app.models.transaction import Transaction
+
+
+class ArchivedMonth(NamedTuple):
+    month: date
+    rows: int
+    # Parquet file the month was written to, if it was exported.
+    path: Optional[Path]
+
+
+def _iter_table_batches(db: Session, name: str) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the rows of the transaction table copy `name` in ID order, in batches."""
+    source = table(name, *(column(c.name, c.type) for c in Transaction.__table__.c))
+    result = db.connection().execute(
+        select(*source.c).order_by(source.c.id),
+        execution_options={"yield_per": get_settings().export_batch_size},
+    )
+    with result:
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+
+def _export_table(db: Session, name: str, path: Path) -> None:
+    """Write the rows of the transaction table copy `name` to a Parquet file at `path`."""
+    partial = path.with_name(path.name + ".part")
+    with open(partial, "wb") as target:
+        for chunk in stream_export(_iter_table_batches(db, name), "parquet"):
+            target.write(chunk)
+    os.replace(partial, path)
+
+
+def archive_months(
+    db: Session,
+    *,
+    before: date,
+    export_dir: Optional[Path] = None,
+    drop: bool = False,
+) -> List[ArchivedMonth]:
+    """Detach, and optionally export, the partitions of months before `before`.
+
+    Each month is handled and committed on its own: it is detached first,
+    which briefly locks the table, so no transaction can be added to it
+    while it is exported from its `archived_*` table. The detach removes the
+    month from the rollup and budget consumption in the same transaction. A month is only
+    dropped once its export is complete; if the export fails, the month
+    stays in its `archived_*` table.
+
+    Args:
+        db (Session): A database session.
+        before (date): Months starting before this day are archived.
+        export_dir (Path, optional): Directory receiving one
+            `transaction_y<year>m<month>.parquet` file per month. Defaults to
+            None, which only detaches.
+        drop (bool, optional): Drop the detached partitions instead of
+            keeping them as `archived_*` tables. Requires `export_dir`.
+            Defaults to False.
+
+    Returns:
+        List[ArchivedMonth]: The archived months, oldest first.
+
+    Raises:
+        ValueError: If the table is not partitioned, `drop` is set without
+            `export_dir`, or the Parquet export is unavailable.
+    """
+    if not is_partitioned(db.connection()):
+        raise ValueError("The transaction table is not partitioned")
+    if drop and export_dir is None:
+        raise ValueError("Dropping partitions requires exporting them first")
+    if export_dir is not None:
+        check_export_format("parquet")
+        export_dir.mkdir(parents=True, exist_ok=True)
+
+    archived: List[ArchivedMonth] = []
+    for month in partition_months(db.connection()):
+        if month >= before:
+            break
+        mark_data_changed(db)
+        try:
+            name = detach_partition(db, month)
+            remove_month_from_rollup(db, month)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        rows = db.connection().execute(text(f"SELECT COUNT(*) FROM {name}")).scalar_one()
+        path = None
+        if export_dir is not None:
+            path = export_dir / f"{partition_name(month)}.parquet"
+            _export_table(db, name, path)
+        if drop:
+            drop_archived_partition(db, month)
+        else:
+            db.commit()
+        archived.append(ArchivedMonth(month=month, rows=rows, path=path))
+    return archived
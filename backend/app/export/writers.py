@@ -0,0 +1,147 @@
+"""
+Streaming writers for transaction exports.
+
+Each writer consumes batches of transaction rows (as produced by
+`app.crud.transaction.iter_transaction_batches`) and yields encoded bytes as
+soon as a batch has been written, so an export never materializes the whole
+table. CSV uses the standard library; Parquet and Arrow IPC need the optional
+`pyarrow` package, which is imported on first use.
+"""
+
+import csv
+import importlib.util
+import io
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple
+
+import sqlalchemy as sa
+
+from app.models.transaction import Transaction
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+class ExportFormat(NamedTuple):
+    media_type: str
+    extension: str
+    requires_pyarrow: bool
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    "csv": ExportFormat("text/csv; charset=utf-8", "csv", False),
+    "parquet": ExportFormat("application/vnd.apache.parquet", "parquet", True),
+    "arrow": ExportFormat("application/vnd.apache.arrow.stream", "arrows", True),
+}
+
+
+def check_export_format(export_format: str) -> ExportFormat:
+    """Return the description of `export_format` if it can be produced here.
+
+    Args:
+        export_format (str): One of `EXPORT_FORMATS`.
+
+    Returns:
+        ExportFormat: Media type and file extension of the format.
+
+    Raises:
+        ValueError: If the format is unknown or needs `pyarrow`, which is not
+            installed.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    spec = EXPORT_FORMATS[export_format]
+    if spec.requires_pyarrow and importlib.util.find_spec("pyarrow") is None:
+        raise ValueError(f"The {export_format} export requires the pyarrow package")
+    return spec
+
+
+class _Drain(io.RawIOBase):
+    """Write-only file object whose contents are collected by `drain`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:  # type: ignore[override]
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema() -> "pa.Schema":
+    """Map the columns of the transaction table to Arrow types."""
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+    fields = []
+    for column in Transaction.__table__.c:
+        if isinstance(column.type, sa.Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, sa.Date):
+            arrow_type = pa.date32()
+        elif isinstance(column.type, sa.Numeric):
+            arrow_type = pa.decimal128(column.type.precision, column.type.scale)
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+
+def _csv_stream(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    columns = [column.name for column in Transaction.__table__.c]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n")
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _arrow_stream(batches: Iterable[List[Dict[str, Any]]], *, parquet: bool) -> Iterator[bytes]:
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+    schema = _arrow_schema()
+    sink = _Drain()
+    if parquet:
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    with writer:
+        for batch in batches:
+            # Each batch becomes one Parquet row group or one IPC message.
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_export(
+    batches: Iterable[List[Dict[str, Any]]], export_format: str
+) -> Iterator[bytes]:
+    """Encode transaction row batches as `export_format`, one chunk per batch.
+
+    Args:
+        batches (Iterable[List[Dict[str, Any]]]): Rows keyed by column name.
+        export_format (str): `csv`, `parquet` or `arrow` (Arrow IPC stream).
+
+    Returns:
+        Iterator[bytes]: The encoded file, in pieces.
+    """
+    if export_format == "csv":
+        return _csv_stream(batches)
+    return _arrow_stream(batches, parquet=export_format == "parquet")
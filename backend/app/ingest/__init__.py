@@ -0,0 +1,14 @@
+"""Helpers for turning uploaded bank exports into transaction records."""
+
+from .formats import (  # noqa: F401
+    KBC,
+    BankFormat,
+    detect_format,
+    get_format,
+    match_format,
+    register_format,
+    registered_formats,
+)
+from .mapping import map_transactions, missing_columns  # noqa: F401
+from .parallel import parse_uploads  # noqa: F401
+from .reader import iter_upload_chunks, read_upload  # noqa: F401
@@ -0,0 +1,197 @@
+"""
+Registry of the bank export formats that uploads are parsed with.
+
+Each `BankFormat` declares how one bank writes its exports: the column
+headers and the `Transaction` field each one maps to, the CSV delimiter,
+decimal and thousands separators, the date format and the text encoding.
+`detect_format` picks the registered format whose headers best match an
+upload by decoding only its first bytes and header line, so the file itself
+is parsed once, with explicit options, by pandas' C engine.
+
+Additional formats are added with `register_format`.
+"""
+
+import csv
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Fields of a mapped transaction record, in the order they are emitted.
+TRANSACTION_FIELDS = (
+    "account",
+    "booking_date",
+    "statement_number",
+    "transaction_number",
+    "counterparty_account",
+    "counterparty_name",
+    "street_number",
+    "postal_code_city",
+    "transaction_type",
+    "value_date",
+    "amount",
+    "currency",
+    "bic",
+    "country_code",
+    "notes",
+)
+
+# Fields every format has to provide.
+REQUIRED_FIELDS = frozenset({"account", "amount"})
+
+# How much of a CSV upload is decoded to find its header line.
+SNIFF_BYTES = 64 * 1024
+
+
+class BankFormat(NamedTuple):
+    """Parsing options for the exports of one bank.
+
+    Attributes:
+        name (str): Registry key.
+        columns (Dict[str, str]): Source column header -> `Transaction` field,
+            in export order. Every header is expected in an upload.
+        delimiter (str): CSV field delimiter.
+        decimal (str): Decimal separator of amounts.
+        thousands (str, optional): Thousands separator of amounts.
+        date_format (str): `strptime` format of date cells.
+        encoding (str): Text encoding of CSV files.
+    """
+
+    name: str
+    columns: Dict[str, str]
+    delimiter: str = ";"
+    decimal: str = "."
+    thousands: Optional[str] = None
+    date_format: str = "%d/%m/%Y"
+    encoding: str = "utf-8"
+
+
+_FORMATS: Dict[str, BankFormat] = {}
+
+
+def register_format(bank_format: BankFormat) -> BankFormat:
+    """Add `bank_format` to the registry, replacing any format of the same name.
+
+    Args:
+        bank_format (BankFormat): The format to register.
+
+    Returns:
+        BankFormat: The registered format.
+
+    Raises:
+        ValueError: If the format maps to unknown fields, maps a field twice
+            or lacks a required field.
+    """
+    fields = list(bank_format.columns.values())
+    unknown = sorted(set(fields) - set(TRANSACTION_FIELDS))
+    if unknown:
+        raise ValueError(f"Bank format {bank_format.name!r} maps unknown fields: {unknown}")
+    if len(set(fields)) != len(fields):
+        raise ValueError(f"Bank format {bank_format.name!r} maps a field more than once")
+    absent = sorted(REQUIRED_FIELDS - set(fields))
+    if absent:
+        raise ValueError(f"Bank format {bank_format.name!r} lacks required fields: {absent}")
+    _FORMATS[bank_format.name] = bank_format
+    return bank_format
+
+
+def get_format(name: str) -> BankFormat:
+    """Return the registered format called `name`.
+
+    Raises:
+        KeyError: If no such format is registered.
+    """
+    return _FORMATS[name]
+
+
+def registered_formats() -> List[BankFormat]:
+    """Return all registered formats in registration order."""
+    return list(_FORMATS.values())
+
+
+def _best_match(candidates: Iterable[Tuple[BankFormat, Set[str]]]) -> BankFormat:
+    """Return the format sharing the most headers with its candidate header set."""
+    best: Optional[BankFormat] = None
+    best_score = 0
+    for bank_format, headers in candidates:
+        score = sum(1 for header in bank_format.columns if header in headers)
+        if score > best_score:
+            best, best_score = bank_format, score
+    if best is None:
+        raise ValueError(
+            "Unrecognized bank export: the header matches none of the known formats "
+            f"({', '.join(_FORMATS)})"
+        )
+    return best
+
+
+def match_format(headers: Iterable[str]) -> BankFormat:
+    """Return the registered format sharing the most column headers with `headers`.
+
+    Ties go to the format registered first. The returned format is not
+    guaranteed to match completely; `missing_columns` reports the difference.
+
+    Args:
+        headers (Iterable[str]): Column headers of an upload.
+
+    Returns:
+        BankFormat: The best matching format.
+
+    Raises:
+        ValueError: If no registered format shares a single header.
+    """
+    present = {str(header) for header in headers}
+    return _best_match((bank_format, present) for bank_format in _FORMATS.values())
+
+
+def _header_line(head: bytes, bank_format: BankFormat) -> Set[str]:
+    """Split the first line of `head` as `bank_format` would write it."""
+    text = head.decode(bank_format.encoding, errors="replace").lstrip("\ufeff")
+    lines = text.splitlines()[:1]
+    return set(next(csv.reader(lines, delimiter=bank_format.delimiter), []))
+
+
+def detect_format(source: BinaryIO) -> BankFormat:
+    """Detect the format of a CSV upload from its first bytes.
+
+    The header line is split with every registered format's encoding and
+    delimiter, and the format sharing the most headers wins, ties going to
+    the one registered first. `source` is returned to its original position
+    afterwards.
+
+    Args:
+        source (BinaryIO): Seekable file-like object holding a CSV upload.
+
+    Returns:
+        BankFormat: The best matching format.
+
+    Raises:
+        ValueError: If no registered format shares a single header.
+    """
+    position = source.tell()
+    head = source.read(SNIFF_BYTES)
+    source.seek(position)
+    return _best_match(
+        (bank_format, _header_line(head, bank_format)) for bank_format in _FORMATS.values()
+    )
+
+
+KBC = register_format(
+    BankFormat(
+        name="kbc",
+        columns={
+            "Rekening": "account",
+            "Boekingsdatum": "booking_date",
+            "Rekeninguittrekselnummer": "statement_number",
+            "Transactienummer": "transaction_number",
+            "Rekening tegenpartij": "counterparty_account",
+            "Naam tegenpartij bevat": "counterparty_name",
+            "Straat en nummer": "street_number",
+            "Postcode en plaats": "postal_code_city",
+            "Transactie": "transaction_type",
+            "Valutadatum": "value_date",
+            "Bedrag": "amount",
+            "Devies": "currency",
+            "BIC": "bic",
+            "Landcode": "country_code",
+            "Mededelingen": "notes",
+        },
+    )
+)
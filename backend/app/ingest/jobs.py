@@ -0,0 +1,219 @@
+"""
+In-process background import jobs.
+
+Uploads submitted with `background=true` are spooled to a temporary file and
+handed to an `ImportQueue`, which ingests them on a bounded executor and keeps
+per-job progress in memory for the `/imports` API. The default executor is a
+thread pool; `InlineExecutor` runs each job synchronously on submission and
+serves as a stand-in for tests.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional
+
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.db.session import engine
+from app.ingest.pipeline import ingest_chunks
+from app.models.upload import ImportJob, UploadChunk
+
+logger = logging.getLogger(__name__)
+
+_FINISHED = ("succeeded", "failed")
+
+
+class ImportQueueFull(RuntimeError):
+    """Raised when no more import jobs can be accepted."""
+
+
+class InlineExecutor(Executor):
+    """Executor that runs each submitted callable immediately in the caller's thread."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            future.set_exception(e)
+        return future
+
+
+class ImportQueue:
+    """Runs import jobs on an executor and tracks their progress.
+
+    Args:
+        executor (Executor): Executor that runs the jobs.
+        max_active (int): Maximum number of queued plus running jobs.
+        max_retained (int): Finished jobs kept for status queries; older ones
+            are forgotten first.
+        chunksize (int): Rows per ingested chunk.
+    """
+
+    def __init__(
+        self, executor: Executor, *, max_active: int, max_retained: int, chunksize: int
+    ) -> None:
+        self._executor = executor
+        self._max_active = max_active
+        self._max_retained = max_retained
+        self._chunksize = chunksize
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, filename: str, *, owner_id: Optional[int] = None) -> ImportJob:
+        """Queue the spooled upload at `path` for ingestion.
+
+        The queue takes ownership of `path` and deletes it once the job ends,
+        or right away if the executor rejects the job.
+
+        Args:
+            path (str): Temporary file holding the uploaded bytes.
+            filename (str): Original file name, used to select the parser.
+            owner_id (int, optional): User whose accounts the rows are linked
+                to. Defaults to None.
+
+        Returns:
+            ImportJob: A snapshot of the job right after submission.
+
+        Raises:
+            ImportQueueFull: If `max_active` jobs are already queued or running.
+            RuntimeError: If the executor has been shut down.
+        """
+        job = ImportJob(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            created_at=datetime.now(timezone.utc),
+            owner_id=owner_id,
+        )
+        with self._lock:
+            active = sum(1 for queued in self._jobs.values() if queued.status not in _FINISHED)
+            if active >= self._max_active:
+                raise ImportQueueFull(f"Too many imports in progress ({active})")
+            self._jobs[job.id] = job
+            self._forget_finished()
+            snapshot = job.model_copy()
+        try:
+            self._executor.submit(self._run, job.id, path, filename, owner_id)
+        except BaseException:
+            # The job will never run (e.g. the executor was shut down).
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            os.unlink(path)
+            raise
+        # An inline executor has already finished the job at this point.
+        return self.get(job.id) or snapshot
+
+    def get(self, job_id: str, *, owner_id: Optional[int] = None) -> Optional[ImportJob]:
+        """Return a snapshot of the job with `job_id`, if it is still known.
+
+        With `owner_id`, jobs submitted by other users are reported as unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or (owner_id is not None and job.owner_id != owner_id):
+                return None
+            return job.model_copy()
+
+    def list(self, *, owner_id: Optional[int] = None) -> List[ImportJob]:
+        """Return snapshots of all known jobs, or those of `owner_id`, most recent first."""
+        with self._lock:
+            return [
+                job.model_copy()
+                for job in reversed(self._jobs.values())
+                if owner_id is None or job.owner_id == owner_id
+            ]
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the executor's workers."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _forget_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in _FINISHED]
+        for job_id in finished[: max(0, len(finished) - self._max_retained)]:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _refresh_throughput(job: ImportJob) -> None:
+        if job.started_at is None:
+            return
+        end = job.finished_at or datetime.now(timezone.utc)
+        elapsed = (end - job.started_at).total_seconds()
+        job.rows_per_second = round(job.rows_processed / elapsed, 1) if elapsed else None
+
+    def _update(self, job_id: str, **changes: Any) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            for name, value in changes.items():
+                setattr(job, name, value)
+            self._refresh_throughput(job)
+
+    def _record_chunk(self, job_id: str, chunk: UploadChunk) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            job.chunks += 1
+            job.rows_processed += chunk.rows
+            job.skipped_duplicates += chunk.skipped_duplicates
+            self._refresh_throughput(job)
+
+    def _run(self, job_id: str, path: str, filename: str, owner_id: Optional[int]) -> None:
+        self._update(job_id, status="running", started_at=datetime.now(timezone.utc))
+        try:
+            with Session(engine) as db, open(path, "rb") as source:
+                ingest_chunks(
+                    db,
+                    source,
+                    filename,
+                    chunksize=self._chunksize,
+                    on_chunk=lambda chunk: self._record_chunk(job_id, chunk),
+                    owner_id=owner_id,
+                )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.exception("Import job %s failed", job_id)
+            self._update(
+                job_id, status="failed", error=str(e), finished_at=datetime.now(timezone.utc)
+            )
+        else:
+            self._update(job_id, status="succeeded", finished_at=datetime.now(timezone.utc))
+        finally:
+            os.unlink(path)
+
+
+_queue: Optional[ImportQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_import_queue() -> ImportQueue:
+    """Return the process-wide import queue, creating it from `Settings` on first use."""
+    global _queue  # pylint: disable=global-statement
+    with _queue_lock:
+        if _queue is None:
+            settings = get_settings()
+            executor: Executor
+            if settings.import_backend == "inline":
+                executor = InlineExecutor()
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=settings.import_workers, thread_name_prefix="import"
+                )
+            _queue = ImportQueue(
+                executor,
+                max_active=settings.import_workers + settings.import_max_pending,
+                max_retained=settings.import_jobs_retained,
+                chunksize=settings.ingest_chunk_size,
+            )
+        return _queue
+
+
+def shutdown_import_queue() -> None:
+    """Shut down the import queue if it was ever created."""
+    global _queue  # pylint: disable=global-statement
+    with _queue_lock:
+        if _queue is not None:
+            _queue.shutdown()
+            _queue = None
@@ -0,0 +1,104 @@
+"""
+Column-wise mapping of parsed bank exports to `Transaction` records.
+
+Uploaded files use the column headers of their `BankFormat`. This module
+renames them to `Transaction` field names and converts each column in a
+single vectorized pass, so the cost per row is a dictionary construction
+rather than a `pd.isna`/`str` call per cell. Dates and amounts are parsed
+here, once, into `date` and `Decimal` values. pandas is imported on first use.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from app.ingest.formats import KBC, TRANSACTION_FIELDS, BankFormat
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Fields that are always stringified, even when the source cell is empty.
+REQUIRED_TEXT_FIELDS = frozenset({"account"})
+
+# Fields parsed into `datetime.date`.
+DATE_FIELDS = frozenset({"booking_date", "value_date"})
+
+
+def missing_columns(df: pd.DataFrame, bank_format: BankFormat = KBC) -> List[str]:
+    """Return the expected source columns that are absent from `df`.
+
+    Args:
+        df (pd.DataFrame): The parsed upload.
+        bank_format (BankFormat, optional): Format of the upload. Defaults to `KBC`.
+
+    Returns:
+        List[str]: Missing column headers, in export order.
+    """
+    return [col for col in bank_format.columns if col not in df.columns]
+
+
+def _text_column(series: pd.Series, *, nullable: bool) -> List[Any]:
+    """Convert a column to `str` values, mapping missing cells to `None`."""
+    # Going through `object` keeps scalars such as Timestamps intact, so the
+    # strings match what `str()` on the individual cell would produce.
+    strings = series.astype(object).map(str).to_numpy(dtype=object, copy=True)
+    if nullable:
+        strings[series.isna().to_numpy()] = None
+    return strings.tolist()
+
+
+def _date_column(series: pd.Series, date_format: str) -> List[Any]:
+    """Parse a column of `date_format` strings or timestamps into dates."""
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+    if pd.api.types.is_datetime64_any_dtype(series):
+        parsed = series
+    else:
+        parsed = pd.to_datetime(series, format=date_format)
+    dates = parsed.dt.date.to_numpy(dtype=object, copy=True)
+    dates[parsed.isna().to_numpy()] = None
+    return dates.tolist()
+
+
+def _amount_column(series: pd.Series) -> List[Decimal]:
+    """Convert a column of amounts to two-decimal `Decimal` values."""
+    amounts = series.astype(float)
+    if amounts.isna().any():
+        raise ValueError(f"Missing amount in {int(amounts.isna().sum())} row(s)")
+    return [Decimal(text) for text in amounts.map("{:.2f}".format)]
+
+
+def map_transactions(df: pd.DataFrame, bank_format: BankFormat = KBC) -> List[Dict[str, Any]]:
+    """Convert a parsed upload into plain `Transaction` column dictionaries.
+
+    Every record has all `TRANSACTION_FIELDS`, in that order; fields the
+    format does not provide are `None`. The result can be passed directly to
+    `app.crud.transaction.create_transactions`, also when it combines uploads
+    of different formats.
+
+    Args:
+        df (pd.DataFrame): The parsed upload containing all columns of `bank_format`.
+        bank_format (BankFormat, optional): Format of the upload. Defaults to `KBC`.
+
+    Returns:
+        List[Dict[str, Any]]: One record per row, keyed by `Transaction` field.
+
+    Raises:
+        ValueError: If an amount is missing or not numeric, or a date does not
+            match the format's `date_format`.
+    """
+    sources = {field: source for source, field in bank_format.columns.items()}
+    columns: List[List[Any]] = []
+    for field in TRANSACTION_FIELDS:
+        source = sources.get(field)
+        if source is None:
+            columns.append([None] * len(df))
+        elif field == "amount":
+            columns.append(_amount_column(df[source]))
+        elif field in DATE_FIELDS:
+            columns.append(_date_column(df[source], bank_format.date_format))
+        else:
+            columns.append(
+                _text_column(df[source], nullable=field not in REQUIRED_TEXT_FIELDS)
+            )
+    return [dict(zip(TRANSACTION_FIELDS, values)) for values in zip(*columns)]
@@ -0,0 +1,150 @@
+"""
+Parallel parsing of multi-file and multi-sheet uploads.
+
+Excel parsing is CPU-bound pure Python, so threads do not help. `parse_uploads`
+splits the work into one unit per CSV file or workbook sheet and maps every
+unit to transaction records in a process pool. The records are returned in
+input order so the caller can store them with a single bulk insert.
+
+The pool is created once per server process (see `get_parse_pool`) and
+shut down with the application, so uploads do not pay for starting workers.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+from app.ingest.mapping import map_transactions, missing_columns
+from app.ingest.pipeline import MissingColumnsError
+from app.ingest.reader import list_sheets, read_sheet
+
+# (path on disk, original file name)
+UploadSource = Tuple[str, str]
+
+
+def _label(filename: str, sheet: Optional[str]) -> str:
+    return filename if sheet is None else f"{filename}[{sheet}]"
+
+
+def _parse_unit(
+    path: str, filename: str, sheet: Optional[str], engine: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Parse and map one file or sheet; runs inside a worker process."""
+    try:
+        bank_format, df = read_sheet(path, filename, sheet, engine)
+        if bank_format is None:
+            # Blank sheets (cover pages, notes) hold no transactions.
+            return []
+        missing = missing_columns(df, bank_format)
+        if missing:
+            raise MissingColumnsError(missing)
+        return map_transactions(df, bank_format)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # Re-raised as a plain ValueError so it pickles back to the parent
+        # and names the file and sheet that failed.
+        raise ValueError(f"{_label(filename, sheet)}: {e}") from None
+
+
+def parse_uploads(
+    sources: Sequence[UploadSource],
+    *,
+    all_sheets: bool = True,
+    engine: Optional[str] = None,
+    pool: Optional[Executor] = None,
+) -> List[Dict[str, Any]]:
+    """Parse several uploaded files, and optionally every sheet of each workbook.
+
+    The units are spread over the workers of `pool`. A single unit, or every
+    unit when there is no pool, is parsed in the calling process.
+
+    The format of every file or sheet is detected separately, so one batch
+    may combine exports of different banks.
+
+    Args:
+        sources (Sequence[UploadSource]): Paths and original names of the files.
+        all_sheets (bool, optional): Read every sheet of a workbook instead of
+            only the first. Defaults to True.
+        engine (str, optional): pandas Excel engine, see `excel_engine`.
+        pool (Executor, optional): Process pool, usually `get_parse_pool()`.
+            Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: Records of all files and sheets, in input order.
+
+    Raises:
+        ValueError: If a file type is unsupported, or a file or sheet has an
+            unrecognized format, cannot be parsed or lacks expected columns.
+        BrokenProcessPool: If a worker of `pool` died; the pool is discarded.
+    """
+    units: List[Tuple[str, str, Optional[str], Optional[str]]] = []
+    for path, filename in sources:
+        try:
+            sheets = list_sheets(path, filename, engine)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            raise ValueError(f"{filename}: {e}") from None
+        if not all_sheets:
+            sheets = sheets[:1]
+        units.extend((path, filename, sheet, engine) for sheet in sheets)
+
+    if pool is None or len(units) <= 1:
+        results = [_parse_unit(*unit) for unit in units]
+    else:
+        try:
+            results = list(pool.map(_parse_unit, *zip(*units)))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for its memory use); later uploads
+            # get a fresh pool.
+            _discard_parse_pool(pool)
+            raise
+    return [record for records in results for record in records]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the process-wide parsing pool, creating it from `Settings` on first use.
+
+    Workers are started on demand through a fork server (or spawned where
+    that is unavailable) rather than forked from the multithreaded server,
+    which could copy locks held by other threads into them.
+
+    Returns:
+        Optional[ProcessPoolExecutor]: The pool, or `None` when
+        `Settings.parse_workers` allows a single process.
+    """
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is None:
+            workers = get_settings().parse_workers or os.cpu_count() or 1
+            if workers <= 1:
+                return None
+            method = (
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            )
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method)
+            )
+        return _pool
+
+
+def _discard_parse_pool(pool: Executor) -> None:
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_parse_pool() -> None:
+    """Shut down the parsing pool if it was ever created."""
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
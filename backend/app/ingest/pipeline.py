@@ -0,0 +1,118 @@
+"""
+Chunked ingestion of an uploaded file into the transaction table.
+
+`ingest_chunks` is shared by the upload endpoint and background import jobs:
+it reads, validates, maps, categorizes and inserts one chunk at a time inside
+a single database transaction, reporting progress after every chunk.
+"""
+
+import itertools
+from typing import BinaryIO, Callable, List, Optional
+
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.metrics import stage
+from app.crud.account import AccountResolver
+from app.crud.transaction import create_transactions
+from app.ingest.mapping import map_transactions, missing_columns
+from app.ingest.reader import excel_engine, iter_upload_chunks
+from app.ingest.rules import load_rule_matcher
+from app.models.upload import UploadChunk, UploadProgress
+
+
+class MissingColumnsError(ValueError):
+    """Raised when an uploaded file lacks some of the expected columns."""
+
+    def __init__(self, missing: List[str]) -> None:
+        super().__init__(f"Missing expected columns: {missing}")
+        self.missing = missing
+
+
+def ingest_chunks(
+    db: Session,
+    source: BinaryIO,
+    filename: str,
+    *,
+    chunksize: int,
+    on_chunk: Optional[Callable[[UploadChunk], None]] = None,
+    owner_id: Optional[int] = None,
+) -> UploadProgress:
+    """Validate and insert an upload chunk by chunk within one transaction.
+
+    New rows are categorized by the stored `CategoryRule`s, compiled once
+    for the whole upload, and linked to their `Account`, creating missing
+    accounts; resolved account numbers are cached across chunks. Rows
+    already stored are skipped. The transaction is committed after the last
+    chunk; if any chunk fails, nothing is committed.
+
+    Workbooks are read with the engine selected by `Settings.excel_engine`.
+    Time spent reading, validating, parsing and inserting chunks is recorded
+    as upload stages in `app.core.metrics`.
+
+    Args:
+        db (Session): Database session.
+        source (BinaryIO): Seekable file-like object positioned at the start
+            of the upload; its format is detected from the first bytes.
+        filename (str): Original file name, used to select the parser.
+        chunksize (int): Maximum number of rows per chunk.
+        on_chunk (Callable[[UploadChunk], None], optional): Called after each
+            chunk has been inserted (but before the commit).
+        owner_id (int, optional): User whose accounts the rows are linked
+            to, as for `AccountResolver`. Defaults to None.
+
+    Returns:
+        UploadProgress: Row counts and inserted ID ranges per chunk.
+
+    Raises:
+        MissingColumnsError: If a chunk lacks expected columns.
+        ValueError: If the file's format is not recognized, or the file cannot
+            be parsed or contains invalid values.
+    """
+    chunks: List[UploadChunk] = []
+    try:
+        matcher = load_rule_matcher(db, owner_id)
+        accounts = AccountResolver(owner_id)
+        with stage("read"):
+            bank_format, frames = iter_upload_chunks(
+                source, filename, chunksize, engine=excel_engine(get_settings().excel_engine)
+            )
+        for index in itertools.count():
+            with stage("read"):
+                df = next(frames, None)
+            if df is None:
+                break
+            with stage("validate"):
+                missing = missing_columns(df, bank_format)
+            if missing:
+                raise MissingColumnsError(missing)
+            with stage("parse"):
+                records = map_transactions(df, bank_format)
+            with stage("insert"):
+                matcher.apply(records)
+                accounts.apply(db, records)
+                ids = create_transactions(
+                    db, records=records, commit=False, skip_duplicates=True
+                )
+            inserted_ids = [transaction_id for transaction_id in ids if transaction_id is not None]
+            chunk = UploadChunk(
+                index=index,
+                rows=len(records),
+                skipped_duplicates=len(ids) - len(inserted_ids),
+                first_id=inserted_ids[0] if inserted_ids else None,
+                last_id=inserted_ids[-1] if inserted_ids else None,
+            )
+            chunks.append(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+        with stage("insert"):
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return UploadProgress(
+        filename=filename,
+        rows=sum(chunk.rows for chunk in chunks),
+        skipped_duplicates=sum(chunk.skipped_duplicates for chunk in chunks),
+        chunks=chunks,
+    )
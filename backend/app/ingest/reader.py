@@ -0,0 +1,197 @@
+"""
+Readers that turn an uploaded file into pandas DataFrames.
+
+`read_upload` parses a whole file at once. `iter_upload_chunks` yields
+fixed-size DataFrames so callers can process arbitrarily large CSV exports
+with bounded memory. `list_sheets` and `read_sheet` address the individual
+sheets of a workbook stored on disk.
+
+Every reader also returns the `BankFormat` of the upload. CSV files are
+sniffed before parsing and then read by pandas' C engine with the format's
+delimiter, separators and encoding, only its columns and explicit dtypes.
+Workbooks store typed cells, so their format is matched on the parsed header.
+
+pandas (and through it openpyxl) is imported on the first upload rather than
+with the application, which keeps worker start-up fast.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from app.ingest.formats import BankFormat, detect_format, match_format
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def check_file_type(filename: str) -> None:
+    """Raise `ValueError` unless `filename` has a supported extension."""
+    if not filename.endswith((".csv", ".xls", ".xlsx")):
+        raise ValueError("Unsupported file type: must be .csv, .xls, or .xlsx")
+
+
+def _csv_options(bank_format: BankFormat) -> Dict[str, Any]:
+    """Build the `pd.read_csv` arguments for a CSV export in `bank_format`."""
+    columns = bank_format.columns
+    return {
+        "engine": "c",
+        "sep": bank_format.delimiter,
+        "decimal": bank_format.decimal,
+        "thousands": bank_format.thousands,
+        "encoding": bank_format.encoding,
+        # A callable skips unknown columns without failing on missing ones,
+        # which `missing_columns` reports instead.
+        "usecols": lambda header: header in columns,
+        # Text columns are read as `str` so that type inference cannot alter
+        # them (account numbers losing leading zeros) or differ between
+        # chunks (an integer column turning into floats in the one chunk that
+        # contains an empty cell). Amounts are parsed to floats by the parser.
+        "dtype": {
+            header: "float64" if field == "amount" else str for header, field in columns.items()
+        },
+    }
+
+
+def read_upload(
+    source: BinaryIO, filename: str, engine: Optional[str] = None
+) -> Tuple[BankFormat, pd.DataFrame]:
+    """Parse an entire uploaded file into a DataFrame.
+
+    Args:
+        source (BinaryIO): Seekable file-like object positioned at the start
+            of the upload.
+        filename (str): Original file name, used to select the parser.
+        engine (str, optional): pandas Excel engine, see `excel_engine`.
+
+    Returns:
+        Tuple[BankFormat, pd.DataFrame]: The detected format and the parsed rows.
+
+    Raises:
+        ValueError: If the file type is unsupported, the format is not
+            recognized or the file cannot be parsed.
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    check_file_type(filename)
+    if filename.endswith(".csv"):
+        bank_format = detect_format(source)
+        return bank_format, pd.read_csv(source, **_csv_options(bank_format))
+    df = pd.read_excel(source, engine=engine)
+    return match_format(df.columns), df
+
+
+def iter_upload_chunks(
+    source: BinaryIO, filename: str, chunksize: int, engine: Optional[str] = None
+) -> Tuple[BankFormat, Iterator[pd.DataFrame]]:
+    """Detect the format of an upload and iterate over it in chunks of rows.
+
+    CSV files are read incrementally from `source`, so only one chunk is held
+    in memory at a time. Excel workbooks cannot be parsed incrementally; they
+    are read whole and then sliced.
+
+    Args:
+        source (BinaryIO): Seekable file-like object positioned at the start
+            of the upload.
+        filename (str): Original file name, used to select the parser.
+        chunksize (int): Maximum number of rows per yielded DataFrame.
+        engine (str, optional): pandas Excel engine, see `excel_engine`.
+
+    Returns:
+        Tuple[BankFormat, Iterator[pd.DataFrame]]: The detected format and an
+        iterator over consecutive DataFrames of at most `chunksize` rows.
+
+    Raises:
+        ValueError: If the file type is unsupported or the format is not
+            recognized. Parse errors are raised while iterating.
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    check_file_type(filename)
+    if filename.endswith(".csv"):
+        bank_format = detect_format(source)
+        return bank_format, _iter_csv_chunks(source, bank_format, chunksize)
+    df = pd.read_excel(source, engine=engine)
+    return match_format(df.columns), (
+        df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize)
+    )
+
+
+def _iter_csv_chunks(
+    source: BinaryIO, bank_format: BankFormat, chunksize: int
+) -> Iterator[pd.DataFrame]:
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    with pd.read_csv(source, chunksize=chunksize, **_csv_options(bank_format)) as reader:
+        yield from reader
+
+
+def excel_engine(preference: str) -> Optional[str]:
+    """Resolve the `Settings.excel_engine` preference to a pandas engine name.
+
+    Args:
+        preference (str): `auto`, `openpyxl` or `calamine`.
+
+    Returns:
+        Optional[str]: The engine to pass to pandas, or `None` to let pandas
+        choose by file format.
+    """
+    if preference != "auto":
+        return preference
+    return "calamine" if importlib.util.find_spec("python_calamine") else None
+
+
+def list_sheets(path: str, filename: str, engine: Optional[str] = None) -> List[Union[str, None]]:
+    """Return the sheet names of a workbook, or `[None]` for a CSV file.
+
+    Args:
+        path (str): Location of the uploaded file on disk.
+        filename (str): Original file name, used to select the parser.
+        engine (str, optional): pandas Excel engine.
+
+    Returns:
+        List[Optional[str]]: Sheet names in workbook order.
+
+    Raises:
+        ValueError: If the file type is unsupported.
+    """
+    check_file_type(filename)
+    if filename.endswith(".csv"):
+        return [None]
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    with pd.ExcelFile(path, engine=engine) as workbook:
+        return [str(name) for name in workbook.sheet_names]
+
+
+def read_sheet(
+    path: str, filename: str, sheet: Optional[str], engine: Optional[str] = None
+) -> Tuple[Optional[BankFormat], pd.DataFrame]:
+    """Parse one sheet of a workbook, or a whole CSV file, from disk.
+
+    Args:
+        path (str): Location of the uploaded file on disk.
+        filename (str): Original file name, used to select the parser.
+        sheet (str, optional): Sheet name as returned by `list_sheets`.
+        engine (str, optional): pandas Excel engine.
+
+    Returns:
+        Tuple[Optional[BankFormat], pd.DataFrame]: The detected format and
+        the parsed rows. The format is `None` for a blank sheet.
+
+    Raises:
+        ValueError: If the file type is unsupported, the format is not
+            recognized or the file cannot be parsed.
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    check_file_type(filename)
+    if filename.endswith(".csv"):
+        with open(path, "rb") as handle:
+            bank_format = detect_format(handle)
+        return bank_format, pd.read_csv(path, **_csv_options(bank_format))
+    df = pd.read_excel(path, sheet_name=sheet, engine=engine)
+    if df.columns.empty:
+        return None, df
+    return match_format(df.columns), df
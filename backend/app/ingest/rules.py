@@ -0,0 +1,187 @@
+"""
+Compiled matcher for categorization rules.
+
+`RuleMatcher` turns the stored `CategoryRule` rows into lookup structures so
+that a batch of records is categorized with a few regex scans and dictionary
+probes per record instead of evaluating every rule against every record:
+
+* all counterparty name patterns (and, separately, all notes patterns) are
+  combined into one regex that reports every pattern occurring in a text;
+* counterparty IBANs are looked up in a dictionary;
+* only rules with a hit, plus rules that have no text condition at all, are
+  then checked in priority order.
+"""
+
+import re
+from collections import defaultdict
+from decimal import Decimal
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from sqlmodel import Session, select
+
+from app.models.rule import CategoryRule
+
+_TEXT_FIELDS = ("counterparty_name", "notes")
+
+
+def normalize_iban(value: str) -> str:
+    """Return `value` without whitespace and in upper case."""
+    return "".join(value.split()).upper()
+
+
+class _PatternSet:
+    """Finds every literal pattern that occurs in a text with a single regex.
+
+    The alternation sits in a lookahead, so the scan tries every start
+    position; alternatives are ordered longest first, and the shorter patterns
+    that are prefixes of a hit are added from a precomputed table.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        unique = sorted(set(patterns), key=len, reverse=True)
+        self._regex = (
+            re.compile("(?=(" + "|".join(map(re.escape, unique)) + "))") if unique else None
+        )
+        self._prefixes = {
+            pattern: [other for other in unique if pattern.startswith(other)]
+            for pattern in unique
+        }
+
+    def search(self, text: Optional[str]) -> Set[str]:
+        found: Set[str] = set()
+        if self._regex is None or not text:
+            return found
+        for match in self._regex.finditer(text.casefold()):
+            found.update(self._prefixes[match.group(1)])
+        return found
+
+
+class _Rule(NamedTuple):
+    category_id: int
+    texts: Dict[str, str]
+    iban: Optional[str]
+    amount_min: Optional[Decimal]
+    amount_max: Optional[Decimal]
+
+
+class RuleMatcher:
+    """Categorizes transaction records with a fixed set of rules.
+
+    Args:
+        rules (Iterable[CategoryRule]): The rules to compile.
+    """
+
+    def __init__(self, rules: Iterable[CategoryRule]) -> None:
+        ordered = sorted(rules, key=lambda rule: (rule.priority, rule.id or 0))
+        self._rules: List[_Rule] = []
+        by_pattern: Dict[str, Dict[str, List[int]]] = {
+            field: defaultdict(list) for field in _TEXT_FIELDS
+        }
+        self._by_iban: Dict[str, List[int]] = defaultdict(list)
+        self._unindexed: List[int] = []
+        for rank, rule in enumerate(ordered):
+            texts = {
+                field: getattr(rule, field).casefold()
+                for field in _TEXT_FIELDS
+                if getattr(rule, field)
+            }
+            iban = normalize_iban(rule.counterparty_account) if rule.counterparty_account else None
+            self._rules.append(
+                _Rule(rule.category_id, texts, iban, rule.amount_min, rule.amount_max)
+            )
+            for field, pattern in texts.items():
+                by_pattern[field][pattern].append(rank)
+            if iban:
+                self._by_iban[iban].append(rank)
+            if not texts and not iban:
+                self._unindexed.append(rank)
+        self._by_pattern = by_pattern
+        self._patterns = {field: _PatternSet(by_pattern[field]) for field in _TEXT_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def match(self, record: Mapping[str, Any]) -> Optional[int]:
+        """Return the category of the first rule matching `record`, if any.
+
+        Args:
+            record (Mapping[str, Any]): Transaction column values.
+
+        Returns:
+            Optional[int]: The category ID, or `None` when no rule matches.
+        """
+        hits = {field: self._patterns[field].search(record.get(field)) for field in _TEXT_FIELDS}
+        candidates = set(self._unindexed)
+        for field, patterns in hits.items():
+            for pattern in patterns:
+                candidates.update(self._by_pattern[field][pattern])
+        counterparty = record.get("counterparty_account")
+        iban = normalize_iban(counterparty) if counterparty else None
+        if iban:
+            candidates.update(self._by_iban.get(iban, ()))
+
+        amount = record.get("amount")
+        for rank in sorted(candidates):
+            rule = self._rules[rank]
+            if any(pattern not in hits[field] for field, pattern in rule.texts.items()):
+                continue
+            if rule.iban is not None and rule.iban != iban:
+                continue
+            if rule.amount_min is not None and (amount is None or amount < rule.amount_min):
+                continue
+            if rule.amount_max is not None and (amount is None or amount > rule.amount_max):
+                continue
+            return rule.category_id
+        return None
+
+    def apply(self, records: Iterable[MutableMapping[str, Any]], *, overwrite: bool = False) -> int:
+        """Set `category_id` on each record that a rule matches.
+
+        Every record ends up with a `category_id` key, so the batch can be
+        passed to a single executemany `INSERT`.
+
+        Args:
+            records (Iterable[MutableMapping[str, Any]]): Records to update in place.
+            overwrite (bool, optional): Also replace categories that are
+                already set. Defaults to False.
+
+        Returns:
+            int: Number of records whose category changed.
+        """
+        assigned = 0
+        for record in records:
+            current = record.get("category_id")
+            category_id = None
+            if self._rules and (overwrite or current is None):
+                category_id = self.match(record)
+            if category_id is not None and category_id != current:
+                assigned += 1
+            record["category_id"] = category_id if category_id is not None else current
+        return assigned
+
+
+def load_rule_matcher(db: Session, owner_id: Optional[int] = None) -> RuleMatcher:
+    """Compile the stored categorization rules.
+
+    Args:
+        db (Session): A database session.
+        owner_id (int, optional): Only compile this user's rules. Defaults to
+            None, which compiles all of them.
+
+    Returns:
+        RuleMatcher: A matcher over the selected `CategoryRule`s.
+    """
+    statement = select(CategoryRule)
+    if owner_id is not None:
+        statement = statement.where(CategoryRule.user_id == owner_id)
+    return RuleMatcher(db.exec(statement).all())
@@ -7,12 +7,28 @@ to avoid circular imports and to allow the `app` instance to be
 imported from `app.__init__`.
 """
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.routing import APIRouter
 
-from app.api.endpoints import transactions
+from app.api.caching import ReadCacheMiddleware
+from app.api.deps import get_current_user
+from app.api.endpoints import (
+    auth,
+    budgets,
+    categories,
+    imports,
+    metrics,
+    reports,
+    rules,
+    transactions,
+)
+from app.api.timing import TimingMiddleware
+from app.core.config import get_settings
 from app.version import get_version
 from app.db.init_db import init_db
+from app.db.session import dispose_async_engine
+from app.ingest.jobs import shutdown_import_queue
+from app.ingest.parallel import get_parse_pool, shutdown_parse_pool
 
 
 def create_app() -> FastAPI:
@@ -20,7 +36,13 @@ def create_app() -> FastAPI:
 
     Returns:
         FastAPI: The configured FastAPI application.
+
+    Raises:
+        RuntimeError: If authentication is enabled without a secret key.
     """
+    settings = get_settings()
+    if settings.auth_enabled and not settings.secret_key:
+        raise RuntimeError("SECRET_KEY must be set when AUTH_ENABLED is on")
     application = FastAPI(title="BudgetWise API", version=get_version())
 
     @application.on_event("startup")
@@ -28,18 +50,85 @@ def create_app() -> FastAPI:
         """Initialize resources on application startup.
 
         This function will create database tables if they do not already
-        exist. Alembic should be used for migrations when the schema
-        changes; this is purely for initial bootstrap.
+        exist, unless `Settings.init_db_on_startup` is off. Alembic should be
+        used for migrations when the schema changes; this is purely for
+        initial bootstrap. The pool parsing multi-file uploads is created
+        here too; its workers start with the first such upload.
         """
 
-        init_db()
-
-    # Register routers with prefixes and tags
+        if settings.init_db_on_startup:
+            init_db()
+        get_parse_pool()
+
+    @application.on_event("shutdown")
+    async def on_shutdown() -> None:
+        """Release the background workers and the asyncio engine's connections."""
+        shutdown_import_queue()
+        shutdown_parse_pool()
+        await dispose_async_engine()
+
+    if settings.http_cache:
+        # Background import status lives in memory, not in the database, so
+        # `/imports` is not covered by the data version. Budget status
+        # reports today's period by default, which changes without a write.
+        application.add_middleware(
+            ReadCacheMiddleware,
+            paths=("/transactions", "/reports", "/categories", "/rules", "/budgets"),
+            excluded_paths=("/budgets/status",),
+            version_ttl=settings.data_version_ttl,
+            cache_size=settings.response_cache_size,
+            cache_ttl=settings.response_cache_ttl,
+            secret_key=settings.secret_key if settings.auth_enabled else None,
+        )
+
+    if settings.metrics_enabled:
+        # Added last so it wraps the cache middleware and times 304s too.
+        application.add_middleware(TimingMiddleware)
+        application.include_router(metrics, tags=["meta"])
+
+    # Register routers with prefixes and tags. Routes that are not scoped to
+    # the caller's accounts still require a valid token when auth is on.
+    authenticated = [Depends(get_current_user)] if settings.auth_enabled else []
+    if settings.auth_enabled:
+        application.include_router(
+            auth,
+            prefix="/auth",
+            tags=["auth"],
+        )
     application.include_router(
         transactions,
         prefix="/transactions",
         tags=["transactions"],
     )
+    application.include_router(
+        reports,
+        prefix="/reports",
+        tags=["reports"],
+        dependencies=authenticated,
+    )
+    application.include_router(
+        categories,
+        prefix="/categories",
+        tags=["categories"],
+        dependencies=authenticated,
+    )
+    application.include_router(
+        rules,
+        prefix="/rules",
+        tags=["rules"],
+        dependencies=authenticated,
+    )
+    application.include_router(
+        budgets,
+        prefix="/budgets",
+        tags=["budgets"],
+        dependencies=authenticated,
+    )
+    application.include_router(
+        imports,
+        prefix="/imports",
+        tags=["imports"],
+    )
 
     # Lightweight version endpoint
     version_router = APIRouter()
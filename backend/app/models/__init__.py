@@ -1,6 +1,23 @@
 """Import all SQLModel models for Alembic autogeneration."""
 
-from .transaction import Transaction, TransactionBase  # noqa: F401
+from .transaction import (  # noqa: F401
+    Transaction,
+    TransactionBase,
+    TransactionFilter,
+    TransactionPage,
+)
 from .category import Category, CategoryBase  # noqa: F401
-from .user import User, UserBase  # noqa: F401
-from .account import Account, AccountBase  # noqa: F401
\ No newline at end of file
+from .user import AccessToken, User, UserBase  # noqa: F401
+from .account import Account, AccountBase  # noqa: F401
+from .upload import ImportJob, UploadChunk, UploadProgress, UploadSummary  # noqa: F401
+from .rollup import SpendingSummary, TransactionRollup  # noqa: F401
+from .rule import CategoryRule, CategoryRuleBase, RecategorizeResult  # noqa: F401
+from .version import DataVersion  # noqa: F401
+from .budget import (  # noqa: F401
+    Budget,
+    BudgetBase,
+    BudgetSpending,
+    BudgetStatus,
+    BudgetUpdate,
+)
+from .recurring import RecurringPayment  # noqa: F401
@@ -5,10 +5,9 @@ An account belongs to a user and can have many transactions. This model can be
 extended to include additional metadata such as bank name or IBAN.
 """
 
-from __future__ import annotations
-
 from typing import List, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -24,8 +23,22 @@ class AccountBase(SQLModel):
 class Account(AccountBase, table=True):
     """Database model representing a bank account."""
 
+    # A user has at most one account per number, and so do accounts without
+    # an owner, which NULLs in a unique index would not enforce.
+    __table_args__ = (
+        Index("ix_account_user_id_number", "user_id", "number", unique=True),
+        Index(
+            "ix_account_number_unowned",
+            "number",
+            unique=True,
+            sqlite_where=text("user_id IS NULL"),
+            postgresql_where=text("user_id IS NULL"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    # Owner; with authentication on, only the owner sees the account's transactions.
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
     # Relationships
     user: Optional["User"] = Relationship(back_populates="accounts")
     # A one-to-many relationship to `Transaction`. The corresponding attribute on
@@ -0,0 +1,98 @@
+"""
+SQLModel definitions for category budgets.
+
+A budget caps the net spending of one category per calendar month or year.
+A budget with an owner only counts the transactions of the owner's accounts.
+What each budget has consumed is kept per period in `BudgetSpending`, which
+is adjusted together with the `TransactionRollup` buckets whenever
+transactions are inserted or recategorized, so the status of every budget is
+read without touching the transaction table.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import field_serializer
+from sqlalchemy import Index, text
+from sqlmodel import Field, SQLModel
+
+# Supported budget periods: calendar months and calendar years.
+BUDGET_PERIODS = ("month", "year")
+
+
+class BudgetBase(SQLModel):
+    """Shared attributes for budgets."""
+
+    category_id: int = Field(foreign_key="category.id", index=True)
+    # One of `BUDGET_PERIODS`.
+    period: str = "month"
+    # Spending allowed per period, as a positive amount.
+    amount: Decimal = Field(max_digits=14, decimal_places=2)
+
+    @field_serializer("amount", when_used="json")
+    def _serialize_amount(self, amount: Decimal) -> float:
+        return float(amount)
+
+
+class Budget(BudgetBase, table=True):
+    """Database model for a budget. A user has at most one per category and period."""
+
+    # Budgets without an owner are unique per category and period as well,
+    # which NULLs in a unique index would not enforce.
+    __table_args__ = (
+        Index("ix_budget_user_id_category_period", "user_id", "category_id", "period", unique=True),
+        Index(
+            "ix_budget_category_period_unowned",
+            "category_id",
+            "period",
+            unique=True,
+            sqlite_where=text("user_id IS NULL"),
+            postgresql_where=text("user_id IS NULL"),
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Owner; `None` for budgets created without authentication, which count
+    # the transactions of every account.
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
+
+
+class BudgetUpdate(SQLModel):
+    """Changes accepted for an existing budget."""
+
+    amount: Decimal = Field(max_digits=14, decimal_places=2)
+
+
+class BudgetSpending(SQLModel, table=True):
+    """Consumption of one budget in one period."""
+
+    __table_args__ = (
+        Index("ix_budgetspending_period", "budget_id", "period_start", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    budget_id: int = Field(foreign_key="budget.id", ondelete="CASCADE")
+    # First day of the month or year.
+    period_start: date
+    transaction_count: int = 0
+    # Net outflow of the category: expenses minus refunds and other income.
+    spent: Decimal = Field(default=Decimal("0"), max_digits=16, decimal_places=2)
+
+
+class BudgetStatus(SQLModel):
+    """A budget with its consumption in the period containing a given day."""
+
+    budget_id: int
+    category_id: int
+    period: str
+    period_start: date
+    amount: Decimal
+    transaction_count: int
+    spent: Decimal
+    # `amount - spent`; negative once the budget is exceeded.
+    remaining: Decimal
+
+    @field_serializer("amount", "spent", "remaining", when_used="json")
+    def _serialize_amounts(self, amount: Decimal) -> float:
+        return float(amount)
@@ -7,8 +7,6 @@ primary key and a unique name. The relationship to `Transaction` is
 defined via the `transactions` attribute.
 """
 
-from __future__ import annotations
-
 from typing import List, Optional
 
 from sqlmodel import Field, Relationship, SQLModel
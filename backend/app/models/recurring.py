@@ -0,0 +1,37 @@
+"""
+Response models for the recurring-payment analysis.
+
+A recurring payment is a series of transactions between one account and one
+counterparty, in one direction, whose booking dates follow a regular cadence
+and whose amounts stay close to their average.
+"""
+
+from datetime import date
+from typing import Optional
+
+from sqlmodel import SQLModel
+
+
+class RecurringPayment(SQLModel):
+    """A detected series of regular payments or receipts."""
+
+    # Raw account number, as stored on `Transaction.account`.
+    account: str
+    # Most recent counterparty account and name seen in the series.
+    counterparty_account: Optional[str] = None
+    counterparty_name: Optional[str] = None
+    # `weekly`, `biweekly`, `monthly`, `quarterly` or `yearly`.
+    cadence: str
+    # Median number of days between consecutive bookings.
+    interval_days: float
+    occurrences: int
+    # Mean amount; negative for payments, positive for receipts.
+    average_amount: float
+    # Standard deviation of the amounts relative to the mean's magnitude.
+    amount_variation: float
+    # Fraction of intervals that match the cadence.
+    regularity: float
+    first_date: date
+    last_date: date
+    # `last_date` plus the median interval.
+    next_expected: date
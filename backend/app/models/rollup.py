@@ -0,0 +1,66 @@
+"""
+SQLModel definitions for pre-aggregated transaction totals.
+
+`TransactionRollup` holds one row per (month, account, category) bucket and
+is updated incrementally as transactions are inserted, so spending reports
+read a handful of buckets instead of scanning every transaction. Buckets are
+keyed by the linked `Account`, so two users' accounts with the same number
+never share one.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import field_serializer
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+# `category_id` value used for transactions without a category. The rollup
+# key must not contain NULLs, which never compare equal in a unique index.
+UNCATEGORIZED = 0
+# `account_id` value used for transactions not linked to an account yet (see
+# `backfill-accounts`), for the same reason.
+UNLINKED = 0
+
+
+class TransactionRollup(SQLModel, table=True):
+    """Totals of the transactions booked in one month, account and category."""
+
+    __table_args__ = (
+        Index("ix_transactionrollup_bucket", "month", "account_id", "category_id", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # First day of the booking month.
+    month: date
+    # Account of the bucket, or `UNLINKED`.
+    account_id: int = UNLINKED
+    # Category of the bucket, or `UNCATEGORIZED`.
+    category_id: int = UNCATEGORIZED
+    transaction_count: int = 0
+    # Sum of positive amounts.
+    income: Decimal = Field(default=Decimal("0"), max_digits=16, decimal_places=2)
+    # Sum of negative amounts (zero or negative).
+    expenses: Decimal = Field(default=Decimal("0"), max_digits=16, decimal_places=2)
+
+
+class SpendingSummary(SQLModel):
+    """Aggregated totals for one group of rollup buckets."""
+
+    # Grouping keys; `None` when the report is not grouped by that key. A
+    # `category_id` of `UNCATEGORIZED` (0) groups transactions without one.
+    month: Optional[date] = None
+    account_id: Optional[int] = None
+    # Number of the account, reported with `account_id`.
+    account: Optional[str] = None
+    category_id: Optional[int] = None
+    transaction_count: int
+    income: Decimal
+    expenses: Decimal
+    # `income + expenses`.
+    net: Decimal
+
+    @field_serializer("income", "expenses", "net", when_used="json")
+    def _serialize_amount(self, amount: Decimal) -> float:
+        return float(amount)
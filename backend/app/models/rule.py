@@ -0,0 +1,53 @@
+"""
+SQLModel definitions for categorization rules.
+
+A rule assigns its category to every transaction that satisfies all of the
+rule's conditions. Text conditions are case-insensitive substrings of the
+counterparty name or the notes, the counterparty account must match exactly
+(ignoring spaces and case), and the amount range is inclusive. When several
+rules match, the one with the lowest `priority` (then the lowest ID) wins.
+Uploads and recategorizations on behalf of a user only apply that user's rules.
+"""
+
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import field_serializer
+from sqlmodel import Field, SQLModel
+
+
+class CategoryRuleBase(SQLModel):
+    """Shared attributes for categorization rules."""
+
+    # Category assigned to matching transactions.
+    category_id: int = Field(foreign_key="category.id", index=True)
+    # Case-insensitive substring of the counterparty name.
+    counterparty_name: Optional[str] = None
+    # Counterparty IBAN, compared without spaces and case.
+    counterparty_account: Optional[str] = None
+    # Case-insensitive substring of the free-form notes.
+    notes: Optional[str] = None
+    # Inclusive amount range; expenses are negative.
+    amount_min: Optional[Decimal] = Field(default=None, max_digits=14, decimal_places=2)
+    amount_max: Optional[Decimal] = Field(default=None, max_digits=14, decimal_places=2)
+    # Lower values are tried first.
+    priority: int = 100
+
+    @field_serializer("amount_min", "amount_max", when_used="json")
+    def _serialize_amounts(self, amount: Optional[Decimal]) -> Optional[float]:
+        return float(amount) if amount is not None else None
+
+
+class CategoryRule(CategoryRuleBase, table=True):
+    """Database model for a categorization rule."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Owner; `None` for rules created without authentication.
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
+
+
+class RecategorizeResult(SQLModel):
+    """Outcome of rerunning the rules over stored transactions."""
+
+    scanned: int
+    updated: int
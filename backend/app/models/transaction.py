@@ -6,20 +6,28 @@ includes optional fields for data that may not always be present. The primary
 key `id` is an auto‑incrementing integer.
 """
 
-from __future__ import annotations
-
-from typing import Optional
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
 
+from pydantic import field_serializer
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 
+# Columns that identify a transaction within a bank export. Re-uploading an
+# overlapping export produces rows with the same natural key, which are
+# skipped on ingest. The key uses the linked account rather than the raw
+# number, so users with accounts of the same number never clash.
+NATURAL_KEY = ("account_id", "statement_number", "transaction_number")
+
 
 class TransactionBase(SQLModel):
     """Shared attributes for transactions that can be inherited by other models."""
 
     # Raw account number to which this transaction belongs ("Rekening").
     account: str
-    # Original booking date ("Boekingsdatum"). Could be converted to date.
-    booking_date: Optional[str] = None
+    # Booking date ("Boekingsdatum"), parsed once at ingest.
+    booking_date: Optional[date] = Field(default=None, index=True)
     # Statement number ("Rekeninguittrekselnummer").
     statement_number: Optional[str] = None
     # Unique transaction number ("Transactienummer").
@@ -34,10 +42,10 @@ class TransactionBase(SQLModel):
     postal_code_city: Optional[str] = None
     # Transaction description ("Transactie").
     transaction_type: Optional[str] = None
-    # Value date ("Valutadatum"). Could be converted to date.
-    value_date: Optional[str] = None
+    # Value date ("Valutadatum"), parsed once at ingest.
+    value_date: Optional[date] = None
     # Amount ("Bedrag"). Negative values represent expenses.
-    amount: float
+    amount: Decimal = Field(max_digits=14, decimal_places=2)
     # Currency code ("Devies").
     currency: Optional[str] = None
     # BIC code of the counterparty ("BIC").
@@ -52,14 +60,75 @@ class TransactionBase(SQLModel):
     # transactions can be ingested before accounts are defined.
     account_id: Optional[int] = Field(default=None, foreign_key="account.id")
 
+    @field_serializer("amount", when_used="json")
+    def _serialize_amount(self, amount: Decimal) -> float:
+        # Keep amounts as JSON numbers rather than Pydantic's default strings.
+        return float(amount)
+
 
 class Transaction(TransactionBase, table=True):
     """Database model for a transaction including an auto‑incrementing primary key."""
 
+    # Rows with a NULL in any natural key column never conflict, so exports
+    # lacking statement or transaction numbers, and rows not linked to an
+    # account, are always inserted. The other indexes back the list filters;
+    # the trigram indexes serve substring searches and only exist on
+    # PostgreSQL (SQLite scans with LIKE). The indexes led by `account_id`
+    # serve queries scoped to a user's accounts.
+    __table_args__ = (
+        Index("ix_transaction_natural_key", *NATURAL_KEY, unique=True),
+        Index("ix_transaction_account_id_id", "account_id", "id"),
+        Index("ix_transaction_account_id_booking_date", "account_id", "booking_date"),
+        Index("ix_transaction_account_booking_date", "account", "booking_date"),
+        Index("ix_transaction_category_booking_date", "category_id", "booking_date"),
+        Index("ix_transaction_amount", "amount"),
+        Index(
+            "ix_transaction_notes_trgm",
+            "notes",
+            postgresql_using="gin",
+            postgresql_ops={"notes": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_transaction_counterparty_name_trgm",
+            "counterparty_name",
+            postgresql_using="gin",
+            postgresql_ops={"counterparty_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     # Relationship to Category. The annotation string prevents circular import issues.
     category: Optional["Category"] = Relationship(back_populates="transactions")
     # Relationship to Account. Allows navigating from a transaction to its account. The attribute
     # name `account_ref` is used instead of `account` to avoid clashing with the `account`
     # column defined in `TransactionBase`.
-    account_ref: Optional["Account"] = Relationship(back_populates="transactions")
\ No newline at end of file
+    account_ref: Optional["Account"] = Relationship(back_populates="transactions")
+
+
+class TransactionFilter(SQLModel):
+    """Optional criteria for narrowing a transaction listing.
+
+    Every field left as `None` is ignored; the others are combined with AND.
+    """
+
+    # Exact raw account number ("Rekening").
+    account: Optional[str] = None
+    # Inclusive booking date range.
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    # Inclusive amount range.
+    amount_min: Optional[Decimal] = None
+    amount_max: Optional[Decimal] = None
+    category_id: Optional[int] = None
+    # Case-insensitive substring of the counterparty name.
+    counterparty: Optional[str] = None
+    # Case-insensitive substring of the free-form notes.
+    q: Optional[str] = None
+
+
+class TransactionPage(SQLModel):
+    """One page of transactions returned by cursor pagination."""
+
+    items: List[Transaction]
+    # Opaque cursor for the following page; `None` on the last page.
+    next_cursor: Optional[str] = None
@@ -0,0 +1,73 @@
+"""
+Response models describing the outcome of a transaction upload.
+
+These are plain (non-table) SQLModel classes used by the upload endpoint
+when it reports progress instead of echoing every persisted row, and by the
+import job API.
+"""
+
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class UploadChunk(SQLModel):
+    """Rows persisted from one chunk of an uploaded file."""
+
+    # Zero-based position of the chunk within the file.
+    index: int
+    rows: int
+    # Rows not written because they were already stored.
+    skipped_duplicates: int = 0
+    # Primary keys of the first and last row inserted from this chunk, when
+    # the database reports them.
+    first_id: Optional[int] = None
+    last_id: Optional[int] = None
+
+
+class UploadProgress(SQLModel):
+    """Per-chunk summary of a chunked upload."""
+
+    filename: str
+    rows: int
+    skipped_duplicates: int = 0
+    chunks: List[UploadChunk]
+
+
+class UploadSummary(SQLModel):
+    """Compact outcome of an upload, returned instead of the persisted rows."""
+
+    filename: str
+    # Rows read from the file.
+    rows: int
+    # Rows written to the database.
+    inserted: int
+    # Rows not written because they were already stored.
+    skipped_duplicates: int = 0
+    # Primary key range of the inserted rows, when the database reports it.
+    first_id: Optional[int] = None
+    last_id: Optional[int] = None
+    # Wall-clock time spent handling the upload, in milliseconds.
+    elapsed_ms: float
+
+
+class ImportJob(SQLModel):
+    """State of an upload processed by a background import worker."""
+
+    id: str
+    filename: str
+    status: Literal["queued", "running", "succeeded", "failed"] = "queued"
+    # Progress, updated after every inserted chunk.
+    chunks: int = 0
+    rows_processed: int = 0
+    skipped_duplicates: int = 0
+    # Set once the job failed; no rows are committed in that case.
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Rows processed per second of running time so far.
+    rows_per_second: Optional[float] = None
+    # User who submitted the upload; not serialized.
+    owner_id: Optional[int] = Field(default=None, exclude=True)
@@ -7,8 +7,6 @@ Passwords should be hashed before being stored in the database; never store
 plaintext passwords.
 """
 
-from __future__ import annotations
-
 from typing import List, Optional
 
 from sqlmodel import Field, Relationship, SQLModel
@@ -28,4 +26,13 @@ class User(UserBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     hashed_password: str
     # One-to-many relationship: a user can have multiple accounts
-    accounts: List["Account"] = Relationship(back_populates="user")
\ No newline at end of file
+    accounts: List["Account"] = Relationship(back_populates="user")
+
+
+class AccessToken(SQLModel):
+    """Bearer token issued by `POST /auth/token`."""
+
+    access_token: str
+    token_type: str = "bearer"
+    # Seconds until the token expires.
+    expires_in: int
\ No newline at end of file
@@ -0,0 +1,21 @@
+"""
+SQLModel definition for the data version counter.
+
+The `dataversion` table holds a single row whose `version` is incremented by
+every committed write, so readers can tell whether anything changed since a
+response was produced (see `app.api.caching`).
+"""
+
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+# Primary key of the only row.
+DATA_VERSION_ID = 1
+
+
+class DataVersion(SQLModel, table=True):
+    """Counter of committed writes to transaction-related data."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    version: int = 0
@@ -3,6 +3,8 @@
 Order of precedence:
 - project.version from pyproject.toml
 - fallback "0.0.0-dev"
+
+The version is read once, when this module is imported.
 """
 
 from __future__ import annotations
@@ -15,7 +17,7 @@ except Exception:  # pragma: no cover
     tomllib = None  # type: ignore
 
 
-def get_version() -> str:
+def _read_version() -> str:
     # Attempt to read pyproject.toml next to this file (backend root)
     try:
         if tomllib is None:
@@ -31,3 +33,11 @@ def get_version() -> str:
         pass
 
     return "0.0.0-dev"
+
+
+_VERSION = _read_version()
+
+
+def get_version() -> str:
+    """Return the backend version read at import time."""
+    return _VERSION
@@ -0,0 +1 @@
+"""Benchmark harness for the ingest and query paths (`python -m benchmarks.run`)."""
@@ -0,0 +1,121 @@
+"""
+Synthetic KBC-style bank exports.
+
+Rows use the 15 Dutch column headers of `app.ingest.formats.KBC`, in
+export order, with a realistic mix of accounts, counterparties, dates and
+amounts. Generation is deterministic for a given seed, so files of the same
+size can be reused across runs.
+"""
+
+import csv
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, List
+
+from app.ingest.formats import KBC
+
+COLUMNS = list(KBC.columns)
+
+_ACCOUNTS = ["BE68539007547034", "BE71096123456769", "BE43068999999501", "BE62510007547061"]
+_COUNTERPARTIES = [
+    ("BE12345678901234", "ALBERT HEIJN 1234", "Grote Markt 1", "1000 Brussel", "KREDBEBB"),
+    ("BE23456789012345", "COLRUYT HALLE", "Wergelderstraat 4", "1500 Halle", "GEBABEBB"),
+    ("BE34567890123456", "PROXIMUS", "Koning Albert II-laan 27", "1030 Schaarbeek", "BBRUBEBB"),
+    ("BE45678901234567", "NMBS SNCB", "Frankrijkstraat 56", "1060 Sint-Gillis", "GKCCBEBB"),
+    ("BE56789012345678", "VERHUURKANTOOR JANSSENS", "Meir 12", "2000 Antwerpen", "KREDBEBB"),
+    ("BE67890123456789", "WERKGEVER NV", "Industrieweg 3", "9000 Gent", "GEBABEBB"),
+    ("", "", "", "", ""),
+]
+_TRANSACTION_TYPES = ["Betaling Bancontact", "Overschrijving", "Domiciliëring", "Instantoverschrijving"]
+_NOTES = ["", "huur", "maandelijkse factuur", "boodschappen", "abonnement", "loon", "terugbetaling"]
+
+
+def generate_rows(rows: int, *, seed: int = 0) -> Iterator[List[str]]:
+    """Yield `rows` export rows as lists of cell strings, in `COLUMNS` order.
+
+    Args:
+        rows (int): Number of rows.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Yields:
+        List[str]: One row of cells.
+    """
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    per_account = -(-rows // len(_ACCOUNTS))
+    for index in range(rows):
+        account = _ACCOUNTS[index % len(_ACCOUNTS)]
+        sequence = index // len(_ACCOUNTS)
+        # Spread each account's rows evenly over roughly five years.
+        booked = start + timedelta(days=sequence * 1826 // per_account)
+        valued = booked + timedelta(days=rng.choice((0, 0, 0, 1, 2)))
+        iban, name, street, city, bic = rng.choice(_COUNTERPARTIES)
+        if name == "WERKGEVER NV":
+            amount = rng.uniform(1800, 3500)
+        else:
+            amount = -rng.lognormvariate(3.5, 1.1)
+        yield [
+            account,
+            booked.strftime(KBC.date_format),
+            f"{booked.year}{sequence // 40 % 1000:03d}",
+            str(sequence),
+            iban,
+            name,
+            street,
+            city,
+            rng.choice(_TRANSACTION_TYPES),
+            valued.strftime(KBC.date_format),
+            f"{amount:.2f}",
+            "EUR",
+            bic,
+            "BE" if iban else "",
+            rng.choice(_NOTES),
+        ]
+
+
+def write_csv(path: Path, rows: int, *, seed: int = 0) -> Path:
+    """Write a semicolon-separated export with `rows` rows to `path`."""
+    with path.open("w", newline="", encoding=KBC.encoding) as handle:
+        writer = csv.writer(handle, delimiter=KBC.delimiter, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        writer.writerows(generate_rows(rows, seed=seed))
+    return path
+
+
+def write_xlsx(path: Path, rows: int, *, seed: int = 0) -> Path:
+    """Write an Excel export with `rows` rows to `path`, amounts as numbers."""
+    from openpyxl import Workbook  # pylint: disable=import-outside-toplevel
+
+    amount_index = COLUMNS.index("Bedrag")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Transacties")
+    sheet.append(COLUMNS)
+    for row in generate_rows(rows, seed=seed):
+        cells: List[object] = [cell if cell != "" else None for cell in row]
+        cells[amount_index] = float(row[amount_index])
+        sheet.append(cells)
+    workbook.save(path)
+    return path
+
+
+def ensure_file(directory: Path, rows: int, file_format: str, *, seed: int = 0) -> Path:
+    """Return the path of a generated export, creating it if it does not exist.
+
+    Args:
+        directory (Path): Where generated files are kept.
+        rows (int): Number of rows.
+        file_format (str): `csv` or `xlsx`.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        Path: The generated file.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"transactions-{rows}-{seed}.{file_format}"
+    if not path.exists():
+        partial = path.with_suffix(path.suffix + ".partial")
+        writer = write_csv if file_format == "csv" else write_xlsx
+        writer(partial, rows, seed=seed)
+        partial.rename(path)
+    return path
@@ -15,6 +15,8 @@ if [ "$RUN_MIGRATIONS" = "1" ]; then
     sleep 3
   done
   echo "[entrypoint] Migrations applied."
+  # The schema is current, so the app does not need to create tables itself.
+  export INIT_DB_ON_STARTUP="${INIT_DB_ON_STARTUP:-false}"
 else
   echo "[entrypoint] Skipping migrations (RUN_MIGRATIONS=$RUN_MIGRATIONS)."
 fi
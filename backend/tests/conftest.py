@@ -0,0 +1,128 @@
+"""
+Shared fixtures for the backend tests.
+
+The tests run against a throwaway SQLite database that is emptied before
+every test. Authentication is on, so the owner scoping of the routes is
+exercised as in a multi-user install. The environment is set before `app` is
+imported because the settings and the database engine are created on import.
+"""
+
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import pytest
+
+_DATABASE_DIR = tempfile.mkdtemp(prefix="budgetwise-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_DATABASE_DIR, 'test.db')}",
+    AUTH_ENABLED="true",
+    SECRET_KEY="test-secret",
+    IMPORT_BACKEND="inline",
+    HTTP_CACHE="false",
+    INIT_DB_ON_STARTUP="false",
+)
+
+# pylint: disable=wrong-import-position
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session, SQLModel  # noqa: E402
+
+from app.crud.user import create_user  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "correct horse"
+
+
+@pytest.fixture(autouse=True)
+def empty_database() -> Iterator[None]:
+    """Recreate every table before each test."""
+    SQLModel.metadata.drop_all(engine)
+    init_db()
+    yield
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    """Provide a session on the test database."""
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    """Provide a client running the application's startup and shutdown."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def login(client: TestClient, db: Session) -> Callable[[str], Dict[str, str]]:
+    """Return a function creating a user and returning their auth headers."""
+
+    def _login(email: str) -> Dict[str, str]:
+        create_user(db, email=email, password=PASSWORD)
+        response = client.post("/auth/token", data={"username": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return _login
+
+
+def make_record(
+    number: int,
+    *,
+    account: str = "BE68539007547034",
+    booked: date = date(2024, 1, 15),
+    amount: str = "-10.00",
+    category_id: Optional[int] = None,
+    counterparty_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build the column values of one transaction of statement 1."""
+    return {
+        "account": account,
+        "booking_date": booked,
+        "statement_number": "2024001",
+        "transaction_number": str(number),
+        "amount": Decimal(amount),
+        "currency": "EUR",
+        "category_id": category_id,
+        "counterparty_name": counterparty_name,
+    }
+
+
+def make_csv(*rows: Dict[str, Any]) -> bytes:
+    """Render records from `make_record` as a KBC CSV export."""
+    header = (
+        "Rekening;Boekingsdatum;Rekeninguittrekselnummer;Transactienummer;"
+        "Rekening tegenpartij;Naam tegenpartij bevat;Straat en nummer;Postcode en plaats;"
+        "Transactie;Valutadatum;Bedrag;Devies;BIC;Landcode;Mededelingen"
+    )
+    lines = [header]
+    for row in rows:
+        booked = row["booking_date"].strftime("%d/%m/%Y")
+        lines.append(
+            ";".join(
+                [
+                    row["account"],
+                    booked,
+                    row["statement_number"],
+                    row["transaction_number"],
+                    "",
+                    row["counterparty_name"] or "",
+                    "",
+                    "",
+                    "Betaling",
+                    booked,
+                    str(row["amount"]),
+                    row["currency"],
+                    "",
+                    "BE",
+                    "",
+                ]
+            )
+        )
+    return ("\n".join(lines) + "\n").encode()
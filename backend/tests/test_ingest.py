@@ -0,0 +1,56 @@
+"""Tests for idempotent ingestion through `create_transactions`."""
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.crud.account import AccountResolver
+from app.crud.transaction import create_transactions
+from app.models.transaction import Transaction
+
+from conftest import make_record
+
+
+def _store(db: Session, records, owner_id=None):
+    AccountResolver(owner_id).apply(db, records)
+    return create_transactions(db, records=records, skip_duplicates=True)
+
+
+def _count(db: Session) -> int:
+    return db.exec(select(func.count()).select_from(Transaction)).one()
+
+
+def test_reupload_skips_stored_rows(db: Session) -> None:
+    first = _store(db, [make_record(number) for number in range(3)])
+    assert None not in first and len(first) == 3
+
+    # An overlapping export: two rows stored before, one new.
+    second = _store(db, [make_record(number) for number in range(1, 4)])
+
+    assert second[:2] == [None, None]
+    assert second[2] is not None
+    assert _count(db) == 4
+
+
+def test_duplicates_within_one_upload_are_stored_once(db: Session) -> None:
+    ids = _store(db, [make_record(1), make_record(1), make_record(2)])
+
+    assert sum(transaction_id is not None for transaction_id in ids) == 2
+    assert _count(db) == 2
+
+
+def test_same_numbers_on_other_accounts_are_not_duplicates(db: Session) -> None:
+    _store(db, [make_record(1)])
+    ids = _store(db, [make_record(1, account="BE11111111111111")])
+
+    assert ids[0] is not None
+    assert _count(db) == 2
+
+
+def test_rows_without_transaction_number_are_always_inserted(db: Session) -> None:
+    record = make_record(1)
+    record["transaction_number"] = None
+    _store(db, [dict(record)])
+    ids = _store(db, [dict(record)])
+
+    assert ids[0] is not None
+    assert _count(db) == 2
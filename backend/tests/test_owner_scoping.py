@@ -0,0 +1,92 @@
+"""Tests that users only see their own transactions, reports and budgets."""
+
+from typing import Callable, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import make_csv, make_record
+
+SHARED_ACCOUNT = "BE68539007547034"
+
+
+@pytest.fixture
+def users(client: TestClient, login: Callable[[str], Dict[str, str]]) -> Dict[str, Dict]:
+    """Log in two users who each uploaded a statement of the same account number.
+
+    Both categorize the uploaded rows as groceries with a rule of their own.
+    """
+    users = {"alice": login("alice@example.com"), "bob": login("bob@example.com")}
+    groceries = client.post(
+        "/categories/", headers=users["alice"], json={"name": "Groceries"}
+    ).json()["id"]
+    uploads = {
+        "alice": [
+            make_record(1, amount="-30.00", counterparty_name="Grocer"),
+            make_record(2, amount="-5.00", counterparty_name="Grocer"),
+        ],
+        "bob": [make_record(1, amount="-700.00", counterparty_name="Grocer")],
+    }
+    for name, records in uploads.items():
+        response = client.post(
+            "/rules/",
+            headers=users[name],
+            json={"category_id": groceries, "counterparty_name": "grocer"},
+        )
+        assert response.status_code == 201, response.text
+        response = client.post(
+            "/transactions/upload?return=summary",
+            headers=users[name],
+            files={"file": ("statement.csv", make_csv(*records))},
+        )
+        assert response.status_code == 201, response.text
+    return {"headers": users, "groceries": groceries}
+
+
+def test_requests_without_a_token_are_rejected(client: TestClient) -> None:
+    assert client.get("/transactions/").status_code == 401
+
+
+def test_transactions_are_scoped_to_their_owner(client: TestClient, users: Dict) -> None:
+    alice, bob = users["headers"]["alice"], users["headers"]["bob"]
+
+    alices = client.get("/transactions/", headers=alice).json()
+    bobs = client.get("/transactions/", headers=bob).json()
+
+    assert sorted(row["amount"] for row in alices) == [-30.0, -5.0]
+    assert [row["amount"] for row in bobs] == [-700.0]
+    assert client.get(f"/transactions/{alices[0]['id']}", headers=alice).status_code == 200
+    assert client.get(f"/transactions/{alices[0]['id']}", headers=bob).status_code == 404
+
+
+def test_summary_separates_accounts_with_the_same_number(
+    client: TestClient, users: Dict
+) -> None:
+    for name, expenses, count in (("alice", -35.0, 2), ("bob", -700.0, 1)):
+        response = client.get(
+            "/reports/summary",
+            headers=users["headers"][name],
+            params={"group_by": "account", "account": SHARED_ACCOUNT},
+        )
+        assert response.status_code == 200, response.text
+        (summary,) = response.json()
+        assert summary["account"] == SHARED_ACCOUNT
+        assert (summary["transaction_count"], float(summary["expenses"])) == (count, expenses)
+
+
+def test_budgets_only_count_their_owners_spending(client: TestClient, users: Dict) -> None:
+    alice, bob = users["headers"]["alice"], users["headers"]["bob"]
+    budget = {"category_id": users["groceries"], "amount": 100}
+    for headers in (alice, bob):
+        response = client.post("/budgets/", headers=headers, json=budget)
+        assert response.status_code == 201, response.text
+
+    for name, spent in (("alice", 35.0), ("bob", 700.0)):
+        response = client.get(
+            "/budgets/status", headers=users["headers"][name], params={"on": "2024-01-31"}
+        )
+        (status,) = response.json()
+        assert status["spent"] == spent
+
+    alices_budget = client.get("/budgets/", headers=alice).json()[0]["id"]
+    assert client.delete(f"/budgets/{alices_budget}", headers=bob).status_code == 404
@@ -0,0 +1,175 @@
+"""Tests for the incremental maintenance of the rollup and budget consumption."""
+
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+import pytest
+from sqlmodel import Session, select
+
+from app.crud.account import AccountResolver
+from app.crud.budget import create_budget, get_budget_statuses
+from app.crud.category import create_category
+from app.crud.rollup import add_to_rollup, rebuild_rollup, remove_month_from_rollup
+from app.crud.rule import create_rule, recategorize_transactions
+from app.crud.transaction import create_transactions
+from app.models.budget import Budget, BudgetSpending
+from app.models.category import Category
+from app.models.rollup import UNCATEGORIZED, TransactionRollup
+from app.models.rule import CategoryRule
+
+from conftest import make_record
+
+JANUARY = date(2024, 1, 1)
+FEBRUARY = date(2024, 2, 1)
+
+
+@pytest.fixture
+def categories(db: Session) -> Dict[str, int]:
+    return {
+        name: create_category(db, category=Category(name=name)).id
+        for name in ("Groceries", "Rent")
+    }
+
+
+def _store(db: Session, records) -> None:
+    AccountResolver().apply(db, records)
+    create_transactions(db, records=records, skip_duplicates=True)
+
+
+def _rollup(db: Session) -> Dict[Tuple[date, int], Tuple[int, Decimal, Decimal]]:
+    return {
+        (row.month, row.category_id): (row.transaction_count, row.income, row.expenses)
+        for row in db.exec(select(TransactionRollup)).all()
+    }
+
+
+def _spending(db: Session) -> List[Tuple[int, date, int, Decimal]]:
+    rows = db.exec(select(BudgetSpending)).all()
+    return sorted(
+        (row.budget_id, row.period_start, row.transaction_count, row.spent) for row in rows
+    )
+
+
+def _assert_matches_rebuild(db: Session) -> None:
+    rollup, spending = _rollup(db), _spending(db)
+    rebuild_rollup(db)
+    db.expire_all()
+    assert _rollup(db) == rollup
+    assert _spending(db) == spending
+
+
+def test_insert_updates_buckets_and_budgets(db: Session, categories: Dict[str, int]) -> None:
+    groceries = categories["Groceries"]
+    monthly = create_budget(db, budget=Budget(category_id=groceries, amount=Decimal("100")))
+    yearly = create_budget(
+        db, budget=Budget(category_id=groceries, period="year", amount=Decimal("1000"))
+    )
+
+    _store(
+        db,
+        [
+            make_record(1, amount="-30.00", category_id=groceries),
+            make_record(2, amount="5.00", category_id=groceries),
+            make_record(3, amount="-12.50"),
+            make_record(4, booked=date(2024, 2, 3), amount="-20.00", category_id=groceries),
+        ],
+    )
+
+    assert _rollup(db) == {
+        (JANUARY, groceries): (2, Decimal("5.00"), Decimal("-30.00")),
+        (JANUARY, UNCATEGORIZED): (1, Decimal("0"), Decimal("-12.50")),
+        (FEBRUARY, groceries): (1, Decimal("0"), Decimal("-20.00")),
+    }
+    statuses = {status.budget_id: status for status in get_budget_statuses(db, on=JANUARY)}
+    assert statuses[monthly.id].spent == Decimal("25.00")
+    assert statuses[monthly.id].remaining == Decimal("75.00")
+    assert statuses[yearly.id].spent == Decimal("45.00")
+    assert statuses[yearly.id].transaction_count == 3
+    _assert_matches_rebuild(db)
+
+
+def test_new_budget_is_seeded_from_stored_transactions(
+    db: Session, categories: Dict[str, int]
+) -> None:
+    rent = categories["Rent"]
+    _store(db, [make_record(1, amount="-800.00", category_id=rent)])
+
+    budget = create_budget(db, budget=Budget(category_id=rent, amount=Decimal("900")))
+
+    (status,) = get_budget_statuses(db, on=JANUARY)
+    assert (status.budget_id, status.spent) == (budget.id, Decimal("800.00"))
+
+
+def test_recategorize_moves_amounts_between_buckets_and_budgets(
+    db: Session, categories: Dict[str, int]
+) -> None:
+    groceries, rent = categories["Groceries"], categories["Rent"]
+    groceries_budget = create_budget(
+        db, budget=Budget(category_id=groceries, amount=Decimal("100"))
+    )
+    rent_budget = create_budget(db, budget=Budget(category_id=rent, amount=Decimal("900")))
+    _store(
+        db,
+        [
+            make_record(1, amount="-40.00", category_id=groceries, counterparty_name="Landlord"),
+            make_record(2, amount="-15.00", category_id=groceries, counterparty_name="Grocer"),
+        ],
+    )
+    create_rule(db, rule=CategoryRule(category_id=rent, counterparty_name="landlord"))
+
+    result = recategorize_transactions(db, overwrite=True)
+
+    assert (result.scanned, result.updated) == (2, 1)
+    assert _rollup(db) == {
+        (JANUARY, groceries): (1, Decimal("0"), Decimal("-15.00")),
+        (JANUARY, rent): (1, Decimal("0"), Decimal("-40.00")),
+    }
+    spent = {status.budget_id: status.spent for status in get_budget_statuses(db, on=JANUARY)}
+    assert spent == {groceries_budget.id: Decimal("15.00"), rent_budget.id: Decimal("40.00")}
+    _assert_matches_rebuild(db)
+
+
+def test_removing_transactions_empties_buckets_and_budgets(
+    db: Session, categories: Dict[str, int]
+) -> None:
+    groceries = categories["Groceries"]
+    create_budget(db, budget=Budget(category_id=groceries, amount=Decimal("100")))
+    records = [
+        make_record(1, amount="-30.00", category_id=groceries),
+        make_record(2, amount="-10.00", category_id=groceries),
+    ]
+    _store(db, records)
+
+    add_to_rollup(db, records=records[:1], sign=-1)
+    db.commit()
+    assert _rollup(db) == {(JANUARY, groceries): (1, Decimal("0"), Decimal("-10.00"))}
+    (status,) = get_budget_statuses(db, on=JANUARY)
+    assert (status.transaction_count, status.spent) == (1, Decimal("10.00"))
+
+    add_to_rollup(db, records=records[1:], sign=-1)
+    db.commit()
+    assert _rollup(db) == {}
+    assert _spending(db) == []
+
+
+def test_removing_a_month_subtracts_it_from_budgets(
+    db: Session, categories: Dict[str, int]
+) -> None:
+    groceries = categories["Groceries"]
+    yearly = create_budget(
+        db, budget=Budget(category_id=groceries, period="year", amount=Decimal("1000"))
+    )
+    _store(
+        db,
+        [
+            make_record(1, amount="-30.00", category_id=groceries),
+            make_record(2, booked=date(2024, 2, 3), amount="-20.00", category_id=groceries),
+        ],
+    )
+
+    assert remove_month_from_rollup(db, JANUARY) == 1
+    db.commit()
+
+    assert set(_rollup(db)) == {(FEBRUARY, groceries)}
+    assert _spending(db) == [(yearly.id, JANUARY, 1, Decimal("20.00"))]